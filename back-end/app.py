@@ -1,14 +1,46 @@
-from flask import Flask, request, jsonify
+# The Socket.IO message queue listener needs a cooperative socket library
+if __name__ == '__main__':
+    import eventlet
+    eventlet.monkey_patch()
+
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from flask_socketio import SocketIO, join_room, leave_room
+from celery import group
 import uuid
 import os
+import json
 from datetime import datetime
 
 from config import Config
-from models import db, CrackJob, Wordlist, JobStatus, AttackMode
-from hash_utils import detect_hash_type, get_hash_info, hash_password, verify_password
-from tasks import crack_dictionary_task, crack_bruteforce_task
+from models import (
+    db, CrackJob, CrackTarget, Wordlist, JobStatus, AttackMode, bulk_insert_targets, upgrade_schema
+)
+from pagination import paginate_jobs
+from progress_store import merge_progress
+import live_updates
+import metrics
+from hash_utils import (
+    detect_hash_candidates, get_hash_info, hash_password, verify_password,
+    FAST_HASH_TYPES, UNKNOWN_HASH
+)
+from lookup_tables import find_in_lookup_tables, available_tables
+from rainbow import list_rainbow_tables
+from keyspace import CHARSETS
+from markov import list_markov_models, train_markov_model, save_markov_model
+from pcfg import list_pcfg_models, train_pcfg_model, save_pcfg_model
+from hashfile import iter_hashfile, HashfileStats
+from job_service import (
+    submit_job, extend_job, resolve_wordlist_path, parse_max_length, JobSubmissionError
+)
+from batch_hashing import generate_stream, verify_stream, read_items, parse_pair_line
+from strength import StrengthAnalyzer, open_membership_index
+from tasks import (
+    crack_targets_task, build_lookup_table_task, build_rainbow_table_task,
+    train_markov_model_task, train_pcfg_model_task, build_membership_index_task,
+    build_length_index_task
+)
+from wordlist_buckets import open_length_index, open_block_layout
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -16,12 +48,14 @@ app.config.from_object(Config)
 
 # Initialize extensions
 CORS(app, resources={r"/api/*": {"origins": "*"}})
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet')
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet',
+                    message_queue=Config.SOCKETIO_MESSAGE_QUEUE)
 db.init_app(app)
 
 # Create tables
 with app.app_context():
     db.create_all()
+    upgrade_schema(db.engine)
     
     # Initialize default wordlist if exists
     if os.path.exists('wordlist.txt'):
@@ -78,6 +112,21 @@ def health_check():
         'features': ['async_jobs', 'websockets', 'database', 'celery']
     })
 
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus scrape endpoint (counters from the API and every worker)"""
+    gauges = {
+        metrics.series_name('cracker_jobs', {'status': status.value}): count
+        for status, count in db.session.query(CrackJob.status, db.func.count(CrackJob.id))
+        .group_by(CrackJob.status)
+    }
+    
+    depth = metrics.queue_depth()
+    if depth is not None:
+        gauges[metrics.series_name('cracker_queue_depth', {'queue': 'celery'})] = depth
+    
+    return Response(metrics.render(gauges), mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/detect-hash', methods=['POST'])
 def detect_hash():
     """Auto-detect hash type from hash string"""
@@ -87,77 +136,208 @@ def detect_hash():
     if not hash_string:
         return jsonify({'error': 'Hash is required'}), 400
     
-    hash_type, confidence, description = detect_hash_type(hash_string)
+    candidates = detect_hash_candidates(hash_string)
+    hash_type, confidence, description = candidates[0] if candidates else UNKNOWN_HASH
     hash_info = get_hash_info(hash_type)
     
-    return jsonify({
+    result = {
         'detected_type': hash_type,
         'confidence': confidence,
         'description': description,
         'info': hash_info,
-        'hash_length': len(hash_string.strip())
+        'hash_length': len(hash_string.strip()),
+        'candidates': [
+            {'type': t, 'confidence': c, 'description': d}
+            for t, c, d in candidates
+        ]
+    }
+    
+    # Resolve instantly if a precomputed table already contains the hash
+    if hash_type in FAST_HASH_TYPES:
+        wordlists = [(wl.name, wl.file_path) for wl in Wordlist.query.all()]
+        found = find_in_lookup_tables(hash_string, hash_type, wordlists)
+        if found:
+            result['lookup'] = {'wordlist': found[0], 'password': found[1]}
+    
+    return jsonify(result)
+
+@app.route('/api/detect-hash/bulk', methods=['POST'])
+def detect_hash_bulk():
+    """Classify many hashes in one request"""
+    data = request.json or {}
+    hashes = data.get('hashes', [])
+    
+    if not isinstance(hashes, list) or not hashes:
+        return jsonify({'error': 'A list of hashes is required'}), 400
+    
+    if len(hashes) > Config.MAX_BULK_HASHES:
+        return jsonify({'error': f'At most {Config.MAX_BULK_HASHES} hashes per request'}), 400
+    
+    results = []
+    summary = {}
+    for hash_string in hashes:
+        candidates = detect_hash_candidates(str(hash_string))
+        hash_type, confidence, _ = candidates[0] if candidates else UNKNOWN_HASH
+        summary[hash_type] = summary.get(hash_type, 0) + 1
+        results.append({
+            'hash': hash_string,
+            'detected_type': hash_type,
+            'confidence': confidence,
+            'candidates': [candidate[0] for candidate in candidates]
+        })
+    
+    return jsonify({
+        'results': results,
+        'count': len(results),
+        'summary': summary
     })
 
 @app.route('/api/jobs', methods=['POST'])
 def create_job():
     """Create a new cracking job"""
-    data = request.json
-    
-    target_hash = data.get('hash', '').strip()
-    hash_type = data.get('hashType', 'md5')
-    attack_mode = data.get('attackMode', 'dictionary')
-    wordlist_name = data.get('wordlist', 'wordlist.txt')
-    max_length = data.get('maxLength', 4)
-    charset_option = data.get('charset', '1')
-    
-    if not target_hash:
-        return jsonify({'error': 'Hash is required'}), 400
-    
-    # Auto-detect if requested
-    if data.get('autoDetect', False):
-        detected_type, _, _ = detect_hash_type(target_hash)
-        if detected_type != 'unknown':
-            hash_type = detected_type
+    try:
+        job, message = submit_job(request.json or {})
+    except JobSubmissionError as e:
+        return jsonify({'error': str(e)}), e.status
     
-    # Create job record
-    job_id = str(uuid.uuid4())
+    return jsonify({
+        'job_id': job.job_id,
+        'status': message,
+        'job': job.to_dict()
+    }), 201
+
+@app.route('/api/hashfiles', methods=['POST'])
+def upload_hashfile():
+    """Ingest a hashfile (hash or user:hash lines) into one multi-target job per hash type"""
+    # Multipart uploads are spooled to disk by Werkzeug; raw bodies are read as a stream
+    if request.mimetype == 'multipart/form-data':
+        upload = request.files.get('file')
+        if not upload:
+            return jsonify({'error': 'File is required'}), 400
+        lines = upload.stream
+        options = request.form
+    else:
+        lines = request.stream
+        options = request.args
+    
+    hash_type = options.get('hashType')
+    attack_mode = options.get('attackMode', 'dictionary')
+    wordlist_name = options.get('wordlist', 'wordlist.txt')
+    max_length = options.get('maxLength', 4)
+    charset_option = options.get('charset', '1')
+    queue = options.get('queue', 'true').lower() != 'false'
     
     try:
         attack_mode_enum = AttackMode[attack_mode.upper()]
     except KeyError:
         attack_mode_enum = AttackMode.DICTIONARY
     
-    job = CrackJob(
-        job_id=job_id,
-        target_hash=target_hash,
-        hash_type=hash_type,
-        attack_mode=attack_mode_enum,
-        wordlist_name=wordlist_name if attack_mode_enum == AttackMode.DICTIONARY else None,
-        max_length=max_length if attack_mode_enum == AttackMode.BRUTEFORCE else None,
-        charset_option=charset_option if attack_mode_enum == AttackMode.BRUTEFORCE else None,
-        status=JobStatus.PENDING
-    )
+    if attack_mode_enum not in (AttackMode.DICTIONARY, AttackMode.BRUTEFORCE):
+        return jsonify({'error': 'Hashfiles support dictionary and bruteforce attacks'}), 400
     
-    db.session.add(job)
+    if attack_mode_enum == AttackMode.BRUTEFORCE:
+        try:
+            max_length = parse_max_length(max_length)
+        except JobSubmissionError as e:
+            return jsonify({'error': str(e)}), e.status
+    
+    batch_id = str(uuid.uuid4())
+    stats = HashfileStats()
+    jobs = {}
+    rows = []
+    
+    def flush():
+        # One executemany per batch instead of a commit per hash
+        bulk_insert_targets(db.session, rows)
+        db.session.commit()
+        rows.clear()
+    
+    for username, target_hash, line_type in iter_hashfile(lines, stats, hash_type):
+        job = jobs.get(line_type)
+        if job is None:
+            job = CrackJob(
+                job_id=str(uuid.uuid4()),
+                batch_id=batch_id,
+                target_hash=f'{line_type} hashfile',
+                hash_type=line_type,
+                attack_mode=attack_mode_enum,
+                wordlist_name=wordlist_name if attack_mode_enum == AttackMode.DICTIONARY else None,
+                max_length=max_length if attack_mode_enum == AttackMode.BRUTEFORCE else None,
+                charset_option=charset_option if attack_mode_enum == AttackMode.BRUTEFORCE else None,
+                status=JobStatus.PENDING
+            )
+            db.session.add(job)
+            db.session.flush()
+            jobs[line_type] = job
+        
+        rows.append({
+            'job_id': job.job_id,
+            'username': username,
+            'target_hash': target_hash,
+            'hash_type': line_type
+        })
+        
+        if len(rows) >= Config.HASHFILE_BATCH_SIZE:
+            flush()
+    
+    flush()
+    
+    for line_type, job in jobs.items():
+        job.target_count = stats.by_type[line_type]
+        job.target_hash = f'{job.target_count} {line_type} hashes'
     db.session.commit()
     
-    # Start async task
-    if attack_mode_enum == AttackMode.DICTIONARY:
-        crack_dictionary_task.apply_async(
-            args=[job_id, target_hash, hash_type, wordlist_name],
-            task_id=job_id
-        )
-    elif attack_mode_enum == AttackMode.BRUTEFORCE:
-        crack_bruteforce_task.apply_async(
-            args=[job_id, target_hash, hash_type, max_length, charset_option],
-            task_id=job_id
-        )
+    if queue and jobs:
+        metrics.inc('cracker_shards_dispatched_total', len(jobs), engine=attack_mode_enum.value)
+        group(
+            crack_targets_task.si(
+                job.job_id, job.hash_type,
+                resolve_wordlist_path(wordlist_name) if attack_mode_enum == AttackMode.DICTIONARY else None,
+                max_length, charset_option
+            ).set(task_id=job.job_id)
+            for job in jobs.values()
+        ).apply_async()
+    
+    return jsonify(dict(
+        stats.to_dict(),
+        batch_id=batch_id,
+        queued=queue,
+        jobs=[job.to_dict() for job in jobs.values()]
+    )), 201
+
+@app.route('/api/hashfiles/<batch_id>', methods=['GET'])
+def get_hashfile(batch_id):
+    """Summarize the jobs and targets of one hashfile upload"""
+    jobs = CrackJob.query.filter_by(batch_id=batch_id).all()
+    
+    if not jobs:
+        return jsonify({'error': 'Hashfile not found'}), 404
     
     return jsonify({
-        'job_id': job_id,
-        'status': 'Job created and queued',
-        'job': job.to_dict()
-    }), 201
+        'batch_id': batch_id,
+        'jobs': [job.to_dict() for job in jobs],
+        'targets': sum(job.target_count or 0 for job in jobs),
+        'cracked': sum(job.cracked_count or 0 for job in jobs)
+    })
+
+@app.route('/api/jobs/<job_id>/targets', methods=['GET'])
+def list_job_targets(job_id):
+    """List the targets of a multi-target job"""
+    cracked = request.args.get('cracked')
+    limit = request.args.get('limit', 100, type=int)
+    offset = request.args.get('offset', 0, type=int)
+    
+    query = CrackTarget.query.filter_by(job_id=job_id)
+    if cracked is not None:
+        query = query.filter_by(cracked=cracked.lower() == 'true')
+    
+    targets = query.order_by(CrackTarget.id).offset(offset).limit(limit).all()
+    
+    return jsonify({
+        'targets': [target.to_dict() for target in targets],
+        'count': len(targets),
+        'offset': offset
+    })
 
 @app.route('/api/jobs/<job_id>', methods=['GET'])
 def get_job(job_id):
@@ -167,30 +347,167 @@ def get_job(job_id):
     if not job:
         return jsonify({'error': 'Job not found'}), 404
     
-    return jsonify(job.to_dict())
+    # Running jobs report progress to Redis; overlay the live counters
+    response = jsonify(merge_progress(job.to_dict()))
+    response.add_etag()
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+@app.route('/api/jobs/<job_id>/profile', methods=['GET'])
+def get_job_profile(job_id):
+    """Time breakdown of a job created with profiling enabled"""
+    job = CrackJob.query.filter_by(job_id=job_id).first()
+    
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    if not job.profile_enabled:
+        return jsonify({'error': 'Profiling was not enabled for this job'}), 404
+    
+    result = {
+        'job_id': job_id,
+        'status': job.status.value,
+        'hash_type': job.hash_type,
+        'measured_speed': job.speed,
+        'expected_speed': get_hash_info(job.hash_type)['est_speed'],
+        'profile': json.loads(job.profile_data) if job.profile_data else None
+    }
+    
+    # The profile is written when the task finishes
+    return jsonify(result), 200 if job.profile_data else 202
 
 @app.route('/api/jobs', methods=['GET'])
 def list_jobs():
-    """List all jobs with optional filtering"""
-    status = request.args.get('status')
-    limit = request.args.get('limit', 50, type=int)
+    """List jobs newest first (?status=, ?limit=, ?cursor=, ?fields=)"""
+    try:
+        page = paginate_jobs(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Pollers send If-None-Match and get a bodiless 304 while nothing changed
+    response = jsonify(page)
+    response.add_etag()
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+def watch_jobs(job_ids):
+    """Latest (version, data) per job from the update hub, loading unseen jobs in one query"""
+    live_updates.ensure_listener(socketio.start_background_task)
+    
+    hub = live_updates.hub
+    missing = [job_id for job_id in job_ids if hub.latest(job_id) is None]
+    if missing:
+        for job in CrackJob.query.filter(CrackJob.job_id.in_(missing)):
+            hub.seed(merge_progress(job.to_dict()))
+    
+    latest = {}
+    for job_id in job_ids:
+        update = hub.latest(job_id)
+        if update is not None:
+            latest[job_id] = update
+    return latest
+
+def sse_message(event, data, cursor):
+    return f'id: {cursor}\nevent: {event}\ndata: {json.dumps(data)}\n\n'
+
+def stream_updates(job_ids):
+    """Server-sent events for the jobs: snapshots, then deltas until every job ends"""
+    try:
+        since = live_updates.decode_cursor(request.headers.get('Last-Event-ID') or request.args.get('since'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    query = CrackJob.query
+    latest = watch_jobs(job_ids)
+    if not latest:
+        return jsonify({'error': 'Job not found'}), 404
     
-    if status:
-        try:
-            status_enum = JobStatus[status.upper()]
-            query = query.filter_by(status=status_enum)
-        except KeyError:
-            pass
+    final = {status.value for status in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)}
+    
+    def generate():
+        hub = live_updates.hub
+        known = live_updates.resume_versions(latest, since)
+        statuses = {job_id: data['status'] for job_id, (_, data) in latest.items()}
+        changes = hub.changes(known)
+        
+        while True:
+            for job_id, update in changes.items():
+                known[job_id] = update['version']
+                cursor = live_updates.encode_cursor(known)
+                if 'job' in update:
+                    statuses[job_id] = update['job']['status']
+                    yield sse_message('job_update', update['job'], cursor)
+                else:
+                    statuses[job_id] = update['delta'].get('status', statuses[job_id])
+                    yield sse_message('job_delta', dict(update['delta'], job_id=job_id), cursor)
+            
+            if all(status in final for status in statuses.values()):
+                return
+            
+            changes = hub.wait(known, Config.SSE_HEARTBEAT)
+            if not changes:
+                # Comment lines keep proxies from closing idle streams
+                yield ': keep-alive\n\n'
+    
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/jobs/stream', methods=['GET'])
+def stream_jobs():
+    """Server-sent events for several jobs (?ids=a,b,c)"""
+    try:
+        job_ids = live_updates.parse_job_ids(request.args.get('ids'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return stream_updates(job_ids)
+
+@app.route('/api/jobs/<job_id>/stream', methods=['GET'])
+def stream_job(job_id):
+    """Server-sent events for one job"""
+    return stream_updates([job_id])
+
+@app.route('/api/jobs/updates', methods=['GET'])
+def poll_job_updates():
+    """Long-poll: changes to ?ids= after ?since=, waiting up to ?timeout= seconds"""
+    try:
+        job_ids = live_updates.parse_job_ids(request.args.get('ids'))
+        since = live_updates.decode_cursor(request.args.get('since'))
+        timeout = float(request.args.get('timeout', Config.LONG_POLL_TIMEOUT))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    latest = watch_jobs(job_ids)
+    known = live_updates.resume_versions(latest, since)
+    
+    # Return at once if the client is behind, otherwise hold the request open
+    changes = live_updates.hub.changes(known)
+    if not changes:
+        changes = live_updates.hub.wait(known, max(0.0, min(timeout, Config.LONG_POLL_TIMEOUT)))
     
-    jobs = query.order_by(CrackJob.created_at.desc()).limit(limit).all()
+    for job_id, update in changes.items():
+        known[job_id] = update['version']
     
     return jsonify({
-        'jobs': [job.to_dict() for job in jobs],
-        'count': len(jobs)
+        'updates': changes,
+        'cursor': live_updates.encode_cursor(known),
+        'missing': [job_id for job_id in job_ids if job_id not in latest]
     })
 
+@app.route('/api/jobs/<job_id>/extend', methods=['POST'])
+def extend_job_budget(job_id):
+    """Give a time-budgeted job more seconds and continue from where it stopped"""
+    job = CrackJob.query.filter_by(job_id=job_id).first()
+    
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    data = request.json or {}
+    try:
+        extend_job(job, data.get('seconds'))
+    except JobSubmissionError as e:
+        return jsonify({'error': str(e)}), e.status
+    
+    return jsonify({'message': 'Job budget extended and queued', 'job': job.to_dict()}), 202
+
 @app.route('/api/jobs/<job_id>', methods=['DELETE'])
 def cancel_job(job_id):
     """Cancel a running job"""
@@ -213,6 +530,8 @@ def cancel_job(job_id):
     
     # Notify via WebSocket
     socketio.emit('job_update', job.to_dict(), room=job_id)
+    live_updates.broadcast(job.to_dict())
+    metrics.inc('cracker_socket_emits_total', source='api')
     
     return jsonify({'message': 'Job cancelled', 'job': job.to_dict()})
 
@@ -263,6 +582,239 @@ def add_wordlist():
     
     return jsonify(wordlist.to_dict()), 201
 
+@app.route('/api/wordlists/<name>/lookup-tables', methods=['GET'])
+def list_lookup_tables(name):
+    """List hash types with an up-to-date lookup table for a wordlist"""
+    wordlist = Wordlist.query.filter_by(name=name).first()
+    if not wordlist:
+        return jsonify({'error': 'Wordlist not found'}), 404
+    
+    return jsonify({
+        'wordlist': name,
+        'hash_types': available_tables(wordlist.file_path)
+    })
+
+@app.route('/api/wordlists/<name>/lookup-tables', methods=['POST'])
+def build_lookup_tables(name):
+    """Queue precomputation of lookup tables for a wordlist"""
+    data = request.json or {}
+    hash_types = data.get('hashTypes', ['md5'])
+    
+    wordlist = Wordlist.query.filter_by(name=name).first()
+    if not wordlist:
+        return jsonify({'error': 'Wordlist not found'}), 404
+    
+    unsupported = [t for t in hash_types if t not in FAST_HASH_TYPES]
+    if unsupported:
+        return jsonify({
+            'error': f'Lookup tables only support unsalted hashes: {", ".join(FAST_HASH_TYPES)}'
+        }), 400
+    
+    task_ids = {}
+    for hash_type in hash_types:
+        task = build_lookup_table_task.delay(wordlist.file_path, hash_type)
+        task_ids[hash_type] = task.id
+    
+    return jsonify({
+        'message': 'Lookup table build queued',
+        'wordlist': name,
+        'tasks': task_ids
+    }), 202
+
+@app.route('/api/wordlists/<name>/membership-index', methods=['GET'])
+def get_membership_index(name):
+    """Whether a wordlist has a current membership index for strength analysis"""
+    wordlist = Wordlist.query.filter_by(name=name).first()
+    if not wordlist:
+        return jsonify({'error': 'Wordlist not found'}), 404
+    
+    index = open_membership_index(wordlist.file_path)
+    return jsonify({
+        'wordlist': name,
+        'indexed': index is not None,
+        'records': index.count if index else 0
+    })
+
+@app.route('/api/wordlists/<name>/membership-index', methods=['POST'])
+def build_membership_index(name):
+    """Queue building a wordlist's membership index"""
+    wordlist = Wordlist.query.filter_by(name=name).first()
+    if not wordlist:
+        return jsonify({'error': 'Wordlist not found'}), 404
+    
+    task = build_membership_index_task.delay(wordlist.file_path)
+    
+    return jsonify({
+        'message': 'Membership index build queued',
+        'wordlist': name,
+        'task_id': task.id
+    }), 202
+
+@app.route('/api/wordlists/<name>/length-index', methods=['GET'])
+def get_length_index(name):
+    """Whether a wordlist has current length buckets and block layout, and the words per length"""
+    wordlist = Wordlist.query.filter_by(name=name).first()
+    if not wordlist:
+        return jsonify({'error': 'Wordlist not found'}), 404
+    
+    index = open_length_index(wordlist.file_path)
+    return jsonify({
+        'wordlist': name,
+        'indexed': index is not None,
+        'words': index.count if index else 0,
+        'lengths': index.lengths() if index else {},
+        'blocks': open_block_layout(wordlist.file_path) is not None
+    })
+
+@app.route('/api/wordlists/<name>/length-index', methods=['POST'])
+def build_length_index(name):
+    """Queue building a wordlist's length buckets"""
+    wordlist = Wordlist.query.filter_by(name=name).first()
+    if not wordlist:
+        return jsonify({'error': 'Wordlist not found'}), 404
+    
+    task = build_length_index_task.delay(wordlist.file_path)
+    
+    return jsonify({
+        'message': 'Length index build queued',
+        'wordlist': name,
+        'task_id': task.id
+    }), 202
+
+@app.route('/api/rainbow-tables', methods=['GET'])
+def get_rainbow_tables():
+    """List generated rainbow tables"""
+    return jsonify({'tables': list_rainbow_tables()})
+
+@app.route('/api/rainbow-tables', methods=['POST'])
+def create_rainbow_table():
+    """Queue generation of a rainbow table for a brute-force keyspace"""
+    data = request.json or {}
+    
+    hash_type = data.get('hashType', 'md5')
+    charset_option = data.get('charset', '1')
+    
+    try:
+        max_length = int(data.get('maxLength', 4))
+        chain_length = int(data['chainLength']) if data.get('chainLength') is not None else None
+        chain_count = int(data['chains']) if data.get('chains') is not None else None
+        table_index = int(data.get('tableIndex') or 0)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'maxLength, chainLength, chains and tableIndex must be integers'}), 400
+    
+    if hash_type not in FAST_HASH_TYPES:
+        return jsonify({
+            'error': f'Rainbow tables only support unsalted hashes: {", ".join(FAST_HASH_TYPES)}'
+        }), 400
+    
+    if charset_option not in CHARSETS:
+        return jsonify({'error': 'Unknown charset option'}), 400
+    
+    if not 1 <= max_length <= Config.MAX_BRUTEFORCE_LENGTH:
+        return jsonify({
+            'error': f'Max length must be between 1 and {Config.MAX_BRUTEFORCE_LENGTH}'
+        }), 400
+    
+    if (chain_length is not None and chain_length < 1) or (chain_count is not None and chain_count < 1):
+        return jsonify({'error': 'chainLength and chains must be positive'}), 400
+    
+    task = build_rainbow_table_task.delay(
+        hash_type, charset_option, max_length, chain_length, chain_count, table_index
+    )
+    
+    return jsonify({
+        'message': 'Rainbow table build queued',
+        'task_id': task.id
+    }), 202
+
+@app.route('/api/markov-models', methods=['GET'])
+def get_markov_models():
+    """List trained Markov models"""
+    return jsonify({'models': list_markov_models()})
+
+@app.route('/api/markov-models', methods=['POST'])
+def create_markov_model():
+    """Train a Markov model from a wordlist or previously cracked passwords"""
+    data = request.json or {}
+    
+    name = data.get('name')
+    source = data.get('source', 'wordlist')
+    
+    if not name:
+        return jsonify({'error': 'Name is required'}), 400
+    
+    if source == 'cracked':
+        passwords = [
+            job.cracked_password
+            for job in CrackJob.query.filter_by(success=True).all()
+            if job.cracked_password
+        ]
+        if not passwords:
+            return jsonify({'error': 'No cracked passwords to train on'}), 400
+        
+        try:
+            model = train_markov_model(passwords)
+            save_markov_model(name, model)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({'name': name, 'trained_on': model['trained_on']}), 201
+    
+    wordlist = Wordlist.query.filter_by(name=data.get('wordlist', 'wordlist.txt')).first()
+    if not wordlist:
+        return jsonify({'error': 'Wordlist not found'}), 404
+    
+    task = train_markov_model_task.delay(name, wordlist.file_path)
+    
+    return jsonify({
+        'message': 'Markov model training queued',
+        'task_id': task.id
+    }), 202
+
+@app.route('/api/pcfg-models', methods=['GET'])
+def get_pcfg_models():
+    """List trained PCFG grammars"""
+    return jsonify({'models': list_pcfg_models()})
+
+@app.route('/api/pcfg-models', methods=['POST'])
+def create_pcfg_model():
+    """Train a PCFG grammar from a wordlist or previously cracked passwords"""
+    data = request.json or {}
+    
+    name = data.get('name')
+    source = data.get('source', 'wordlist')
+    
+    if not name:
+        return jsonify({'error': 'Name is required'}), 400
+    
+    if source == 'cracked':
+        passwords = [
+            job.cracked_password
+            for job in CrackJob.query.filter_by(success=True).all()
+            if job.cracked_password
+        ]
+        if not passwords:
+            return jsonify({'error': 'No cracked passwords to train on'}), 400
+        
+        try:
+            model = train_pcfg_model(passwords)
+            save_pcfg_model(name, model)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({'name': name, 'trained_on': model['trained_on']}), 201
+    
+    wordlist = Wordlist.query.filter_by(name=data.get('wordlist', 'wordlist.txt')).first()
+    if not wordlist:
+        return jsonify({'error': 'Wordlist not found'}), 404
+    
+    task = train_pcfg_model_task.delay(name, wordlist.file_path)
+    
+    return jsonify({
+        'message': 'PCFG model training queued',
+        'task_id': task.id
+    }), 202
+
 @app.route('/api/generate-hash', methods=['POST'])
 def generate_hash():
     """Generate hashes from a password"""
@@ -282,6 +834,47 @@ def generate_hash():
     
     return jsonify({'password': password, 'hashes': hashes})
 
+def strength_analyzer(data):
+    """Analyzer over the registered wordlists for a strength request"""
+    hash_types = data.get('hashTypes') or [data.get('hashType', 'md5')]
+    wordlists = [(wl.name, wl.file_path) for wl in Wordlist.query.all()]
+    return StrengthAnalyzer(wordlists, data.get('model', Config.STRENGTH_MARKOV_MODEL), hash_types)
+
+@app.route('/api/analyze-strength', methods=['POST'])
+def analyze_strength():
+    """Guess rank and time to crack of a password"""
+    data = request.json or {}
+    password = data.get('password', '')
+    
+    if not password:
+        return jsonify({'error': 'Password is required'}), 400
+    
+    try:
+        analyzer = strength_analyzer(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify(analyzer.analyze(password))
+
+@app.route('/api/analyze-strength/batch', methods=['POST'])
+def analyze_strength_batch():
+    """Score many passwords with one set of rates, indexes and orderings"""
+    data = request.json or {}
+    passwords = data.get('passwords')
+    
+    if not isinstance(passwords, list) or not all(isinstance(p, str) and p for p in passwords):
+        return jsonify({'error': 'passwords must be a list of non-empty strings'}), 400
+    
+    if len(passwords) > Config.STRENGTH_BATCH_LIMIT:
+        return jsonify({'error': f'At most {Config.STRENGTH_BATCH_LIMIT} passwords per request'}), 400
+    
+    try:
+        analyzer = strength_analyzer(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify(analyzer.analyze_batch(passwords))
+
 @app.route('/api/verify', methods=['POST'])
 def verify():
     """Verify a password against a hash"""
@@ -303,6 +896,34 @@ def verify():
         'hash_type': hash_type
     })
 
+@app.route('/api/generate-hash/batch', methods=['POST'])
+def generate_hash_batch():
+    """Hash many passwords (JSON `passwords` or one per line), streamed as NDJSON"""
+    hash_types = request.args.get('hashTypes')
+    hash_types = hash_types.split(',') if hash_types else list(FAST_HASH_TYPES)
+    
+    try:
+        if request.is_json:
+            hash_types = (request.get_json(silent=True) or {}).get('hashTypes') or hash_types
+        passwords = read_items(request, 'passwords')
+        lines = generate_stream(passwords, hash_types)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+
+@app.route('/api/verify/batch', methods=['POST'])
+def verify_batch():
+    """Verify many pairs (JSON `pairs` or hash<TAB>password lines), streamed as NDJSON"""
+    hash_type = request.args.get('hashType')
+    
+    try:
+        pairs = read_items(request, 'pairs', lambda line: parse_pair_line(line, hash_type))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return Response(stream_with_context(verify_stream(pairs)), mimetype='application/x-ndjson')
+
 # ============================================
 # Run Server
 # ============================================
@@ -3,19 +3,25 @@ Simplified version without Celery/Redis - runs jobs synchronously
 Use this for quick testing without setting up Redis
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from flask_socketio import SocketIO
+import json
 import uuid
 import os
-import time
-import string
-import itertools
 from datetime import datetime, timezone
 
 from config import Config
-from models import db, CrackJob, Wordlist, JobStatus, AttackMode
-from hash_utils import detect_hash_type, get_hash_info, hash_password, verify_password
+from models import db, CrackJob, Wordlist, JobStatus, AttackMode, upgrade_schema
+from pagination import paginate_jobs
+from hash_utils import (
+    auto_detect_hash_type, detect_hash_candidates, get_hash_info, hash_password, verify_password,
+    job_hash_types, matching_hash_type, FAST_HASH_TYPES, UNKNOWN_HASH
+)
+from lookup_tables import lookup_hash, find_in_lookup_tables
+from engine import attack_spec, open_source, get_backend, LIMIT
+from wordlist_buckets import parse_policy
+from batch_hashing import generate_stream, verify_stream, read_items, parse_pair_line
 
 def utcnow():
     """Helper to get current UTC time without deprecation warning"""
@@ -34,6 +40,7 @@ db.init_app(app)
 # Create tables
 with app.app_context():
     db.create_all()
+    upgrade_schema(db.engine)
     
     if os.path.exists('wordlist.txt'):
         existing = Wordlist.query.filter_by(name='wordlist.txt').first()
@@ -50,143 +57,49 @@ with app.app_context():
             db.session.add(wordlist)
             db.session.commit()
 
-def load_wordlist(filename):
-    if not os.path.exists(filename):
-        return []
-    try:
-        with open(filename, 'r', encoding='utf-8', errors='ignore') as f:
-            return [line.strip() for line in f if line.strip()]
-    except:
-        return []
-
-def crack_dictionary_sync(job_id, target_hash, hash_type, wordlist_path):
-    """Synchronous dictionary attack"""
+def run_job_sync(job_id, spec, max_attempts=None, progress_every=1000):
+    """Run a job on the attack engine in this thread, committing progress as it goes"""
     with app.app_context():
         job = CrackJob.query.filter_by(job_id=job_id).first()
         job.status = JobStatus.RUNNING
         job.started_at = utcnow()
         db.session.commit()
         
-        wordlist = load_wordlist(wordlist_path)
-        if not wordlist:
+        try:
+            source = open_source(spec)
+        except ValueError as e:
             job.status = JobStatus.FAILED
-            job.error_message = 'Wordlist not found'
+            job.error_message = str(e)
             db.session.commit()
             return
         
-        total = len(wordlist)
+        total = min(source.keyspace, max_attempts) if max_attempts else source.keyspace
         job.total_attempts = total
+        job.skipped_attempts = source.skipped
         db.session.commit()
         
-        start_time = time.time()
-        
-        for i, password in enumerate(wordlist):
-            if verify_password(password, target_hash, hash_type):
-                elapsed = time.time() - start_time
-                job.status = JobStatus.COMPLETED
-                job.success = True
-                job.cracked_password = password
-                job.current_attempt = i + 1
-                job.time_elapsed = elapsed
-                job.speed = (i + 1) / elapsed if elapsed > 0 else 0
-                job.progress = 100.0
-                job.completed_at = utcnow()
-                db.session.commit()
-                socketio.emit('job_update', job.to_dict(), room=job_id)
-                return
-            
-            if (i + 1) % 1000 == 0:
-                elapsed = time.time() - start_time
-                job.current_attempt = i + 1
-                job.progress = ((i + 1) / total) * 100
-                job.time_elapsed = elapsed
-                job.speed = (i + 1) / elapsed if elapsed > 0 else 0
-                db.session.commit()
-                socketio.emit('job_update', job.to_dict(), room=job_id)
-        
-        elapsed = time.time() - start_time
-        job.status = JobStatus.COMPLETED
-        job.success = False
-        job.current_attempt = total
-        job.time_elapsed = elapsed
-        job.speed = total / elapsed if elapsed > 0 else 0
-        job.progress = 100.0
-        job.completed_at = utcnow()
-        db.session.commit()
-        socketio.emit('job_update', job.to_dict(), room=job_id)
-
-def crack_bruteforce_sync(job_id, target_hash, hash_type, max_length, charset_option):
-    """Synchronous brute force attack"""
-    with app.app_context():
-        job = CrackJob.query.filter_by(job_id=job_id).first()
-        job.status = JobStatus.RUNNING
-        job.started_at = utcnow()
-        db.session.commit()
-        
-        charsets = {
-            '1': string.ascii_lowercase + string.digits,
-            '2': string.ascii_lowercase,
-            '3': string.ascii_lowercase + string.ascii_uppercase + string.digits,
-            '4': string.ascii_letters + string.digits + string.punctuation
-        }
-        
-        charset = charsets.get(charset_option, string.ascii_lowercase + string.digits)
-        total = sum(len(charset) ** length for length in range(1, max_length + 1))
-        job.total_attempts = min(total, Config.MAX_ATTEMPTS_PER_JOB)
-        db.session.commit()
-        
-        start_time = time.time()
-        attempts = 0
+        def on_progress(attempts, elapsed):
+            job.current_attempt = attempts
+            job.progress = min((attempts / total) * 100, 99.9)
+            job.time_elapsed = elapsed
+            job.speed = attempts / elapsed if elapsed > 0 else 0
+            db.session.commit()
+            socketio.emit('job_update', job.to_dict(), room=job_id)
         
-        for length in range(1, max_length + 1):
-            for combo in itertools.product(charset, repeat=length):
-                attempts += 1
-                password = ''.join(combo)
-                
-                if verify_password(password, target_hash, hash_type):
-                    elapsed = time.time() - start_time
-                    job.status = JobStatus.COMPLETED
-                    job.success = True
-                    job.cracked_password = password
-                    job.current_attempt = attempts
-                    job.time_elapsed = elapsed
-                    job.speed = attempts / elapsed if elapsed > 0 else 0
-                    job.progress = 100.0
-                    job.completed_at = utcnow()
-                    db.session.commit()
-                    socketio.emit('job_update', job.to_dict(), room=job_id)
-                    return
-                
-                if attempts >= Config.MAX_ATTEMPTS_PER_JOB:
-                    elapsed = time.time() - start_time
-                    job.status = JobStatus.COMPLETED
-                    job.success = False
-                    job.current_attempt = attempts
-                    job.time_elapsed = elapsed
-                    job.speed = attempts / elapsed if elapsed > 0 else 0
-                    job.progress = 100.0
-                    job.error_message = f'Exceeded max attempts'
-                    job.completed_at = utcnow()
-                    db.session.commit()
-                    socketio.emit('job_update', job.to_dict(), room=job_id)
-                    return
-                
-                if attempts % 5000 == 0:
-                    elapsed = time.time() - start_time
-                    job.current_attempt = attempts
-                    job.progress = min((attempts / total) * 100, 99.9)
-                    job.time_elapsed = elapsed
-                    job.speed = attempts / elapsed if elapsed > 0 else 0
-                    db.session.commit()
-                    socketio.emit('job_update', job.to_dict(), room=job_id)
+        result = get_backend().search(spec, sink=on_progress, max_attempts=max_attempts,
+                                      progress_every=progress_every, source=source)
         
-        elapsed = time.time() - start_time
         job.status = JobStatus.COMPLETED
-        job.success = False
-        job.current_attempt = attempts
-        job.time_elapsed = elapsed
-        job.speed = attempts / elapsed if elapsed > 0 else 0
+        job.success = result.password is not None
+        job.cracked_password = result.password
+        if result.password is not None:
+            job.matched_hash_type = matching_hash_type(result.password, job.target_hash, job.hash_type)
+        job.current_attempt = result.attempts
+        job.time_elapsed = result.elapsed
+        job.speed = result.speed
         job.progress = 100.0
+        if result.stopped == LIMIT:
+            job.error_message = 'Exceeded max attempts'
         job.completed_at = utcnow()
         db.session.commit()
         socketio.emit('job_update', job.to_dict(), room=job_id)
@@ -211,15 +124,59 @@ def detect_hash():
     if not hash_string:
         return jsonify({'error': 'Hash is required'}), 400
     
-    hash_type, confidence, description = detect_hash_type(hash_string)
+    candidates = detect_hash_candidates(hash_string)
+    hash_type, confidence, description = candidates[0] if candidates else UNKNOWN_HASH
     hash_info = get_hash_info(hash_type)
     
-    return jsonify({
+    result = {
         'detected_type': hash_type,
         'confidence': confidence,
         'description': description,
         'info': hash_info,
-        'hash_length': len(hash_string.strip())
+        'hash_length': len(hash_string.strip()),
+        'candidates': [
+            {'type': t, 'confidence': c, 'description': d}
+            for t, c, d in candidates
+        ]
+    }
+    
+    if hash_type in FAST_HASH_TYPES:
+        wordlists = [(wl.name, wl.file_path) for wl in Wordlist.query.all()]
+        found = find_in_lookup_tables(hash_string, hash_type, wordlists)
+        if found:
+            result['lookup'] = {'wordlist': found[0], 'password': found[1]}
+    
+    return jsonify(result)
+
+@app.route('/api/detect-hash/bulk', methods=['POST'])
+def detect_hash_bulk():
+    """Classify many hashes in one request"""
+    data = request.json or {}
+    hashes = data.get('hashes', [])
+    
+    if not isinstance(hashes, list) or not hashes:
+        return jsonify({'error': 'A list of hashes is required'}), 400
+    
+    if len(hashes) > Config.MAX_BULK_HASHES:
+        return jsonify({'error': f'At most {Config.MAX_BULK_HASHES} hashes per request'}), 400
+    
+    results = []
+    summary = {}
+    for hash_string in hashes:
+        candidates = detect_hash_candidates(str(hash_string))
+        hash_type, confidence, _ = candidates[0] if candidates else UNKNOWN_HASH
+        summary[hash_type] = summary.get(hash_type, 0) + 1
+        results.append({
+            'hash': hash_string,
+            'detected_type': hash_type,
+            'confidence': confidence,
+            'candidates': [candidate[0] for candidate in candidates]
+        })
+    
+    return jsonify({
+        'results': results,
+        'count': len(results),
+        'summary': summary
     })
 
 @app.route('/api/jobs', methods=['POST'])
@@ -236,8 +193,14 @@ def create_job():
     if not target_hash:
         return jsonify({'error': 'Hash is required'}), 400
     
+    try:
+        policy = parse_policy(data.get('policy'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Several fitting formats are all tried in one pass
     if data.get('autoDetect', False):
-        detected_type, _, _ = detect_hash_type(target_hash)
+        detected_type = auto_detect_hash_type(target_hash)
         if detected_type != 'unknown':
             hash_type = detected_type
     
@@ -248,6 +211,19 @@ def create_job():
     except KeyError:
         attack_mode_enum = AttackMode.DICTIONARY
     
+    # Precomputed lookup tables resolve unsalted hashes without running a job
+    password = None
+    matched_type = None
+    if attack_mode_enum == AttackMode.DICTIONARY:
+        wordlist = Wordlist.query.filter_by(name=wordlist_name).first()
+        wordlist_path = wordlist.file_path if wordlist else wordlist_name
+        for lookup_type in job_hash_types(target_hash, hash_type):
+            if lookup_type in FAST_HASH_TYPES:
+                password = lookup_hash(wordlist_path, lookup_type, target_hash)
+                if password is not None:
+                    matched_type = lookup_type
+                    break
+    
     job = CrackJob(
         job_id=job_id,
         target_hash=target_hash,
@@ -256,17 +232,40 @@ def create_job():
         wordlist_name=wordlist_name if attack_mode_enum == AttackMode.DICTIONARY else None,
         max_length=max_length if attack_mode_enum == AttackMode.BRUTEFORCE else None,
         charset_option=charset_option if attack_mode_enum == AttackMode.BRUTEFORCE else None,
+        policy=json.dumps(policy) if policy and attack_mode_enum == AttackMode.DICTIONARY else None,
+        bucketed=bool(data.get('bucketed')) and not policy and attack_mode_enum == AttackMode.DICTIONARY,
         status=JobStatus.PENDING
     )
     
+    if password is not None:
+        job.status = JobStatus.COMPLETED
+        job.success = True
+        job.cracked_password = password
+        job.matched_hash_type = matched_type
+        job.current_attempt = 1
+        job.total_attempts = 1
+        job.progress = 100.0
+        job.started_at = utcnow()
+        job.completed_at = job.started_at
+    
     db.session.add(job)
     db.session.commit()
     
+    if password is not None:
+        return jsonify({
+            'job_id': job_id,
+            'status': 'Resolved from lookup table',
+            'job': job.to_dict()
+        }), 201
+    
     # Run synchronously in background thread
     if attack_mode_enum == AttackMode.DICTIONARY:
-        socketio.start_background_task(crack_dictionary_sync, job_id, target_hash, hash_type, wordlist_name)
+        spec = attack_spec('dictionary', target_hash, hash_type, wordlist=wordlist_name, policy=policy,
+                           bucketed=job.bucketed)
+        socketio.start_background_task(run_job_sync, job_id, spec)
     elif attack_mode_enum == AttackMode.BRUTEFORCE:
-        socketio.start_background_task(crack_bruteforce_sync, job_id, target_hash, hash_type, max_length, charset_option)
+        spec = attack_spec('bruteforce', target_hash, hash_type, charset=charset_option, max_length=max_length)
+        socketio.start_background_task(run_job_sync, job_id, spec, Config.MAX_ATTEMPTS_PER_JOB, 5000)
     
     return jsonify({
         'job_id': job_id,
@@ -303,24 +302,17 @@ def cancel_job(job_id):
 
 @app.route('/api/jobs', methods=['GET'])
 def list_jobs():
-    status = request.args.get('status')
-    limit = request.args.get('limit', 50, type=int)
-    
-    query = CrackJob.query
-    
-    if status:
-        try:
-            status_enum = JobStatus[status.upper()]
-            query = query.filter_by(status=status_enum)
-        except KeyError:
-            pass
-    
-    jobs = query.order_by(CrackJob.created_at.desc()).limit(limit).all()
+    """List jobs newest first (?status=, ?limit=, ?cursor=, ?fields=)"""
+    try:
+        page = paginate_jobs(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    return jsonify({
-        'jobs': [job.to_dict() for job in jobs],
-        'count': len(jobs)
-    })
+    # Pollers send If-None-Match and get a bodiless 304 while nothing changed
+    response = jsonify(page)
+    response.add_etag()
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
 
 @app.route('/api/wordlists', methods=['GET'])
 def list_wordlists():
@@ -365,6 +357,34 @@ def verify():
         'hash_type': hash_type
     })
 
+@app.route('/api/generate-hash/batch', methods=['POST'])
+def generate_hash_batch():
+    """Hash many passwords (JSON `passwords` or one per line), streamed as NDJSON"""
+    hash_types = request.args.get('hashTypes')
+    hash_types = hash_types.split(',') if hash_types else list(FAST_HASH_TYPES)
+    
+    try:
+        if request.is_json:
+            hash_types = (request.get_json(silent=True) or {}).get('hashTypes') or hash_types
+        passwords = read_items(request, 'passwords')
+        lines = generate_stream(passwords, hash_types)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+
+@app.route('/api/verify/batch', methods=['POST'])
+def verify_batch():
+    """Verify many pairs (JSON `pairs` or hash<TAB>password lines), streamed as NDJSON"""
+    hash_type = request.args.get('hashType')
+    
+    try:
+        pairs = read_items(request, 'pairs', lambda line: parse_pair_line(line, hash_type))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return Response(stream_with_context(verify_stream(pairs)), mimetype='application/x-ndjson')
+
 if __name__ == '__main__':
     print("🚀 Starting Password Cracker API v2.0 (Simple Mode)")
     print("📡 Server running on http://localhost:5000")
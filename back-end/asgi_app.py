@@ -0,0 +1,198 @@
+"""
+Asyncio (ASGI) API for job submission, status and progress streaming
+
+Runs next to the Flask API on the same database, models and Celery tasks:
+
+    uvicorn asgi_app:app --host 0.0.0.0 --port 8000
+
+Database work runs in the threadpool under the slim worker app context, so
+the event loop only holds idle connections. Progress is served as
+server-sent events from a single hub: once per interval it loads every
+watched job in one query and pushes the result to each subscriber. The
+database load stays the same whether a job has one watcher or thousands.
+Each subscriber queue only holds the newest state, so a slow client never
+holds back the others.
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from config import Config
+from models import db, CrackJob, upgrade_schema
+from progress_store import merge_progress
+from worker_runtime import app_context
+from job_service import submit_job, JobSubmissionError
+
+FINAL_STATUSES = ('completed', 'failed', 'cancelled')
+
+# Jobs loaded per query by the hub
+REFRESH_BATCH = 500
+
+def load_jobs(job_ids):
+    """Serialized jobs with live progress, keyed by job id (blocking)"""
+    jobs = {}
+    with app_context():
+        for i in range(0, len(job_ids), REFRESH_BATCH):
+            batch = job_ids[i:i + REFRESH_BATCH]
+            for job in CrackJob.query.filter(CrackJob.job_id.in_(batch)):
+                jobs[job.job_id] = merge_progress(job.to_dict())
+    return jobs
+
+def prepare_database():
+    """Create missing tables and columns, so this API can start on its own (blocking)"""
+    with app_context():
+        db.create_all()
+        upgrade_schema(db.engine)
+
+def create_job(data):
+    """Submit a job under the worker app context (blocking)"""
+    with app_context():
+        job, message = submit_job(data)
+        return job.to_dict(), message
+
+class JobHub:
+    """Shares one periodic refresh of the watched jobs among all subscribers"""
+    
+    def __init__(self, interval):
+        self.interval = interval
+        self._subscribers = {}
+        self._latest = {}
+    
+    @staticmethod
+    def _offer(queue, job_data):
+        # Keep only the newest state for slow consumers
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(job_data)
+    
+    def subscribe(self, job_id):
+        queue = asyncio.Queue(maxsize=1)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        return queue
+    
+    def unsubscribe(self, job_id, queue):
+        queues = self._subscribers.get(job_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[job_id]
+            self._latest.pop(job_id, None)
+    
+    def publish(self, job_data):
+        job_id = job_data['job_id']
+        if self._latest.get(job_id) == job_data:
+            return
+        self._latest[job_id] = job_data
+        for queue in self._subscribers.get(job_id, ()):
+            self._offer(queue, job_data)
+    
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self._subscribers:
+                continue
+            
+            try:
+                jobs = await run_in_threadpool(load_jobs, list(self._subscribers))
+            except Exception as e:
+                print(f'Job hub refresh failed: {e}')
+                continue
+            
+            for job_data in jobs.values():
+                self.publish(job_data)
+
+hub = JobHub(Config.ASGI_REFRESH_INTERVAL)
+
+def sse_event(job_data):
+    return f'event: job_update\ndata: {json.dumps(job_data)}\n\n'
+
+async def health(request):
+    return JSONResponse({'status': 'ok', 'message': 'Password Cracker ASGI API is running'})
+
+async def post_job(request):
+    try:
+        data = await request.json()
+    except ValueError:
+        return JSONResponse({'error': 'Invalid JSON body'}, status_code=400)
+    
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        return JSONResponse({'error': 'JSON body must be an object'}, status_code=400)
+    
+    try:
+        job_data, message = await run_in_threadpool(create_job, data)
+    except JobSubmissionError as e:
+        return JSONResponse({'error': str(e)}, status_code=e.status)
+    
+    return JSONResponse({
+        'job_id': job_data['job_id'],
+        'status': message,
+        'job': job_data
+    }, status_code=201)
+
+async def get_job(request):
+    job_id = request.path_params['job_id']
+    jobs = await run_in_threadpool(load_jobs, [job_id])
+    if job_id not in jobs:
+        return JSONResponse({'error': 'Job not found'}, status_code=404)
+    return JSONResponse(jobs[job_id])
+
+async def stream_job(request):
+    """Server-sent events: the current state, then every change until the job ends"""
+    job_id = request.path_params['job_id']
+    jobs = await run_in_threadpool(load_jobs, [job_id])
+    if job_id not in jobs:
+        return JSONResponse({'error': 'Job not found'}, status_code=404)
+    
+    async def events():
+        queue = hub.subscribe(job_id)
+        try:
+            job_data = jobs[job_id]
+            yield sse_event(job_data)
+            
+            while job_data['status'] not in FINAL_STATUSES:
+                try:
+                    update = await asyncio.wait_for(queue.get(), Config.SSE_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    # Comment lines keep proxies from closing idle streams
+                    yield ': keep-alive\n\n'
+                    continue
+                
+                if update != job_data:
+                    job_data = update
+                    yield sse_event(job_data)
+        finally:
+            hub.unsubscribe(job_id, queue)
+    
+    return StreamingResponse(events(), media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@asynccontextmanager
+async def lifespan(app):
+    await run_in_threadpool(prepare_database)
+    refresher = asyncio.create_task(hub.run())
+    try:
+        yield
+    finally:
+        refresher.cancel()
+
+app = Starlette(
+    routes=[
+        Route('/api/health', health, methods=['GET']),
+        Route('/api/jobs', post_job, methods=['POST']),
+        Route('/api/jobs/{job_id}', get_job, methods=['GET']),
+        Route('/api/jobs/{job_id}/events', stream_job, methods=['GET']),
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    lifespan=lifespan
+)
@@ -0,0 +1,161 @@
+"""
+Batch hash generation and verification
+
+Both endpoints take either a JSON array or a streamed text body and answer
+with newline-delimited JSON, one line per input, in input order. Hash
+functions and verifiers are resolved once per request (verifiers through the
+shared worker cache), and inputs are processed in chunks on a thread pool
+with a bounded number of chunks in flight, so large inputs are neither
+buffered whole nor answered only at the end.
+
+Text bodies:
+    generate   one password per line
+    verify     `hash<TAB>password` per line (hash type from ?hashType=, else detected)
+"""
+
+import json
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from hash_utils import CRYPT_HANDLERS, FAST_HASH_TYPES, detect_hash_type, make_hasher
+from worker_cache import get_verifier
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """Process-wide pool shared by all batch requests"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(Config.BATCH_HASH_WORKERS, thread_name_prefix='batch-hash')
+    return _executor
+
+def iter_chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def map_chunks(func, items):
+    """Apply func to chunks of items on the pool, yielding results in order"""
+    executor = get_executor()
+    window = Config.BATCH_HASH_WORKERS * 2
+    pending = deque()
+    
+    for chunk in iter_chunks(items, Config.BATCH_HASH_CHUNK):
+        pending.append(executor.submit(func, chunk))
+        # Bound memory: wait for the oldest chunk before reading further
+        if len(pending) >= window:
+            yield from pending.popleft().result()
+    
+    while pending:
+        yield from pending.popleft().result()
+
+class LimitExceeded:
+    """Marker yielded in place of the first item over the limit"""
+    
+    def __init__(self, limit):
+        self.limit = limit
+
+def limited(items, limit):
+    """Items up to the per-request limit, then an error marker"""
+    for count, item in enumerate(items):
+        if count >= limit:
+            yield LimitExceeded(limit)
+            return
+        yield item
+
+def iter_lines(stream):
+    """Non-empty lines of a text or bytes stream, newline stripped"""
+    for line in stream:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', errors='ignore')
+        line = line.rstrip('\r\n')
+        if line:
+            yield line
+
+def parse_pair_line(line, hash_type=None):
+    """`hash<TAB>password` as a verify item"""
+    hash_string, _, password = line.partition('\t')
+    return {'hash': hash_string.strip(), 'password': password, 'hashType': hash_type}
+
+def read_items(request, key, parse_line=None):
+    """Items from a JSON body's `key` array, or lines of a streamed text body"""
+    if request.is_json:
+        items = (request.get_json(silent=True) or {}).get(key)
+        if not isinstance(items, list):
+            raise ValueError(f'{key} must be a list')
+        return items
+    
+    lines = iter_lines(request.stream)
+    return (parse_line(line) for line in lines) if parse_line else lines
+
+def resolve_hashers(hash_types):
+    """hash type -> hasher (None when unavailable on this host); ValueError if unknown"""
+    if not isinstance(hash_types, list):
+        raise ValueError('hashTypes must be a list')
+    unsupported = [t for t in hash_types if t not in FAST_HASH_TYPES and t not in CRYPT_HANDLERS]
+    if unsupported:
+        raise ValueError(f'Unsupported hash types: {", ".join(map(str, unsupported))}')
+    return {hash_type: make_hasher(hash_type) for hash_type in hash_types}
+
+def ndjson(record):
+    return json.dumps(record) + '\n'
+
+def generate_stream(passwords, hash_types):
+    """NDJSON lines of {password, hashes} for every password"""
+    hashers = resolve_hashers(hash_types)
+    
+    def hash_chunk(chunk):
+        results = []
+        for password in chunk:
+            if isinstance(password, LimitExceeded):
+                results.append({'error': f'At most {password.limit} passwords per request'})
+                continue
+            if not isinstance(password, str):
+                results.append({'error': 'Passwords must be strings'})
+                continue
+            hashes = {hash_type: hasher(password) if hasher else None
+                      for hash_type, hasher in hashers.items()}
+            results.append({'password': password, 'hashes': hashes})
+        return results
+    
+    return (ndjson(result) for result in map_chunks(hash_chunk, limited(passwords, Config.BATCH_HASH_LIMIT)))
+
+def _verify_item(item):
+    if isinstance(item, LimitExceeded):
+        return {'error': f'At most {item.limit} pairs per request'}
+    
+    if not isinstance(item, dict):
+        return {'error': 'Each pair must be an object with password and hash'}
+    
+    password = item.get('password', '')
+    hash_string = item.get('hash', '')
+    if not isinstance(password, str) or not isinstance(hash_string, str) or not password or not hash_string:
+        return {'error': 'Password and hash are required'}
+    
+    hash_type = item.get('hashType') or detect_hash_type(hash_string)[0]
+    if not isinstance(hash_type, str):
+        return {'error': 'hashType must be a string'}
+    
+    return {
+        'matches': bool(get_verifier(hash_string, hash_type)(password)),
+        'password': password,
+        'hash': hash_string,
+        'hash_type': hash_type
+    }
+
+def verify_stream(pairs):
+    """NDJSON lines of verification results for every pair"""
+    def verify_chunk(chunk):
+        return [_verify_item(item) for item in chunk]
+    
+    return (ndjson(result) for result in map_chunks(verify_chunk, limited(pairs, Config.BATCH_HASH_LIMIT)))
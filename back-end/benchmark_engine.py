@@ -0,0 +1,49 @@
+"""
+Attack engine benchmark
+
+Runs the same brute-force search on each engine backend and hash type and
+reports candidates per second. The target is never in the keyspace, so every
+run covers the full slice. Backends other than inline use ENGINE_WORKERS;
+the celery backend needs a running worker.
+
+Usage: python benchmark_engine.py [--backends inline,process] [--hash-types md5,sha1]
+                                  [--charset 1] [--max-length 4] [--limit 1000000]
+"""
+
+import argparse
+
+from engine import attack_spec, get_backend
+from hash_utils import make_hasher
+
+def run(backend_name, hash_type, charset, max_length, limit):
+    """Search `limit` candidates; returns the search result or None if the hash is unavailable"""
+    hasher = make_hasher(hash_type)
+    if hasher is None:
+        return None
+    
+    # Longer than max_length, so it never matches
+    target = hasher('x' * (max_length + 1))
+    spec = attack_spec('bruteforce', target, hash_type, charset=charset, max_length=max_length)
+    return get_backend(backend_name).search(spec, end=limit)
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare attack engine backends')
+    parser.add_argument('--backends', default='inline,thread,process')
+    parser.add_argument('--hash-types', default='md5,sha1,sha256')
+    parser.add_argument('--charset', default='1')
+    parser.add_argument('--max-length', type=int, default=4)
+    parser.add_argument('--limit', type=int, default=1_000_000)
+    args = parser.parse_args()
+    
+    print(f'{"backend":<10}{"hash":<10}{"candidates":>12}{"seconds":>10}{"H/s":>14}')
+    for backend_name in args.backends.split(','):
+        for hash_type in args.hash_types.split(','):
+            result = run(backend_name, hash_type, args.charset, args.max_length, args.limit)
+            if result is None:
+                print(f'{backend_name:<10}{hash_type:<10}{"unavailable":>12}')
+                continue
+            print(f'{backend_name:<10}{hash_type:<10}{result.attempts:>12}'
+                  f'{result.elapsed:>10.2f}{result.speed:>14,.0f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Worker startup benchmark
+
+Times, in fresh interpreters, what a Celery worker pays before its first
+task: importing `tasks`, entering the slim worker app context and running a
+first query. The old path (importing the whole API `app`) is measured for
+comparison. A throwaway SQLite database is used so the real one is untouched.
+
+Usage: python benchmark_startup.py [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+SCENARIOS = [
+    ('import tasks', 'import tasks'),
+    ('worker app context', (
+        'import tasks, worker_runtime\n'
+        'with worker_runtime.app_context(): pass'
+    )),
+    ('worker first query', (
+        'import tasks, worker_runtime\n'
+        'from sqlalchemy import text\n'
+        'from models import db\n'
+        'with worker_runtime.app_context(): db.session.execute(text("SELECT 1"))'
+    )),
+    ('import app (old worker path)', 'import app'),
+]
+
+TIMER = (
+    'import time\n'
+    '_start = time.perf_counter()\n'
+    '{code}\n'
+    'print(time.perf_counter() - _start)\n'
+)
+
+def time_scenario(code, env):
+    """Seconds spent running `code` in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, '-c', TIMER.format(code=code)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure worker startup cost')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f'sqlite:///{os.path.join(tmp, "bench.db")}')
+        
+        print(f'{"scenario":<32}{"median ms":>12}{"min ms":>10}')
+        for name, code in SCENARIOS:
+            times = [time_scenario(code, env) * 1000 for _ in range(args.runs)]
+            print(f'{name:<32}{statistics.median(times):>12.1f}{min(times):>10.1f}')
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,21 @@
-from celery import Celery
+from celery import Celery, Task
 from config import Config
 
+class WorkerTask(Task):
+    """Runs each task inside the slim worker app context"""
+    
+    def __call__(self, *args, **kwargs):
+        from worker_runtime import app_context
+        with app_context():
+            return self.run(*args, **kwargs)
+
 def make_celery(app_name=__name__):
     celery = Celery(
         app_name,
         broker=Config.CELERY_BROKER_URL,
-        backend=Config.CELERY_RESULT_BACKEND
+        backend=Config.CELERY_RESULT_BACKEND,
+        task_cls=WorkerTask,
+        include=['tasks']
     )
     celery.conf.update(
         task_serializer='json',
@@ -0,0 +1,75 @@
+"""
+Combinator and hybrid candidate sources
+
+Combinator:   every word of the left list followed by every word of the right list
+Hybrid (W+M): every word followed by every mask candidate, e.g. word + ?d?d
+Hybrid (M+W): every mask candidate followed by every word, e.g. ?d?d + word
+
+All three are word-major: candidate index i maps to word i // inner_size of
+the streamed (outer) wordlist and entry i % inner_size of the in-memory inner
+list or mask. The keyspace is exact and any [start, end) slice can be
+generated on its own, so jobs can be split into shards.
+"""
+
+import itertools
+
+from keyspace import parse_mask, mask_keyspace
+from worker_cache import get_wordlist
+
+def count_words(wordlist_path):
+    """Number of non-empty lines in a wordlist"""
+    with open(wordlist_path, 'r', encoding='utf-8', errors='ignore') as f:
+        return sum(1 for line in f if line.strip())
+
+def iter_words(wordlist_path, skip=0):
+    """Stream the non-empty lines of a wordlist, skipping the first `skip`"""
+    with open(wordlist_path, 'r', encoding='utf-8', errors='ignore') as f:
+        words = (line.strip() for line in f)
+        yield from itertools.islice((word for word in words if word), skip, None)
+
+def load_words(wordlist_path):
+    """The inner side of a combination, from the worker's wordlist cache"""
+    return get_wordlist(wordlist_path)
+
+def _combine(outer_path, inner_size, iter_inner, start, end, inner_first=False):
+    """Yield outer word x inner entry combinations for indices [start, end)"""
+    if not inner_size or (end is not None and start >= end):
+        return
+    
+    remaining = None if end is None else end - start
+    first_word, offset = divmod(start, inner_size)
+    
+    for word in iter_words(outer_path, skip=first_word):
+        for entry in iter_inner(offset):
+            yield entry + word if inner_first else word + entry
+            if remaining is not None:
+                remaining -= 1
+                if not remaining:
+                    return
+        offset = 0
+
+def combinator_keyspace(left_path, right_path):
+    """Exact number of combinator candidates"""
+    return count_words(left_path) * count_words(right_path)
+
+def combinator_candidates(left_path, right_path, start=0, end=None):
+    """left word + right word, streaming the left list"""
+    right = load_words(right_path)
+    return _combine(left_path, len(right), lambda offset: itertools.islice(right, offset, None),
+                    start, end)
+
+def hybrid_keyspace(wordlist_path, mask):
+    """Exact number of hybrid candidates"""
+    return count_words(wordlist_path) * mask_keyspace(parse_mask(mask))
+
+def hybrid_candidates(wordlist_path, mask, mask_first=False, start=0, end=None):
+    """word + mask candidate (or mask candidate + word when mask_first)"""
+    charsets = parse_mask(mask)
+    
+    def iter_mask(offset):
+        # The mask is regenerated per word rather than held in memory
+        combos = itertools.product(*charsets)
+        return (''.join(combo) for combo in itertools.islice(combos, offset, None))
+    
+    return _combine(wordlist_path, mask_keyspace(charsets), iter_mask, start, end,
+                    inner_first=mask_first)
@@ -11,16 +11,83 @@ class Config:
     # Database
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///cracker.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLITE_WAL = os.getenv('SQLITE_WAL', 'True') == 'True'
+    
+    # Saved results log of the v1 API (legacy JSON file is imported once)
+    RESULTS_DB_PATH = os.getenv('RESULTS_DB_PATH', 'crack_results.db')
+    RESULTS_JSON_PATH = os.getenv('RESULTS_JSON_PATH', 'crack_results.json')
     
     # Celery / Redis
     CELERY_BROKER_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
     CELERY_RESULT_BACKEND = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
     
+    # Live job progress counters ('redis' or 'memory' for single-process runs)
+    PROGRESS_BACKEND = os.getenv('PROGRESS_BACKEND', 'redis')
+    PROGRESS_REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    PROGRESS_TTL = int(os.getenv('PROGRESS_TTL', 86400))
+    
+    # Socket.IO fan-out: workers publish job events through this queue
+    SOCKETIO_MESSAGE_QUEUE = os.getenv('SOCKETIO_MESSAGE_QUEUE', os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+    SOCKETIO_MIN_INTERVAL = float(os.getenv('SOCKETIO_MIN_INTERVAL', 0.25))
+    
+    # Metrics: seconds between flushes of each process's buffered counters
+    METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 1.0))
+    
+    # ASGI API: seconds between job refreshes shared by all SSE subscribers
+    ASGI_REFRESH_INTERVAL = float(os.getenv('ASGI_REFRESH_INTERVAL', 1.0))
+    SSE_HEARTBEAT = float(os.getenv('SSE_HEARTBEAT', 15))
+    
+    # Flask SSE / long-poll: Redis channel feeding the in-memory update hub
+    LIVE_UPDATES_CHANNEL = os.getenv('LIVE_UPDATES_CHANNEL', 'job_updates')
+    LIVE_UPDATES_MAX_JOBS = int(os.getenv('LIVE_UPDATES_MAX_JOBS', 10000))
+    LONG_POLL_TIMEOUT = float(os.getenv('LONG_POLL_TIMEOUT', 25))
+    
     # Cracking limits
     MAX_BRUTEFORCE_LENGTH = 6
     MAX_ATTEMPTS_PER_JOB = 10_000_000
+    
+    # Searches answered inside an HTTP request (v1 API)
+    MAX_SYNC_ATTEMPTS = int(os.getenv('MAX_SYNC_ATTEMPTS', 100_000))
+    
+    # Attack engine: backend ('inline', 'thread', 'process', 'celery'), pool size, candidates per slice
+    ENGINE_BACKEND = os.getenv('ENGINE_BACKEND', 'inline')
+    ENGINE_WORKERS = int(os.getenv('ENGINE_WORKERS', os.cpu_count() or 4))
+    ENGINE_CHUNK = int(os.getenv('ENGINE_CHUNK', 200_000))
+    
+    # Time-budgeted jobs: how often (seconds of hashing) the deadline is checked
+    BUDGET_CHECK_INTERVAL = float(os.getenv('BUDGET_CHECK_INTERVAL', 0.05))
+    MAX_BULK_HASHES = int(os.getenv('MAX_BULK_HASHES', 100_000))
+    HASHFILE_BATCH_SIZE = int(os.getenv('HASHFILE_BATCH_SIZE', 1000))
     WORDLIST_DIR = os.getenv('WORDLIST_DIR', './wordlists')
     
+    # Per-worker cache of parsed wordlists (bytes) and compiled verifiers (entries)
+    WORDLIST_CACHE_BYTES = int(os.getenv('WORDLIST_CACHE_BYTES', 256 * 1024 * 1024))
+    VERIFIER_CACHE_SIZE = int(os.getenv('VERIFIER_CACHE_SIZE', 1024))
+    
+    # Precomputed lookup tables (unsalted fast hashes)
+    LOOKUP_TABLE_DIR = os.getenv('LOOKUP_TABLE_DIR', './tables')
+    
+    # Rainbow tables (short brute-force keyspaces)
+    RAINBOW_TABLE_DIR = os.getenv('RAINBOW_TABLE_DIR', './tables/rainbow')
+    RAINBOW_CHAIN_LENGTH = int(os.getenv('RAINBOW_CHAIN_LENGTH', 1000))
+    
+    # Markov models for probability-ordered brute force
+    MARKOV_MODEL_DIR = os.getenv('MARKOV_MODEL_DIR', './models')
+    
+    # Batch generate/verify endpoints: pool threads, items per pool task, items per request
+    BATCH_HASH_WORKERS = int(os.getenv('BATCH_HASH_WORKERS', os.cpu_count() or 4))
+    BATCH_HASH_CHUNK = int(os.getenv('BATCH_HASH_CHUNK', 1000))
+    BATCH_HASH_LIMIT = int(os.getenv('BATCH_HASH_LIMIT', 100000))
+    
+    # Strength analysis: default Markov model, seconds spent measuring each hash rate
+    STRENGTH_MARKOV_MODEL = os.getenv('STRENGTH_MARKOV_MODEL', '')
+    STRENGTH_BENCH_SECONDS = float(os.getenv('STRENGTH_BENCH_SECONDS', 0.2))
+    STRENGTH_BATCH_LIMIT = int(os.getenv('STRENGTH_BATCH_LIMIT', 10000))
+    
+    # PCFG grammars trained on cracked passwords / wordlists
+    PCFG_MODEL_DIR = os.getenv('PCFG_MODEL_DIR', './models/pcfg')
+    PCFG_MAX_QUEUE = int(os.getenv('PCFG_MAX_QUEUE', 1_000_000))
+    
     # Hashcat (optional)
     HASHCAT_PATH = os.getenv('HASHCAT_PATH', None)
     USE_HASHCAT = os.getenv('USE_HASHCAT', 'False') == 'True'
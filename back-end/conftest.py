@@ -0,0 +1,87 @@
+"""
+Shared setup for the unit tests
+
+Run from back-end/:
+    python -m pytest
+
+Nothing external is needed: progress counters use the in-memory backend, the
+database and every generated file live in a temporary directory, worker
+events go to a recorder, and tasks are run in-process with task.run().
+test_api.py is a manual script against a running server and is not collected.
+"""
+
+import os
+import tempfile
+
+# Config reads the environment at import time, so this runs before any app module is imported
+_tmp_dir = tempfile.mkdtemp(prefix='cracker-tests-')
+os.environ.update(
+    PROGRESS_BACKEND='memory',
+    DATABASE_URL=f'sqlite:///{os.path.join(_tmp_dir, "cracker.db")}',
+    RESULTS_DB_PATH=os.path.join(_tmp_dir, 'crack_results.db'),
+    LOOKUP_TABLE_DIR=os.path.join(_tmp_dir, 'tables'),
+    RAINBOW_TABLE_DIR=os.path.join(_tmp_dir, 'tables', 'rainbow'),
+    MARKOV_MODEL_DIR=os.path.join(_tmp_dir, 'models'),
+    PCFG_MODEL_DIR=os.path.join(_tmp_dir, 'models', 'pcfg'),
+    ENGINE_BACKEND='inline',
+)
+
+import pytest
+
+collect_ignore = ['test_api.py']
+
+class EventRecorder:
+    """Stands in for the message-queue SocketIO; keeps what was emitted"""
+    
+    def __init__(self):
+        self.events = []
+    
+    def emit(self, event, data, room=None):
+        self.events.append((event, data, room))
+
+@pytest.fixture(autouse=True)
+def emitted(monkeypatch):
+    """Worker events recorded instead of published, with a fresh rate limit per test"""
+    import events
+    recorder = EventRecorder()
+    monkeypatch.setattr(events, 'get_emitter', lambda: recorder)
+    monkeypatch.setattr(events, '_throttle', events.RoomThrottle(events.Config.SOCKETIO_MIN_INTERVAL))
+    return recorder.events
+
+@pytest.fixture
+def flask_app():
+    """The Celery-backed API with empty job tables"""
+    from app import app
+    from models import db, CrackJob, CrackTarget
+    
+    with app.app_context():
+        CrackTarget.query.delete()
+        CrackJob.query.delete()
+        db.session.commit()
+        yield app
+        db.session.remove()
+
+@pytest.fixture
+def client(flask_app):
+    return flask_app.test_client()
+
+@pytest.fixture
+def queued(monkeypatch):
+    """Task dispatches recorded as (task name, args) instead of sent to the broker"""
+    import tasks
+    calls = []
+    for task in (tasks.crack_dictionary_task, tasks.crack_bruteforce_task, tasks.crack_pcfg_task,
+                 tasks.crack_combinator_task, tasks.crack_hybrid_task):
+        monkeypatch.setattr(task, 'apply_async',
+                            lambda args, task_id=None, name=task.name: calls.append((name, args)))
+        monkeypatch.setattr(task, 'update_state', lambda **kwargs: None)
+    return calls
+
+@pytest.fixture
+def wordlist(tmp_path):
+    """Write a wordlist file and return its path"""
+    def write(words, name='wordlist.txt'):
+        path = tmp_path / name
+        path.write_text('\n'.join(words) + '\n', encoding='utf-8')
+        return str(path)
+    return write
@@ -0,0 +1,352 @@
+"""
+Attack engine shared by the Celery tasks, the simple API and the v1 API
+
+An attack is described by a spec, a plain JSON-able dict (see attack_spec),
+so it can be sent to another process or a Celery worker. The parts:
+
+    sources    open_source(spec) -> Source(keyspace, candidates(start, end)),
+               index-addressable so any slice can be searched on its own
+    matchers   compiled verifiers from worker_cache.get_verifier, or a batched
+               block scanner for sources laid out as fixed-width byte blocks
+    search     search(candidates, verify, sink, ...) tries candidates in order
+               and stops on a match, the attempt limit or a deadline
+    sinks      callables sink(attempts, elapsed) told about progress
+    backends   where the search runs: inline, thread, process or celery.
+               The pooled backends split [start, end) into ENGINE_CHUNK slices,
+               search them in parallel and combine the results in index
+               order, so attempts and stop positions match an inline run.
+
+Compare backends and hash types: python benchmark_engine.py
+"""
+
+import functools
+import itertools
+import os
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from config import Config
+from hash_utils import make_block_scanner
+from keyspace import get_charset, keyspace_size, keyspace_candidates
+from wordlist_buckets import get_block_layout, select_words
+from worker_cache import get_wordlist, get_verifier
+
+# Why a search stopped
+FOUND = 'found'
+EXHAUSTED = 'exhausted'
+LIMIT = 'limit'
+DEADLINE = 'deadline'
+
+DEFAULT_PROGRESS_EVERY = 5000
+
+# skipped: entries of the underlying list a filter removed before the search
+# blocks(start, end): (width, block) segments for the batched kernel, if the source has them
+Source = namedtuple('Source', 'keyspace candidates skipped blocks', defaults=(0, None))
+
+class SearchResult(namedtuple('SearchResult', 'password attempts elapsed stopped')):
+    """Outcome of a search; attempts counts candidates tried, the match included"""
+    
+    __slots__ = ()
+    
+    @property
+    def speed(self):
+        return self.attempts / self.elapsed if self.elapsed > 0 else 0
+    
+    def to_dict(self):
+        return {
+            'success': self.password is not None,
+            'password': self.password,
+            'attempts': self.attempts,
+            'time': self.elapsed,
+            'speed': self.speed
+        }
+
+def attack_spec(mode, target_hash, hash_type, **options):
+    """Spec of an attack: mode, target and the mode's options
+    
+    dictionary   wordlist, policy (wordlist_buckets.parse_policy), bucketed
+    bruteforce   charset (preset option), max_length, markov_model, markov_threshold
+    combinator   left, right (left_count, right_count filled in by resolve_spec)
+    hybrid       wordlist, mask, mask_first (word_count filled in by resolve_spec)
+    """
+    return dict(options, mode=mode, hash=target_hash, hash_type=hash_type)
+
+def resolve_spec(spec):
+    """Spec with the wordlist sizes its source needs, counted once so slices do not rescan"""
+    mode = spec['mode']
+    
+    if mode == 'combinator' and 'left_count' not in spec:
+        from combinator import count_words
+        if not os.path.exists(spec['left']) or not os.path.exists(spec['right']):
+            raise ValueError('Wordlist not found')
+        return dict(spec, left_count=count_words(spec['left']), right_count=count_words(spec['right']))
+    
+    if mode == 'hybrid' and 'word_count' not in spec:
+        from combinator import count_words
+        if not os.path.exists(spec['wordlist']):
+            raise ValueError('Wordlist not found')
+        return dict(spec, word_count=count_words(spec['wordlist']))
+    
+    return spec
+
+def open_source(spec):
+    """Keyspace and slice generator of a spec; ValueError if it cannot be searched"""
+    mode = spec['mode']
+    
+    if mode == 'dictionary':
+        # Bucketed order: fixed-width blocks by UTF-8 width, scanned by the batched kernel
+        if spec.get('bucketed'):
+            layout = get_block_layout(spec['wordlist']) if os.path.exists(spec['wordlist']) else None
+            if not layout or not layout.count:
+                raise ValueError('Wordlist not found or empty')
+            return Source(layout.count, layout.candidates, blocks=layout.segments)
+        
+        # Only the words a password policy allows, in wordlist order; with a length
+        # index the other lines are never read
+        if spec.get('policy'):
+            if not os.path.exists(spec['wordlist']):
+                raise ValueError('Wordlist not found or empty')
+            count, candidates, skipped = select_words(spec['wordlist'], spec['policy'])
+            if not count + skipped:
+                raise ValueError('Wordlist not found or empty')
+            return Source(count, candidates, skipped)
+        
+        words = get_wordlist(spec['wordlist'])
+        if not words:
+            raise ValueError('Wordlist not found or empty')
+        
+        return Source(len(words), lambda start, end: itertools.islice(words, start, end))
+    
+    if mode == 'bruteforce':
+        charset = get_charset(spec.get('charset'))
+        max_length = spec['max_length']
+        
+        # Markov models enumerate the same keyspace in probability order
+        if spec.get('markov_model'):
+            from markov import load_markov_model, MarkovGenerator
+            model = load_markov_model(spec['markov_model'])
+            if not model:
+                raise ValueError(f"Markov model {spec['markov_model']} not found")
+            generator = MarkovGenerator(model, charset, max_length, spec.get('markov_threshold'))
+            return Source(generator.keyspace(), generator.candidates)
+        
+        return Source(keyspace_size(charset, max_length),
+                      functools.partial(keyspace_candidates, charset, max_length))
+    
+    if mode == 'combinator':
+        from combinator import combinator_candidates
+        spec = resolve_spec(spec)
+        return Source(spec['left_count'] * spec['right_count'],
+                      functools.partial(combinator_candidates, spec['left'], spec['right']))
+    
+    if mode == 'hybrid':
+        from combinator import hybrid_candidates
+        from keyspace import parse_mask, mask_keyspace
+        spec = resolve_spec(spec)
+        wordlist, mask = spec['wordlist'], spec['mask']
+        return Source(spec['word_count'] * mask_keyspace(parse_mask(mask)),
+                      lambda start, end: hybrid_candidates(wordlist, mask, spec.get('mask_first', False),
+                                                           start, end))
+    
+    raise ValueError(f'Unsupported attack mode: {mode}')
+
+def search(candidates, verify, sink=None, max_attempts=None, deadline=None, check_every=None,
+           progress_every=DEFAULT_PROGRESS_EVERY):
+    """Try candidates in order until one verifies, they run out, or a limit is hit"""
+    # Candidates are pulled in slices and scanned with filter(), keeping the
+    # per-candidate work in C; limits are checked between slices
+    step = progress_every
+    if deadline is not None and check_every:
+        step = min(step, check_every)
+    
+    candidates = iter(candidates)
+    attempts = 0
+    next_report = progress_every
+    start_time = time.time()
+    
+    while True:
+        take = step if max_attempts is None else min(step, max_attempts - attempts)
+        chunk = list(itertools.islice(candidates, take))
+        
+        match = next(filter(verify, chunk), None)
+        if match is not None:
+            attempts += chunk.index(match) + 1
+            return SearchResult(match, attempts, time.time() - start_time, FOUND)
+        
+        attempts += len(chunk)
+        elapsed = time.time() - start_time
+        
+        if len(chunk) < take:
+            return SearchResult(None, attempts, elapsed, EXHAUSTED)
+        if max_attempts is not None and attempts >= max_attempts:
+            return SearchResult(None, attempts, elapsed, LIMIT)
+        if deadline is not None and time.time() >= deadline:
+            return SearchResult(None, attempts, elapsed, DEADLINE)
+        
+        if sink is not None and attempts >= next_report:
+            sink(attempts, elapsed)
+            next_report = attempts + progress_every
+
+def search_blocks(segments, scan, sink=None, max_attempts=None, deadline=None, check_every=None,
+                  progress_every=DEFAULT_PROGRESS_EVERY):
+    """search() over fixed-width (width, block) segments with a batched scanner"""
+    step = progress_every
+    if deadline is not None and check_every:
+        step = min(step, check_every)
+    
+    attempts = 0
+    next_report = progress_every
+    start_time = time.time()
+    
+    for width, block in segments:
+        for offset in range(0, len(block), step * width):
+            take = step if max_attempts is None else min(step, max_attempts - attempts)
+            piece = block[offset:offset + take * width]
+            
+            index = scan(piece, width)
+            if index >= 0:
+                password = bytes(piece[index * width:(index + 1) * width]).decode('utf-8')
+                return SearchResult(password, attempts + index + 1, time.time() - start_time, FOUND)
+            
+            attempts += len(piece) // width
+            elapsed = time.time() - start_time
+            
+            if max_attempts is not None and attempts >= max_attempts:
+                return SearchResult(None, attempts, elapsed, LIMIT)
+            if deadline is not None and time.time() >= deadline:
+                return SearchResult(None, attempts, elapsed, DEADLINE)
+            
+            if sink is not None and attempts >= next_report:
+                sink(attempts, elapsed)
+                next_report = attempts + progress_every
+    
+    return SearchResult(None, attempts, time.time() - start_time, EXHAUSTED)
+
+def search_source(source, spec, start, end, sink=None, max_attempts=None, deadline=None,
+                  check_every=None, progress_every=DEFAULT_PROGRESS_EVERY):
+    """Search a slice of an open source, through the block kernel when it has one"""
+    scan = make_block_scanner(spec['hash'], spec['hash_type']) if source.blocks else None
+    if scan is not None:
+        return search_blocks(source.blocks(start, end), scan, sink, max_attempts, deadline,
+                             check_every, progress_every)
+    
+    verify = get_verifier(spec['hash'], spec['hash_type'])
+    return search(source.candidates(start, end), verify, sink, max_attempts, deadline,
+                  check_every, progress_every)
+
+def search_slice(spec, start, end, deadline=None, check_every=None):
+    """Search one slice of a spec; runs in pool workers and Celery workers"""
+    return search_source(open_source(spec), spec, start, end, deadline=deadline, check_every=check_every)
+
+class InlineBackend:
+    """Searches in the calling thread"""
+    
+    name = 'inline'
+    
+    def search(self, spec, start=0, end=None, sink=None, max_attempts=None, deadline=None,
+               check_every=None, progress_every=DEFAULT_PROGRESS_EVERY, source=None):
+        source = source or open_source(spec)
+        end = source.keyspace if end is None else min(end, source.keyspace)
+        return search_source(source, spec, start, end, sink, max_attempts, deadline,
+                             check_every, progress_every)
+
+class PooledBackend:
+    """Searches ENGINE_CHUNK slices in parallel, combining them in index order"""
+    
+    def submit(self, spec, start, end, deadline, check_every):
+        raise NotImplementedError
+    
+    def result(self, handle):
+        return handle.result()
+    
+    def cancel(self, handle):
+        handle.cancel()
+    
+    def search(self, spec, start=0, end=None, sink=None, max_attempts=None, deadline=None,
+               check_every=None, progress_every=DEFAULT_PROGRESS_EVERY, source=None):
+        # Every slice reopens the source, so word counts travel with the spec
+        spec = resolve_spec(spec)
+        keyspace = (source or open_source(spec)).keyspace
+        end = keyspace if end is None else min(end, keyspace)
+        stop = end if max_attempts is None else min(end, start + max_attempts)
+        
+        slices = ((lo, min(lo + Config.ENGINE_CHUNK, stop)) for lo in range(start, stop, Config.ENGINE_CHUNK))
+        window = Config.ENGINE_WORKERS * 2
+        pending = deque()
+        start_time = time.time()
+        
+        def fill():
+            for lo, hi in itertools.islice(slices, window - len(pending)):
+                pending.append((lo, self.submit(spec, lo, hi, deadline, check_every)))
+        
+        fill()
+        while pending:
+            lo, handle = pending.popleft()
+            result = self.result(handle)
+            searched = lo - start + result.attempts
+            
+            # A match or a deadline ends the search; later slices are discarded so
+            # everything before the reported position, and nothing after, was tried
+            if result.stopped in (FOUND, DEADLINE):
+                for _, other in pending:
+                    self.cancel(other)
+                return SearchResult(result.password, searched, time.time() - start_time, result.stopped)
+            
+            if sink is not None:
+                sink(searched, time.time() - start_time)
+            fill()
+        
+        return SearchResult(None, stop - start, time.time() - start_time, LIMIT if stop < end else EXHAUSTED)
+
+class ExecutorBackend(PooledBackend):
+    """Slices on a concurrent.futures pool (threads or processes)"""
+    
+    def __init__(self, name, executor_class):
+        self.name = name
+        self.executor = executor_class(Config.ENGINE_WORKERS)
+    
+    def submit(self, spec, start, end, deadline, check_every):
+        return self.executor.submit(search_slice, spec, start, end, deadline, check_every)
+
+class CeleryBackend(PooledBackend):
+    """Slices as Celery tasks; for API processes, not for use inside a task"""
+    
+    name = 'celery'
+    
+    def submit(self, spec, start, end, deadline, check_every):
+        from tasks import engine_search_task
+        return engine_search_task.apply_async(args=[spec, start, end, deadline, check_every])
+    
+    def result(self, handle):
+        return SearchResult(*handle.get())
+    
+    def cancel(self, handle):
+        handle.revoke()
+
+BACKENDS = {
+    'inline': InlineBackend,
+    'thread': lambda: ExecutorBackend('thread', ThreadPoolExecutor),
+    'process': lambda: ExecutorBackend('process', ProcessPoolExecutor),
+    'celery': CeleryBackend,
+}
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+def get_backend(name=None):
+    """Shared backend by name (default ENGINE_BACKEND); ValueError if unknown"""
+    name = name or Config.ENGINE_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f'Unknown engine backend: {name}')
+    
+    with _backends_lock:
+        if name not in _backends:
+            _backends[name] = BACKENDS[name]()
+        return _backends[name]
+
+def worker_backend():
+    """Backend for code already running in a Celery task (never fans out to Celery)"""
+    backend = get_backend()
+    return get_backend('inline') if backend.name == 'celery' else backend
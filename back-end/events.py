@@ -0,0 +1,65 @@
+"""
+Job events published from Celery workers
+
+Workers do not hold client connections, so they publish through the Redis
+message queue that the web tier's SocketIO listens on, using a write-only
+SocketIO instance that needs neither the Flask app nor the database. Progress
+updates are throttled per room so a fast job cannot flood its subscribers;
+state changes (anything that is not a running update) are always sent.
+Every update that goes out is also broadcast to the SSE / long-poll hub.
+"""
+
+import threading
+import time
+
+from config import Config
+import live_updates
+import metrics
+
+class RoomThrottle:
+    """Allows at most one event per room every `interval` seconds"""
+    
+    def __init__(self, interval):
+        self.interval = interval
+        self._last_sent = {}
+        self._lock = threading.Lock()
+    
+    def allow(self, room, force=False):
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_sent.get(room, 0) < self.interval:
+                return False
+            if force:
+                # Final events end the room's stream
+                self._last_sent.pop(room, None)
+            else:
+                self._last_sent[room] = now
+            return True
+
+_throttle = RoomThrottle(Config.SOCKETIO_MIN_INTERVAL)
+_emitter = None
+_emitter_lock = threading.Lock()
+
+def get_emitter():
+    """Write-only SocketIO connected to the message queue"""
+    global _emitter
+    if _emitter is None:
+        with _emitter_lock:
+            if _emitter is None:
+                from flask_socketio import SocketIO
+                _emitter = SocketIO(message_queue=Config.SOCKETIO_MESSAGE_QUEUE)
+    return _emitter
+
+def emit_job_update(job_data):
+    """Publish a job's state to its room, dropping progress updates over the rate limit"""
+    room = job_data['job_id']
+    final = job_data.get('status') != 'running'
+    
+    if not _throttle.allow(room, force=final):
+        metrics.inc('cracker_socket_emits_dropped_total', source='worker')
+        return False
+    
+    get_emitter().emit('job_update', job_data, room=room)
+    live_updates.broadcast(job_data)
+    metrics.inc('cracker_socket_emits_total', source='worker')
+    return True
@@ -1,40 +1,120 @@
+import functools
 import hashlib
+import importlib
 import re
+import struct
+import time
+from functools import lru_cache
+from operator import itemgetter
 from passlib.hash import bcrypt, sha256_crypt, sha512_crypt, md5_crypt
 
-def detect_hash_type(hash_string):
-    """Auto-detect hash type from the hash string"""
-    hash_string = hash_string.strip()
-    length = len(hash_string)
-    
-    # Bcrypt detection
-    if re.match(r'^\$2[aby]\$\d{2}\$.{53}$', hash_string):
-        return ('bcrypt', 'High', 'Bcrypt - Very secure, slow to crack')
+# Unsalted hash types whose digests can be precomputed and compared directly
+FAST_HASH_TYPES = ('md5', 'sha1', 'sha256', 'sha512', 'ntlm')
+
+# Declarative hash signatures. Within one prefix/length bucket, earlier
+# entries rank higher. 'structure' is an optional full-match regex check.
+HASH_SIGNATURES = [
+    {'type': 'bcrypt', 'prefixes': ('$2a$', '$2b$', '$2y$'),
+     'structure': r'\$2[aby]\$\d{2}\$.{53}',
+     'confidence': 'High', 'description': 'Bcrypt - Very secure, slow to crack'},
+    {'type': 'sha512crypt', 'prefixes': ('$6$',),
+     'confidence': 'High', 'description': 'SHA-512 Crypt (Unix/Linux)'},
+    {'type': 'sha256crypt', 'prefixes': ('$5$',),
+     'confidence': 'High', 'description': 'SHA-256 Crypt (Unix/Linux)'},
+    {'type': 'md5crypt', 'prefixes': ('$1$',),
+     'confidence': 'High', 'description': 'MD5 Crypt (Unix/Linux)'},
+    {'type': 'md5', 'length': 32, 'alphabet': 'hex',
+     'confidence': 'High', 'description': 'MD5 - Fast, commonly used'},
+    {'type': 'ntlm', 'length': 32, 'alphabet': 'hex',
+     'confidence': 'Medium', 'description': 'NTLM - Windows, same format as MD5'},
+    {'type': 'sha1', 'length': 40, 'alphabet': 'hex',
+     'confidence': 'High', 'description': 'SHA-1 - Git commits, legacy systems'},
+    {'type': 'sha256', 'length': 64, 'alphabet': 'hex',
+     'confidence': 'High', 'description': 'SHA-256 - Bitcoin, modern apps'},
+    {'type': 'sha512', 'length': 128, 'alphabet': 'hex',
+     'confidence': 'High', 'description': 'SHA-512 - High security applications'},
+]
+
+ALPHABETS = {
+    'hex': '0123456789abcdefABCDEF'
+}
+
+def _compile_signatures(signatures):
+    """Index signatures by '$id$' prefix and by (length, alphabet)"""
+    by_prefix = {}
+    by_length = {}
     
-    # SHA-512 Crypt (Unix)
-    if hash_string.startswith('$6$'):
-        return ('sha512crypt', 'High', 'SHA-512 Crypt (Unix/Linux)')
+    for signature in signatures:
+        structure = signature.get('structure')
+        entry = (
+            signature['type'],
+            signature['confidence'],
+            signature['description'],
+            re.compile(structure) if structure else None
+        )
+        for prefix in signature.get('prefixes', ()):
+            by_prefix.setdefault(prefix, []).append(entry)
+        if 'length' in signature:
+            key = (signature['length'], ALPHABETS[signature['alphabet']])
+            by_length.setdefault(key, []).append(entry)
     
-    # SHA-256 Crypt (Unix)
-    if hash_string.startswith('$5$'):
-        return ('sha256crypt', 'High', 'SHA-256 Crypt (Unix/Linux)')
+    # Lengths map to the alphabets that may apply to them
+    lengths = {}
+    for (length, alphabet), entries in by_length.items():
+        lengths.setdefault(length, []).append((alphabet, entries))
     
-    # MD5 Crypt (Unix)
-    if hash_string.startswith('$1$'):
-        return ('md5crypt', 'High', 'MD5 Crypt (Unix/Linux)')
+    return by_prefix, lengths
+
+_PREFIX_DISPATCH, _LENGTH_DISPATCH = _compile_signatures(HASH_SIGNATURES)
+
+UNKNOWN_HASH = ('unknown', 'Low', 'Unknown hash type - Cannot detect')
+
+def detect_hash_candidates(hash_string):
+    """Ranked (type, confidence, description) candidates for a hash string"""
+    hash_string = hash_string.strip()
     
-    # Length-based detection (hex strings)
-    if re.match(r'^[a-fA-F0-9]+$', hash_string):
-        if length == 32:
-            return ('md5', 'High', 'MD5 - Fast, commonly used')
-        elif length == 40:
-            return ('sha1', 'High', 'SHA-1 - Git commits, legacy systems')
-        elif length == 64:
-            return ('sha256', 'High', 'SHA-256 - Bitcoin, modern apps')
-        elif length == 128:
-            return ('sha512', 'High', 'SHA-512 - High security applications')
+    # Modular crypt format: dispatch on the '$id$' prefix
+    if hash_string.startswith('$'):
+        end = hash_string.find('$', 1)
+        entries = _PREFIX_DISPATCH.get(hash_string[:end + 1], ()) if end > 0 else ()
+    else:
+        entries = ()
+        for alphabet, bucket in _LENGTH_DISPATCH.get(len(hash_string), ()):
+            # Stripping every allowed character leaves nothing for a valid string
+            if not hash_string.strip(alphabet):
+                entries = bucket
+                break
     
-    return ('unknown', 'Low', 'Unknown hash type - Cannot detect')
+    return [
+        (hash_type, confidence, description)
+        for hash_type, confidence, description, structure in entries
+        if structure is None or structure.fullmatch(hash_string)
+    ]
+
+def detect_hash_type(hash_string):
+    """Auto-detect hash type from the hash string"""
+    candidates = detect_hash_candidates(hash_string)
+    return candidates[0] if candidates else UNKNOWN_HASH
+
+# Job hash type meaning "every type whose format fits the hash", tried in one pass
+AMBIGUOUS_HASH_TYPE = 'ambiguous'
+
+def plausible_hash_types(hash_string):
+    """Every hash type whose format matches the string, most likely first"""
+    return [hash_type for hash_type, _, _ in detect_hash_candidates(hash_string)]
+
+def job_hash_types(hash_string, hash_type):
+    """The concrete hash types a job's hash type stands for"""
+    if hash_type == AMBIGUOUS_HASH_TYPE:
+        return plausible_hash_types(hash_string)
+    return [hash_type]
+
+def auto_detect_hash_type(hash_string):
+    """Hash type for an auto-detected job: ambiguous when several formats fit, else the detected type"""
+    plausible = plausible_hash_types(hash_string)
+    if len(plausible) > 1:
+        return AMBIGUOUS_HASH_TYPE
+    return plausible[0] if plausible else UNKNOWN_HASH[0]
 
 def hash_password(password, hash_type='md5'):
     """Hash a password using specified algorithm"""
@@ -54,10 +134,24 @@ def hash_password(password, hash_type='md5'):
     except:
         return None
 
+def hash_digest(password, hash_type='md5'):
+    """Raw digest bytes of a password for unsalted hash types"""
+    try:
+        if hash_type == 'ntlm':
+            return hashlib.new('md4', password.encode('utf-16le')).digest()
+        elif hash_type in FAST_HASH_TYPES:
+            return hashlib.new(hash_type, password.encode()).digest()
+        else:
+            return None
+    except:
+        return None
+
 def verify_password(password, hash_string, hash_type):
     """Verify password against hash using appropriate method"""
     try:
-        if hash_type == 'bcrypt':
+        if hash_type == AMBIGUOUS_HASH_TYPE:
+            return make_verifier(hash_string, hash_type)(password)
+        elif hash_type == 'bcrypt':
             return bcrypt.verify(password, hash_string)
         elif hash_type == 'sha256crypt':
             return sha256_crypt.verify(password, hash_string)
@@ -72,6 +166,169 @@ def verify_password(password, hash_string, hash_type):
     except:
         return False
 
+CRYPT_HANDLERS = {
+    'bcrypt': bcrypt,
+    'sha256crypt': sha256_crypt,
+    'sha512crypt': sha512_crypt,
+    'md5crypt': md5_crypt
+}
+
+def make_verifier(hash_string, hash_type):
+    """Compile a password -> bool check for one target, resolving the algorithm once"""
+    if hash_type == AMBIGUOUS_HASH_TYPE:
+        return make_multi_verifier(hash_string, plausible_hash_types(hash_string))
+    
+    if hash_type in CRYPT_HANDLERS:
+        handler = CRYPT_HANDLERS[hash_type]
+        
+        def verify(password):
+            try:
+                return handler.verify(password, hash_string)
+            except Exception:
+                return False
+        return verify
+    
+    if hash_type not in FAST_HASH_TYPES:
+        return lambda password: False
+    
+    try:
+        target = bytes.fromhex(hash_string)
+    except ValueError:
+        return lambda password: False
+    
+    # Compare raw digests; no hexdigest()/lower() per candidate
+    if hash_type == 'ntlm':
+        if hash_digest('', 'ntlm') is None:
+            # OpenSSL builds without MD4
+            return lambda password: False
+        return lambda password: hashlib.new('md4', password.encode('utf-16le')).digest() == target
+    
+    constructor = getattr(hashlib, hash_type)
+    return lambda password: constructor(password.encode()).digest() == target
+
+def make_multi_verifier(hash_string, hash_types):
+    """One check against several hash types; each candidate is encoded once per encoding"""
+    try:
+        target = bytes.fromhex(hash_string)
+    except ValueError:
+        target = None
+    
+    utf8_constructors = []
+    utf16_constructors = []
+    others = []
+    for hash_type in hash_types:
+        if hash_type == 'ntlm':
+            # OpenSSL builds without MD4 cannot compute NTLM
+            if target is not None and hash_digest('', 'ntlm') is not None:
+                utf16_constructors.append(functools.partial(hashlib.new, 'md4'))
+        elif hash_type in FAST_HASH_TYPES:
+            if target is not None:
+                utf8_constructors.append(short_input_constructor(hash_type))
+        else:
+            others.append(make_verifier(hash_string, hash_type))
+    
+    def verify(password):
+        data = password.encode()
+        for constructor in utf8_constructors:
+            if constructor(data).digest() == target:
+                return True
+        if utf16_constructors:
+            data = password.encode('utf-16le')
+            for constructor in utf16_constructors:
+                if constructor(data).digest() == target:
+                    return True
+        return any(check(password) for check in others)
+    
+    return verify
+
+def matching_hash_type(password, hash_string, hash_type):
+    """Which concrete hash type a cracked password matched (resolves ambiguous jobs)"""
+    for candidate_type in job_hash_types(hash_string, hash_type):
+        if make_verifier(hash_string, candidate_type)(password):
+            return candidate_type
+    return None
+
+def make_hasher(hash_type):
+    """Compile a password -> hash string function for a hash type, or None if unavailable"""
+    if hash_type in CRYPT_HANDLERS:
+        # Salted: a fresh salt per password
+        return CRYPT_HANDLERS[hash_type].hash
+    
+    if hash_type == 'ntlm':
+        if hash_digest('', 'ntlm') is None:
+            return None
+        return lambda password: hashlib.new('md4', password.encode('utf-16le')).hexdigest()
+    
+    if hash_type in FAST_HASH_TYPES:
+        constructor = getattr(hashlib, hash_type)
+        return lambda password: constructor(password.encode()).hexdigest()
+    
+    return None
+
+# Hashes of the candidate's UTF-8 bytes, which block layouts store as-is
+BLOCK_HASH_TYPES = ('md5', 'sha1', 'sha256', 'sha512')
+
+# CPython's own implementations (module names differ between versions)
+BUILTIN_HASH_MODULES = {
+    'md5': ('_md5',),
+    'sha1': ('_sha1',),
+    'sha256': ('_sha2', '_sha256'),
+    'sha512': ('_sha2', '_sha512'),
+}
+
+@lru_cache(maxsize=None)
+def short_input_constructor(hash_type):
+    """Fastest constructor on this host for password-sized inputs (OpenSSL or builtin)"""
+    constructors = [getattr(hashlib, hash_type)]
+    for module_name in BUILTIN_HASH_MODULES.get(hash_type, ()):
+        try:
+            constructors.append(getattr(importlib.import_module(module_name), hash_type))
+            break
+        except (ImportError, AttributeError):
+            continue
+    
+    sample = [b'password%d' % i for i in range(2000)]
+    
+    def cost(constructor):
+        start = time.perf_counter()
+        for data in sample:
+            constructor(data).digest()
+        return time.perf_counter() - start
+    
+    # Both produce identical digests; per-call setup dominates for short inputs
+    return min(constructors, key=cost)
+
+def make_block_scanner(hash_string, hash_type):
+    """Compile a scan of fixed-width UTF-8 candidates packed in one buffer, or None"""
+    if hash_type not in BLOCK_HASH_TYPES:
+        return None
+    
+    try:
+        target = bytes.fromhex(hash_string)
+    except ValueError:
+        return None
+    
+    constructor = short_input_constructor(hash_type)
+    
+    def matches(word):
+        return constructor(word).digest() == target
+    
+    def scan(block, width):
+        """Index of the first candidate in the block whose digest is the target, or -1"""
+        words = map(itemgetter(0), struct.iter_unpack(f'{width}s', block))
+        match = next(filter(matches, words), None)
+        if match is None:
+            return -1
+        
+        # Locate the match at a record boundary (only runs once, on success)
+        data = bytes(block)
+        position = data.find(match)
+        while position % width:
+            position = data.find(match, position + 1)
+        return position // width
+    
+    return scan
+
 def get_hash_info(hash_type):
     """Get detailed information about a hash type"""
     info = {
@@ -111,6 +368,15 @@ def get_hash_info(hash_type):
             'typical_uses': 'High security applications',
             'est_speed': '100K-300K passwords/sec'
         },
+        'ntlm': {
+            'name': 'NTLM',
+            'speed': 'Very Fast',
+            'security': 'Weak',
+            'crackable': 'Easy',
+            'recommended_attack': 'Dictionary or Brute force',
+            'typical_uses': 'Windows authentication',
+            'est_speed': '500K-1M passwords/sec'
+        },
         'bcrypt': {
             'name': 'Bcrypt',
             'speed': 'Very Slow',
@@ -0,0 +1,77 @@
+"""
+Streaming hashfile parser
+
+Reads `hash` or `user:hash` lines one at a time from any line iterator (an
+upload stream, an open file), classifies each hash with the shared detector
+and drops duplicates, so arbitrarily large dumps never need to be held in
+memory beyond the set of unique hashes.
+"""
+
+from hash_utils import detect_hash_type, FAST_HASH_TYPES
+
+def parse_hashfile_line(line):
+    """Split a line into (username, hash); username is None for bare hashes"""
+    if isinstance(line, bytes):
+        line = line.decode('utf-8', errors='ignore')
+    line = line.strip()
+    
+    if not line or line.startswith('#'):
+        return None, None
+    
+    # Crypt hashes start with '$' and never carry a username before it
+    if ':' in line and not line.startswith('$'):
+        username, hash_string = line.split(':', 1)
+        return username.strip() or None, hash_string.strip()
+    
+    return None, line
+
+def normalize_hash(hash_string, hash_type):
+    """Canonical form used for de-duplication (hex digests are case-insensitive)"""
+    if hash_type in FAST_HASH_TYPES:
+        return hash_string.lower()
+    return hash_string
+
+class HashfileStats:
+    """Counters collected while parsing a hashfile"""
+    
+    def __init__(self):
+        self.lines = 0
+        self.imported = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.by_type = {}
+    
+    def to_dict(self):
+        return {
+            'lines': self.lines,
+            'imported': self.imported,
+            'duplicates': self.duplicates,
+            'invalid': self.invalid,
+            'by_type': self.by_type
+        }
+
+def iter_hashfile(lines, stats, hash_type=None):
+    """Yield unique (username, hash, hash_type) entries from a line iterator"""
+    seen = set()
+    
+    for line in lines:
+        stats.lines += 1
+        
+        username, hash_string = parse_hashfile_line(line)
+        if not hash_string:
+            continue
+        
+        line_type = hash_type or detect_hash_type(hash_string)[0]
+        if line_type == 'unknown':
+            stats.invalid += 1
+            continue
+        
+        key = (line_type, normalize_hash(hash_string, line_type))
+        if key in seen:
+            stats.duplicates += 1
+            continue
+        seen.add(key)
+        
+        stats.imported += 1
+        stats.by_type[line_type] = stats.by_type.get(line_type, 0) + 1
+        yield username, key[1], line_type
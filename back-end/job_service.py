@@ -0,0 +1,276 @@
+"""
+Job submission shared by the Flask API and the ASGI API
+
+submit_job() holds the request validation, lookup-table shortcut, job row
+creation and task dispatch, so every API surface queues jobs the same way.
+extend_job() grants a time-budgeted job more time and re-queues it; the task
+resumes from the job's searched_until index.
+It needs an application context for the database session.
+"""
+
+import json
+import math
+import uuid
+from datetime import datetime
+
+from config import Config
+from models import db, CrackJob, Wordlist, JobStatus, AttackMode
+from hash_utils import (
+    auto_detect_hash_type, job_hash_types, plausible_hash_types, AMBIGUOUS_HASH_TYPE, FAST_HASH_TYPES
+)
+from lookup_tables import lookup_hash
+from keyspace import get_charset, parse_mask
+from markov import load_markov_model
+from pcfg import load_pcfg_model
+from wordlist_buckets import parse_policy
+from tasks import (
+    crack_dictionary_task, crack_bruteforce_task, crack_pcfg_task, crack_combinator_task,
+    crack_hybrid_task
+)
+
+# Attack modes that read the primary wordlist
+WORDLIST_MODES = (
+    AttackMode.DICTIONARY, AttackMode.COMBINATOR,
+    AttackMode.HYBRID_WORDLIST_MASK, AttackMode.HYBRID_MASK_WORDLIST
+)
+
+HYBRID_MODES = (AttackMode.HYBRID_WORDLIST_MASK, AttackMode.HYBRID_MASK_WORDLIST)
+
+# Attack modes whose candidates can be resumed from an index (time budgets)
+RESUMABLE_MODES = WORDLIST_MODES + (AttackMode.BRUTEFORCE,)
+
+class JobSubmissionError(Exception):
+    """Rejected job request, with the HTTP status to answer with"""
+    
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+def resolve_wordlist_path(wordlist_name):
+    """Map a registered wordlist name to its file path"""
+    wordlist = Wordlist.query.filter_by(name=wordlist_name).first()
+    return wordlist.file_path if wordlist else wordlist_name
+
+def parse_seconds(value, name):
+    """A positive number of seconds from a request"""
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        raise JobSubmissionError(f'{name} must be a number of seconds', 400)
+    if not (seconds > 0 and math.isfinite(seconds)):
+        raise JobSubmissionError(f'{name} must be a positive, finite number', 400)
+    return seconds
+
+def parse_max_length(value):
+    """Brute-force length from a request, within 1..MAX_BRUTEFORCE_LENGTH"""
+    try:
+        max_length = int(value)
+    except (TypeError, ValueError):
+        raise JobSubmissionError('maxLength must be an integer', 400)
+    if not 1 <= max_length <= Config.MAX_BRUTEFORCE_LENGTH:
+        raise JobSubmissionError(f'Max length must be between 1 and {Config.MAX_BRUTEFORCE_LENGTH}', 400)
+    return max_length
+
+def parse_count(value, name, maximum=None):
+    """A positive integer from a request, at most `maximum` when given"""
+    try:
+        count = int(value)
+    except (TypeError, ValueError):
+        raise JobSubmissionError(f'{name} must be an integer', 400)
+    if count < 1 or (maximum is not None and count > maximum):
+        limit = f'between 1 and {maximum}' if maximum is not None else 'positive'
+        raise JobSubmissionError(f'{name} must be {limit}', 400)
+    return count
+
+def submit_job(data):
+    """Validate a job request, store the job and queue its task; returns (job, message)"""
+    
+    target_hash = data.get('hash', '').strip()
+    hash_type = data.get('hashType', 'md5')
+    attack_mode = data.get('attackMode', 'dictionary')
+    wordlist_name = data.get('wordlist', 'wordlist.txt')
+    max_length = data.get('maxLength', 4)
+    charset_option = data.get('charset', '1')
+    markov_model = data.get('markovModel')
+    markov_threshold = data.get('markovThreshold')
+    pcfg_model = data.get('pcfgModel')
+    max_guesses = data.get('maxGuesses')
+    wordlist2_name = data.get('wordlist2', wordlist_name)
+    mask = data.get('mask', '?d?d')
+    time_budget = data.get('timeBudget')
+    policy = data.get('policy')
+    bucketed = bool(data.get('bucketed', False))
+    
+    if not target_hash:
+        raise JobSubmissionError('Hash is required', 400)
+    
+    if markov_model and not load_markov_model(markov_model):
+        raise JobSubmissionError(f'Markov model {markov_model} not found', 404)
+    
+    if attack_mode.lower() == 'pcfg' and not (pcfg_model and load_pcfg_model(pcfg_model)):
+        raise JobSubmissionError(f'PCFG model {pcfg_model} not found', 404)
+    
+    # Auto-detect if requested; when several formats fit, all are tried in one pass
+    if data.get('autoDetect', False):
+        detected_type = auto_detect_hash_type(target_hash)
+        if detected_type != 'unknown':
+            hash_type = detected_type
+    
+    if hash_type == AMBIGUOUS_HASH_TYPE and not plausible_hash_types(target_hash):
+        raise JobSubmissionError('No known hash format matches this hash', 400)
+    
+    # Create job record
+    job_id = str(uuid.uuid4())
+    
+    try:
+        attack_mode_enum = AttackMode[attack_mode.upper()]
+    except KeyError:
+        attack_mode_enum = AttackMode.DICTIONARY
+    
+    # A time budget lifts the attempt cap, so the keyspace itself has to stay bounded
+    if attack_mode_enum == AttackMode.BRUTEFORCE:
+        max_length = parse_max_length(max_length)
+        if markov_threshold is not None:
+            markov_threshold = parse_count(markov_threshold, 'markovThreshold',
+                                           len(get_charset(charset_option)))
+    
+    if attack_mode_enum == AttackMode.PCFG and max_guesses is not None:
+        max_guesses = parse_count(max_guesses, 'maxGuesses')
+    
+    if attack_mode_enum in HYBRID_MODES:
+        try:
+            parse_mask(mask)
+        except ValueError as e:
+            raise JobSubmissionError(str(e), 400)
+    
+    if time_budget is not None:
+        time_budget = parse_seconds(time_budget, 'timeBudget')
+        if attack_mode_enum not in RESUMABLE_MODES:
+            raise JobSubmissionError(f'Time budgets are not supported for {attack_mode_enum.value} attacks', 400)
+    
+    if policy is not None:
+        if attack_mode_enum != AttackMode.DICTIONARY:
+            raise JobSubmissionError('Policy filters are only supported for dictionary attacks', 400)
+        try:
+            policy = parse_policy(policy)
+        except ValueError as e:
+            raise JobSubmissionError(str(e), 400)
+    
+    if bucketed:
+        if attack_mode_enum != AttackMode.DICTIONARY:
+            raise JobSubmissionError('Bucketed order is only supported for dictionary attacks', 400)
+        if policy:
+            raise JobSubmissionError('Bucketed order cannot be combined with a policy filter', 400)
+    
+    # Precomputed lookup tables resolve unsalted hashes without queuing a job
+    password = matched_type = None
+    if attack_mode_enum == AttackMode.DICTIONARY:
+        for lookup_type in job_hash_types(target_hash, hash_type):
+            if lookup_type in FAST_HASH_TYPES:
+                password = lookup_hash(resolve_wordlist_path(wordlist_name), lookup_type, target_hash)
+                if password is not None:
+                    matched_type = lookup_type
+                    break
+    
+    job = CrackJob(
+        job_id=job_id,
+        target_hash=target_hash,
+        hash_type=hash_type,
+        attack_mode=attack_mode_enum,
+        wordlist_name=wordlist_name if attack_mode_enum in WORDLIST_MODES else None,
+        wordlist2_name=wordlist2_name if attack_mode_enum == AttackMode.COMBINATOR else None,
+        mask=mask if attack_mode_enum in HYBRID_MODES else None,
+        max_length=max_length if attack_mode_enum == AttackMode.BRUTEFORCE else None,
+        charset_option=charset_option if attack_mode_enum == AttackMode.BRUTEFORCE else None,
+        model_name=markov_model if attack_mode_enum == AttackMode.BRUTEFORCE else (
+            pcfg_model if attack_mode_enum == AttackMode.PCFG else None
+        ),
+        markov_threshold=markov_threshold if attack_mode_enum == AttackMode.BRUTEFORCE else None,
+        profile_enabled=bool(data.get('profile', False)),
+        time_budget=time_budget,
+        policy=json.dumps(policy) if policy else None,
+        bucketed=bucketed,
+        status=JobStatus.PENDING
+    )
+    
+    if password is not None:
+        now = datetime.utcnow()
+        job.status = JobStatus.COMPLETED
+        job.success = True
+        job.cracked_password = password
+        job.matched_hash_type = matched_type
+        job.current_attempt = 1
+        job.total_attempts = 1
+        job.progress = 100.0
+        job.started_at = now
+        job.completed_at = now
+    
+    db.session.add(job)
+    db.session.commit()
+    
+    if password is not None:
+        return job, 'Resolved from lookup table'
+    
+    dispatch_job(job, max_guesses)
+    return job, 'Job created and queued'
+
+def dispatch_job(job, max_guesses=None):
+    """Queue the task for a stored job (the task id is the job id)"""
+    job_id = job.job_id
+    target_hash = job.target_hash
+    hash_type = job.hash_type
+    attack_mode_enum = job.attack_mode
+    wordlist_name = job.wordlist_name
+    
+    if attack_mode_enum == AttackMode.DICTIONARY:
+        crack_dictionary_task.apply_async(
+            args=[job_id, target_hash, hash_type, wordlist_name,
+                  json.loads(job.policy) if job.policy else None, bool(job.bucketed)],
+            task_id=job_id
+        )
+    elif attack_mode_enum == AttackMode.BRUTEFORCE:
+        crack_bruteforce_task.apply_async(
+            args=[job_id, target_hash, hash_type, job.max_length, job.charset_option,
+                  job.model_name, job.markov_threshold],
+            task_id=job_id
+        )
+    elif attack_mode_enum == AttackMode.PCFG:
+        crack_pcfg_task.apply_async(
+            args=[job_id, target_hash, hash_type, job.model_name, max_guesses],
+            task_id=job_id
+        )
+    elif attack_mode_enum == AttackMode.COMBINATOR:
+        crack_combinator_task.apply_async(
+            args=[job_id, target_hash, hash_type, resolve_wordlist_path(wordlist_name),
+                  resolve_wordlist_path(job.wordlist2_name)],
+            task_id=job_id
+        )
+    elif attack_mode_enum in HYBRID_MODES:
+        crack_hybrid_task.apply_async(
+            args=[job_id, target_hash, hash_type, resolve_wordlist_path(wordlist_name), job.mask,
+                  attack_mode_enum == AttackMode.HYBRID_MASK_WORDLIST],
+            task_id=job_id
+        )
+
+def extend_job(job, seconds):
+    """Add to a time-budgeted job's budget and resume it from where it stopped"""
+    seconds = parse_seconds(seconds, 'seconds')
+    
+    if not job.time_budget:
+        raise JobSubmissionError('Job has no time budget', 400)
+    
+    if job.status != JobStatus.COMPLETED or job.success:
+        raise JobSubmissionError('Only finished, uncracked jobs can be extended', 409)
+    
+    if job.keyspace is not None and (job.searched_until or 0) >= job.keyspace:
+        raise JobSubmissionError('The whole keyspace has already been searched', 409)
+    
+    job.time_budget += seconds
+    job.status = JobStatus.PENDING
+    job.error_message = None
+    job.progress = 0.0
+    job.completed_at = None
+    db.session.commit()
+    
+    dispatch_job(job)
+    return job
@@ -0,0 +1,121 @@
+"""
+Brute-force keyspace helpers
+
+The keyspace for a charset and maximum length is every string of length
+1..max_length, in the same order `itertools.product` enumerates them. Each
+candidate has a stable integer index so attacks can be resumed or split.
+"""
+
+import itertools
+import string
+
+# Charset presets used by brute-force jobs
+CHARSETS = {
+    '1': string.ascii_lowercase + string.digits,
+    '2': string.ascii_lowercase,
+    '3': string.ascii_lowercase + string.ascii_uppercase + string.digits,
+    '4': string.ascii_letters + string.digits + string.punctuation
+}
+
+DEFAULT_CHARSET = string.ascii_lowercase + string.digits
+
+def get_charset(charset_option):
+    """Resolve a charset preset, falling back to lowercase + digits"""
+    return CHARSETS.get(charset_option, DEFAULT_CHARSET)
+
+def keyspace_size(charset, max_length):
+    """Number of candidates of length 1..max_length"""
+    return sum(len(charset) ** length for length in range(1, max_length + 1))
+
+def candidate_at(index, charset, max_length):
+    """Candidate at a given keyspace index"""
+    base = len(charset)
+    
+    for length in range(1, max_length + 1):
+        count = base ** length
+        if index < count:
+            chars = []
+            for _ in range(length):
+                index, digit = divmod(index, base)
+                chars.append(charset[digit])
+            return ''.join(reversed(chars))
+        index -= count
+    
+    raise IndexError('Keyspace index out of range')
+
+def _block_candidates(charset, length, lo, hi):
+    # Indices [lo, hi) among the strings of one length; whole first-character
+    # blocks go straight to itertools.product, partial ones recurse
+    if length == 0:
+        yield ''
+        return
+    
+    sub = len(charset) ** (length - 1)
+    first, last = lo // sub, (hi - 1) // sub
+    for digit in range(first, last + 1):
+        a = lo - digit * sub if digit == first else 0
+        b = hi - digit * sub if digit == last else sub
+        char = charset[digit]
+        if a == 0 and b == sub:
+            yield from (char + ''.join(rest) for rest in itertools.product(charset, repeat=length - 1))
+        else:
+            yield from (char + rest for rest in _block_candidates(charset, length - 1, a, b))
+
+def keyspace_candidates(charset, max_length, start=0, end=None):
+    """Candidates for indices [start, end) without enumerating the ones before start"""
+    total = keyspace_size(charset, max_length)
+    end = total if end is None else min(end, total)
+    
+    offset = 0
+    for length in range(1, max_length + 1):
+        count = len(charset) ** length
+        lo, hi = max(start - offset, 0), min(end - offset, count)
+        if lo < hi:
+            yield from _block_candidates(charset, length, lo, hi)
+        offset += count
+
+# Mask placeholders (hashcat-style ?l ?u ?d ?s ?a)
+MASK_CHARSETS = {
+    'l': string.ascii_lowercase,
+    'u': string.ascii_uppercase,
+    'd': string.digits,
+    's': string.punctuation + ' ',
+    'a': string.ascii_letters + string.digits + string.punctuation + ' '
+}
+
+def parse_mask(mask):
+    """Turn a mask like '?d?d?s' into one charset per position"""
+    charsets = []
+    i = 0
+    while i < len(mask):
+        if mask[i] == '?':
+            if i + 1 >= len(mask):
+                raise ValueError('Mask ends with a bare "?"')
+            placeholder = mask[i + 1]
+            if placeholder == '?':
+                charsets.append('?')
+            elif placeholder in MASK_CHARSETS:
+                charsets.append(MASK_CHARSETS[placeholder])
+            else:
+                raise ValueError(f'Unknown mask placeholder: ?{placeholder}')
+            i += 2
+        else:
+            # Literal character
+            charsets.append(mask[i])
+            i += 1
+    return charsets
+
+def mask_keyspace(charsets):
+    """Number of candidates a parsed mask produces"""
+    size = 1
+    for charset in charsets:
+        size *= len(charset)
+    return size
+
+def mask_candidate_at(index, charsets):
+    """Candidate of a parsed mask at a given index"""
+    chars = []
+    for charset in reversed(charsets):
+        index, digit = divmod(index, len(charset))
+        chars.append(charset[digit])
+    return ''.join(reversed(chars))
@@ -0,0 +1,164 @@
+"""
+In-memory pub/sub of job updates for SSE and long-poll clients
+
+Workers broadcast each job_update that passes the socket rate limit to a
+Redis channel. The API process keeps one listener on that channel and holds
+the newest state of every watched job in a hub, so streaming and long-poll
+clients are served from memory instead of re-reading the database.
+
+Updates are coalesced: the hub keeps a short history of versions per job, and
+a client that falls behind only receives the latest state. Anything after the
+first snapshot is sent as a delta, holding only the fields that changed since
+the version the client last saw.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+
+from config import Config
+
+# Jobs one stream or long-poll request may watch
+MAX_WATCHED_JOBS = 500
+
+def parse_job_ids(value):
+    """Comma-separated job ids, deduplicated in order"""
+    job_ids = list(dict.fromkeys(job_id for job_id in (value or '').split(',') if job_id))
+    if not job_ids:
+        raise ValueError('ids is required')
+    if len(job_ids) > MAX_WATCHED_JOBS:
+        raise ValueError(f'At most {MAX_WATCHED_JOBS} jobs can be watched at once')
+    return job_ids
+
+def encode_cursor(since):
+    """{job_id: version} as 'job_id:version,...' (also the SSE event id)"""
+    return ','.join(f'{job_id}:{version}' for job_id, version in since.items())
+
+def decode_cursor(value):
+    since = {}
+    for part in (value or '').split(','):
+        if not part:
+            continue
+        job_id, _, version = part.rpartition(':')
+        if not job_id or not version.isdigit():
+            raise ValueError('Invalid cursor')
+        since[job_id] = int(version)
+    return since
+
+def resume_versions(latest, since):
+    """Starting versions for watched jobs; unknown or future versions restart at 0"""
+    versions = {}
+    for job_id, (version, _) in latest.items():
+        seen = since.get(job_id, 0)
+        versions[job_id] = seen if seen <= version else 0
+    return versions
+
+def diff(old, new):
+    """Fields of `new` that differ from `old`"""
+    return {key: value for key, value in new.items() if old.get(key) != value}
+
+class UpdateHub:
+    """Latest job states with a global version counter and blocking waits"""
+    
+    def __init__(self, max_jobs, history=16):
+        self.max_jobs = max_jobs
+        self.history = history
+        self._jobs = OrderedDict()
+        self._version = 0
+        self._condition = threading.Condition()
+    
+    def publish(self, job_data, only_if_new=False):
+        job_id = job_data['job_id']
+        with self._condition:
+            versions = self._jobs.get(job_id)
+            if versions is not None and (only_if_new or versions[-1][1] == job_data):
+                return
+            
+            self._version += 1
+            if versions is None:
+                versions = self._jobs[job_id] = deque(maxlen=self.history)
+            versions.append((self._version, job_data))
+            self._jobs.move_to_end(job_id)
+            
+            # Forget the least recently updated jobs
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+            
+            self._condition.notify_all()
+    
+    def seed(self, job_data):
+        """Add a job loaded from the database unless a newer update is already held"""
+        self.publish(job_data, only_if_new=True)
+    
+    def latest(self, job_id):
+        """(version, job data) or None"""
+        with self._condition:
+            versions = self._jobs.get(job_id)
+            return versions[-1] if versions else None
+    
+    def _changes(self, since):
+        changes = {}
+        for job_id, version in since.items():
+            versions = self._jobs.get(job_id)
+            if not versions or versions[-1][0] <= version:
+                continue
+            
+            latest_version, latest = versions[-1]
+            previous = next((data for v, data in versions if v == version), None)
+            if previous is None:
+                changes[job_id] = {'version': latest_version, 'job': latest}
+            else:
+                changes[job_id] = {'version': latest_version, 'delta': diff(previous, latest)}
+        return changes
+    
+    def changes(self, since):
+        """Updates newer than the given {job_id: version}, as deltas where possible"""
+        with self._condition:
+            return self._changes(since)
+    
+    def wait(self, since, timeout):
+        """Block until one of the jobs changes or the timeout passes"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._changes(since), timeout)
+            return self._changes(since)
+
+hub = UpdateHub(Config.LIVE_UPDATES_MAX_JOBS)
+
+def broadcast(job_data):
+    """Send a job state to the API processes' hubs (called by workers)"""
+    if Config.PROGRESS_BACKEND == 'memory':
+        # Single process: the hub is right here
+        hub.publish(job_data)
+        return
+    
+    from progress_store import get_client
+    get_client().publish(Config.LIVE_UPDATES_CHANNEL, json.dumps(job_data))
+
+_listener_started = False
+_listener_lock = threading.Lock()
+
+def listen():
+    """Feed the hub from the Redis channel, reconnecting on errors"""
+    from progress_store import get_client
+    
+    while True:
+        try:
+            pubsub = get_client().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(Config.LIVE_UPDATES_CHANNEL)
+            for message in pubsub.listen():
+                hub.publish(json.loads(message['data']))
+        except Exception as e:
+            print(f'Live update listener error: {e}')
+            time.sleep(1)
+
+def ensure_listener(start_background_task):
+    """Start the Redis listener once per process"""
+    global _listener_started
+    if Config.PROGRESS_BACKEND == 'memory' or _listener_started:
+        return
+    
+    with _listener_lock:
+        if not _listener_started:
+            start_background_task(listen)
+            _listener_started = True
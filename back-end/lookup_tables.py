@@ -0,0 +1,227 @@
+"""
+Precomputed lookup tables for unsalted fast hashes
+
+A table maps every digest of a wordlist to the byte offset of the line it
+came from. Records are fixed width and sorted by digest, so resolving a hash
+is a binary search costing O(log n) reads on disk instead of re-hashing the
+whole wordlist for every job.
+
+Build from the command line:
+    python lookup_tables.py wordlist.txt md5 sha1 ntlm
+"""
+
+import hashlib
+import heapq
+import os
+import struct
+import sys
+import tempfile
+
+from config import Config
+from hash_utils import FAST_HASH_TYPES, hash_digest
+
+MAGIC = b'PCLT'
+VERSION = 1
+
+# magic, version, digest size, record count, wordlist size, wordlist mtime (ns)
+HEADER = struct.Struct('<4sHHQQQ')
+
+# Big-endian so that raw record bytes sort by (digest, offset)
+OFFSET = struct.Struct('>Q')
+
+# Records sorted in memory before being spilled to a temporary run file
+SORT_CHUNK_RECORDS = 1_000_000
+
+def table_path(wordlist_path, hash_type):
+    """Location of the lookup table for a (wordlist, hash type) pair"""
+    path_id = hashlib.sha1(os.path.abspath(wordlist_path).encode()).hexdigest()[:8]
+    name = f'{os.path.basename(wordlist_path)}.{path_id}.{hash_type}.idx'
+    return os.path.join(Config.LOOKUP_TABLE_DIR, name)
+
+def wordlist_fingerprint(wordlist_path):
+    """Size and mtime used to detect tables built from an older file"""
+    stat = os.stat(wordlist_path)
+    return stat.st_size, stat.st_mtime_ns
+
+def iter_wordlist_offsets(wordlist_path):
+    """Yield (byte offset, word) for every non-empty line of a wordlist"""
+    offset = 0
+    with open(wordlist_path, 'rb') as f:
+        for line in f:
+            word = line.decode('utf-8', errors='ignore').strip()
+            if word:
+                yield offset, word
+            offset += len(line)
+
+def write_sorted_run(records):
+    """Sort a chunk of records and spill it to a temporary file"""
+    records.sort()
+    run = tempfile.TemporaryFile()
+    run.write(b''.join(records))
+    run.seek(0)
+    return run
+
+def read_sorted_run(run, record_size):
+    """Iterate the fixed-width records of a sorted run"""
+    while True:
+        record = run.read(record_size)
+        if not record:
+            return
+        yield record
+
+def build_lookup_table(wordlist_path, hash_type):
+    """Build (or rebuild) the sorted digest -> offset table for a wordlist"""
+    if hash_type not in FAST_HASH_TYPES:
+        raise ValueError(f'Lookup tables only support unsalted hashes: {", ".join(FAST_HASH_TYPES)}')
+    
+    if not os.path.exists(wordlist_path):
+        raise FileNotFoundError(wordlist_path)
+    
+    digest_size = len(hash_digest('', hash_type) or b'')
+    if not digest_size:
+        raise ValueError(f'{hash_type} is not available on this host')
+    
+    size, mtime = wordlist_fingerprint(wordlist_path)
+    record_size = digest_size + OFFSET.size
+    
+    # External sort: sorted runs on disk, merged into the final table
+    runs = []
+    records = []
+    for offset, word in iter_wordlist_offsets(wordlist_path):
+        records.append(hash_digest(word, hash_type) + OFFSET.pack(offset))
+        if len(records) >= SORT_CHUNK_RECORDS:
+            runs.append(write_sorted_run(records))
+            records = []
+    if records or not runs:
+        runs.append(write_sorted_run(records))
+    
+    path = table_path(wordlist_path, hash_type)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    count = 0
+    
+    try:
+        with open(tmp_path, 'wb') as out:
+            out.write(HEADER.pack(MAGIC, VERSION, digest_size, 0, size, mtime))
+            
+            previous = None
+            for record in heapq.merge(*[read_sorted_run(run, record_size) for run in runs]):
+                digest = record[:digest_size]
+                # Duplicate words keep their first occurrence only
+                if digest == previous:
+                    continue
+                previous = digest
+                out.write(record)
+                count += 1
+            
+            out.seek(0)
+            out.write(HEADER.pack(MAGIC, VERSION, digest_size, count, size, mtime))
+        
+        os.replace(tmp_path, path)
+    finally:
+        for run in runs:
+            run.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    
+    return {
+        'wordlist': wordlist_path,
+        'hash_type': hash_type,
+        'records': count,
+        'path': path
+    }
+
+def _open_table(wordlist_path, hash_type):
+    """Open a table and return (file, digest size, count) if it is current"""
+    path = table_path(wordlist_path, hash_type)
+    if not os.path.exists(path) or not os.path.exists(wordlist_path):
+        return None
+    
+    f = open(path, 'rb')
+    magic, version, digest_size, count, size, mtime = HEADER.unpack(f.read(HEADER.size))
+    
+    if magic != MAGIC or version != VERSION or (size, mtime) != wordlist_fingerprint(wordlist_path):
+        f.close()
+        return None
+    
+    return f, digest_size, count
+
+def has_lookup_table(wordlist_path, hash_type):
+    """Check whether an up-to-date table exists"""
+    table = _open_table(wordlist_path, hash_type)
+    if not table:
+        return False
+    table[0].close()
+    return True
+
+def available_tables(wordlist_path):
+    """Hash types with an up-to-date table for this wordlist"""
+    return [hash_type for hash_type in FAST_HASH_TYPES if has_lookup_table(wordlist_path, hash_type)]
+
+def lookup_hash(wordlist_path, hash_type, target_hash):
+    """Resolve a hash through the precomputed table, or None if not present"""
+    if hash_type not in FAST_HASH_TYPES:
+        return None
+    
+    try:
+        target = bytes.fromhex(target_hash.strip())
+    except ValueError:
+        return None
+    
+    table = _open_table(wordlist_path, hash_type)
+    if not table:
+        return None
+    
+    f, digest_size, count = table
+    record_size = digest_size + OFFSET.size
+    
+    if len(target) != digest_size:
+        f.close()
+        return None
+    
+    # Binary search over fixed-width records
+    offset = None
+    with f:
+        low, high = 0, count
+        while low < high:
+            mid = (low + high) // 2
+            f.seek(HEADER.size + mid * record_size)
+            record = f.read(record_size)
+            digest = record[:digest_size]
+            if digest < target:
+                low = mid + 1
+            elif digest > target:
+                high = mid
+            else:
+                offset = OFFSET.unpack(record[digest_size:])[0]
+                break
+    
+    if offset is None:
+        return None
+    
+    with open(wordlist_path, 'rb') as wl:
+        wl.seek(offset)
+        password = wl.readline().decode('utf-8', errors='ignore').strip()
+    
+    # Guard against a wordlist edited within the same mtime tick
+    if hash_digest(password, hash_type) != target:
+        return None
+    
+    return password
+
+def find_in_lookup_tables(target_hash, hash_type, wordlists):
+    """Search the tables of several wordlists, returning (wordlist, password)"""
+    for name, wordlist_path in wordlists:
+        password = lookup_hash(wordlist_path, hash_type, target_hash)
+        if password is not None:
+            return name, password
+    return None
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print('Usage: python lookup_tables.py <wordlist> <hash_type> [<hash_type> ...]')
+        sys.exit(1)
+    
+    for hash_type in sys.argv[2:]:
+        result = build_lookup_table(sys.argv[1], hash_type)
+        print(f"{result['hash_type']}: {result['records']} records -> {result['path']}")
@@ -0,0 +1,186 @@
+"""
+Markov (per-position character frequency) candidate ordering for brute force
+
+A model counts, for every position and previous character, how often each
+character follows. The generator enumerates the same keyspace as a plain
+brute force, but at every position tries characters in descending frequency,
+so realistic passwords come up far earlier than in lexicographic order.
+
+An optional threshold keeps only the N most likely characters per position,
+which shrinks the keyspace to threshold^length. Every candidate has a stable
+index, so the keyspace can be split into chunks or resumed.
+"""
+
+import json
+import os
+import re
+
+from config import Config
+
+# Positions beyond this share the statistics of the last one
+MAX_POSITIONS = 16
+
+def model_path(name):
+    """Location of a stored Markov model"""
+    return os.path.join(Config.MARKOV_MODEL_DIR, f'{name}.json')
+
+def train_markov_model(passwords):
+    """Count per-position character transitions over an iterable of passwords"""
+    positions = [{} for _ in range(MAX_POSITIONS)]
+    trained = 0
+    
+    for password in passwords:
+        prev = ''
+        for i, char in enumerate(password):
+            counts = positions[min(i, MAX_POSITIONS - 1)].setdefault(prev, {})
+            counts[char] = counts.get(char, 0) + 1
+            prev = char
+        trained += 1
+    
+    return {'positions': positions, 'trained_on': trained}
+
+def train_from_wordlist(wordlist_path):
+    """Train a model by streaming a wordlist file"""
+    with open(wordlist_path, 'r', encoding='utf-8', errors='ignore') as f:
+        return train_markov_model(line.strip() for line in f if line.strip())
+
+def save_markov_model(name, model):
+    """Persist a model as JSON"""
+    if not re.match(r'^[\w.-]+$', name):
+        raise ValueError('Model name may only contain letters, digits, ".", "-" and "_"')
+    
+    path = model_path(name)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(dict(model, name=name), f)
+    return path
+
+def load_markov_model(name):
+    """Load a stored model, or None if it does not exist"""
+    if not re.match(r'^[\w.-]+$', name):
+        return None
+    
+    path = model_path(name)
+    if not os.path.exists(path):
+        return None
+    
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def list_markov_models():
+    """Names and sizes of stored models"""
+    if not os.path.isdir(Config.MARKOV_MODEL_DIR):
+        return []
+    
+    models = []
+    for filename in sorted(os.listdir(Config.MARKOV_MODEL_DIR)):
+        if filename.endswith('.json'):
+            model = load_markov_model(filename[:-5])
+            if model:
+                models.append({'name': model['name'], 'trained_on': model['trained_on']})
+    return models
+
+class MarkovGenerator:
+    """Probability-ordered, index-addressable keyspace for a charset"""
+    
+    def __init__(self, model, charset, max_length, threshold=None):
+        self.charset = charset
+        self.max_length = max_length
+        self.width = min(threshold or len(charset), len(charset))
+        
+        # Per position: previous char -> charset ordered by descending count
+        self.orderings = []
+        for i in range(min(max_length, MAX_POSITIONS)):
+            table = model['positions'][i]
+            orderings = {}
+            for prev in [''] + list(charset):
+                counts = table.get(prev, {})
+                # Stable sort keeps charset order for ties and unseen chars
+                ordered = sorted(charset, key=lambda c: -counts.get(c, 0))
+                orderings[prev] = ''.join(ordered[:self.width])
+            self.orderings.append(orderings)
+    
+    def _ordering(self, position, prev):
+        return self.orderings[min(position, MAX_POSITIONS - 1)][prev]
+    
+    def keyspace(self):
+        """Number of candidates of length 1..max_length"""
+        return sum(self.width ** length for length in range(1, self.max_length + 1))
+    
+    def _locate(self, index):
+        """Split a global index into (length, digits)"""
+        for length in range(1, self.max_length + 1):
+            count = self.width ** length
+            if index < count:
+                digits = []
+                for _ in range(length):
+                    index, digit = divmod(index, self.width)
+                    digits.append(digit)
+                return length, digits[::-1]
+            index -= count
+        raise IndexError('Keyspace index out of range')
+    
+    def _decode(self, digits, chars, first=0):
+        """Map digits to characters from position `first` onwards"""
+        prev = chars[first - 1] if first else ''
+        for i in range(first, len(digits)):
+            prev = self._ordering(i, prev)[digits[i]]
+            chars[i] = prev
+    
+    def candidate_at(self, index):
+        """Candidate at a given index"""
+        length, digits = self._locate(index)
+        chars = [''] * length
+        self._decode(digits, chars)
+        return ''.join(chars)
+    
+    def index_of(self, candidate):
+        """Index of a candidate (its guess rank), or None if it is outside the keyspace"""
+        if not 1 <= len(candidate) <= self.max_length:
+            return None
+        
+        index = sum(self.width ** length for length in range(1, len(candidate)))
+        digits = 0
+        prev = ''
+        for i, char in enumerate(candidate):
+            digit = self._ordering(i, prev).find(char)
+            if digit < 0:
+                return None
+            digits = digits * self.width + digit
+            prev = char
+        return index + digits
+    
+    def candidates(self, start=0, end=None):
+        """Yield candidates for indices [start, end) in probability order"""
+        total = self.keyspace()
+        end = total if end is None else min(end, total)
+        if start >= end:
+            return
+        
+        remaining = end - start
+        length, digits = self._locate(start)
+        chars = [''] * length
+        self._decode(digits, chars)
+        
+        while True:
+            yield ''.join(chars)
+            remaining -= 1
+            if not remaining:
+                return
+            
+            # Odometer increment, re-decoding only the positions that changed
+            i = length - 1
+            while i >= 0 and digits[i] == self.width - 1:
+                digits[i] = 0
+                i -= 1
+            
+            if i < 0:
+                # Move on to the next length
+                length += 1
+                digits = [0] * length
+                chars = [''] * length
+                i = 0
+            else:
+                digits[i] += 1
+            
+            self._decode(digits, chars, i)
@@ -0,0 +1,168 @@
+"""
+Prometheus-style metrics shared by the API and the Celery workers
+
+Every process buffers counter increments locally and flushes them about once
+a second (and at the end of each job) into a single Redis hash, using the
+same client as the live progress store. GET /metrics reads that hash, adds
+gauges computed at scrape time (queue depth, jobs per status) and renders the
+Prometheus text format, so throughput from every worker shows up in one place.
+
+Counters only ever grow; rates such as hashes/sec come from rate() on the
+Prometheus side.
+"""
+
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from config import Config
+from progress_store import get_client
+from worker_cache import cache_stats
+
+METRICS_KEY = 'metrics'
+
+# name -> (type, help)
+METRICS = {
+    'cracker_hashes_total': ('counter', 'Candidate passwords hashed and compared'),
+    'cracker_jobs_started_total': ('counter', 'Jobs picked up by a worker'),
+    'cracker_job_wait_seconds': ('summary', 'Time between job creation and a worker starting it'),
+    'cracker_shards_dispatched_total': ('counter', 'Per-hash-type shards queued from hashfiles'),
+    'cracker_cache_hits_total': ('counter', 'Worker cache hits'),
+    'cracker_cache_misses_total': ('counter', 'Worker cache misses'),
+    'cracker_db_commit_seconds': ('summary', 'Database commit latency'),
+    'cracker_socket_emits_total': ('counter', 'job_update events published'),
+    'cracker_socket_emits_dropped_total': ('counter', 'job_update events dropped by the rate limit'),
+    'cracker_queue_depth': ('gauge', 'Tasks waiting in the Celery broker queue'),
+    'cracker_jobs': ('gauge', 'Jobs per status'),
+}
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def series_name(name, labels):
+    """Prometheus series identifier, e.g. name{a="1",b="2"}"""
+    if not labels:
+        return name
+    pairs = ','.join(f'{key}="{_escape(value)}"' for key, value in sorted(labels.items()))
+    return f'{name}{{{pairs}}}'
+
+class MetricsBuffer:
+    """Process-local counter increments, flushed to Redis in one pipeline"""
+    
+    def __init__(self, interval):
+        self.interval = interval
+        self._pending = {}
+        self._last_flush = time.monotonic()
+        self._cache_seen = {}
+        self._lock = threading.Lock()
+    
+    def add(self, series, amount):
+        with self._lock:
+            self._pending[series] = self._pending.get(series, 0) + amount
+            due = time.monotonic() - self._last_flush >= self.interval
+        if due:
+            self.flush()
+    
+    def _cache_deltas(self):
+        # Worker caches count locally; publish only what changed since last flush
+        deltas = {}
+        for cache, stats in cache_stats().items():
+            for field, metric in (('hits', 'cracker_cache_hits_total'),
+                                  ('misses', 'cracker_cache_misses_total')):
+                key = (cache, field)
+                delta = stats[field] - self._cache_seen.get(key, 0)
+                if delta:
+                    deltas[series_name(metric, {'cache': cache})] = delta
+                    self._cache_seen[key] = stats[field]
+        return deltas
+    
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+            for series, amount in self._cache_deltas().items():
+                pending[series] = pending.get(series, 0) + amount
+        
+        if not pending:
+            return
+        
+        try:
+            pipe = get_client().pipeline(transaction=False)
+            for series, amount in pending.items():
+                pipe.hincrbyfloat(METRICS_KEY, series, amount)
+            pipe.execute()
+        except Exception:
+            # Metrics are best-effort and must never fail a job or a request
+            pass
+
+_buffer = MetricsBuffer(Config.METRICS_FLUSH_INTERVAL)
+
+def inc(name, amount=1, **labels):
+    """Add to a counter"""
+    _buffer.add(series_name(name, labels), amount)
+
+def observe(name, value, **labels):
+    """Record one observation of a summary"""
+    _buffer.add(series_name(f'{name}_sum', labels), value)
+    _buffer.add(series_name(f'{name}_count', labels), 1)
+
+def flush():
+    """Push buffered increments now (end of a job, before a scrape)"""
+    _buffer.flush()
+
+@event.listens_for(Session, 'before_commit')
+def _start_commit_timer(session):
+    session.info['commit_started'] = time.perf_counter()
+
+@event.listens_for(Session, 'after_commit')
+def _observe_commit(session):
+    started = session.info.pop('commit_started', None)
+    if started is not None:
+        observe('cracker_db_commit_seconds', time.perf_counter() - started)
+
+def _base_name(series):
+    name = series.split('{', 1)[0]
+    for suffix in ('_sum', '_count'):
+        if name.endswith(suffix) and name[:-len(suffix)] in METRICS:
+            return name[:-len(suffix)]
+    return name
+
+def _format_value(value):
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+def render(gauges=None):
+    """Prometheus text exposition of the stored counters plus scrape-time gauges"""
+    flush()
+    
+    series = {}
+    try:
+        series.update(get_client().hgetall(METRICS_KEY))
+    except Exception:
+        pass
+    series.update(gauges or {})
+    
+    by_metric = {}
+    for name, value in series.items():
+        by_metric.setdefault(_base_name(name), []).append((name, value))
+    
+    lines = []
+    for metric in sorted(by_metric):
+        metric_type, help_text = METRICS.get(metric, ('untyped', ''))
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} {metric_type}')
+        for name, value in sorted(by_metric[metric]):
+            lines.append(f'{name} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+def queue_depth(queue='celery'):
+    """Number of tasks waiting in the Redis broker, or None if unavailable"""
+    if Config.PROGRESS_BACKEND == 'memory':
+        return None
+    try:
+        import redis
+        return redis.Redis.from_url(Config.CELERY_BROKER_URL).llen(queue)
+    except Exception:
+        return None
@@ -1,10 +1,36 @@
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, Enum
+from sqlalchemy import (
+    Column, Integer, BigInteger, String, Float, Boolean, DateTime, Text, Enum, ForeignKey, Index,
+    event, insert, update, bindparam, inspect, literal, text
+)
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import deferred
 import enum
+import json
+import sqlite3
+
+from config import Config
 
 db = SQLAlchemy()
 
+@event.listens_for(Engine, 'connect')
+def configure_sqlite(dbapi_connection, connection_record):
+    """Use WAL on SQLite so pollers are not blocked while workers write"""
+    if isinstance(dbapi_connection, sqlite3.Connection) and Config.SQLITE_WAL:
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.close()
+
+def serialize_value(value):
+    """JSON-friendly form of a column value"""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
 class JobStatus(enum.Enum):
     PENDING = "pending"
     RUNNING = "running"
@@ -17,22 +43,39 @@ class AttackMode(enum.Enum):
     BRUTEFORCE = "bruteforce"
     SMART = "smart"
     HASHCAT = "hashcat"
+    PCFG = "pcfg"
+    COMBINATOR = "combinator"
+    HYBRID_WORDLIST_MASK = "hybrid_wordlist_mask"
+    HYBRID_MASK_WORDLIST = "hybrid_mask_wordlist"
 
 class CrackJob(db.Model):
     __tablename__ = 'crack_jobs'
+    __table_args__ = (
+        Index('ix_crack_jobs_status_created_at', 'status', 'created_at'),
+    )
     
     id = Column(Integer, primary_key=True)
     job_id = Column(String(36), unique=True, nullable=False, index=True)
+    batch_id = Column(String(36), index=True)
     
     # Input
     target_hash = Column(String(512), nullable=False)
+    username = Column(String(255))
     hash_type = Column(String(50), nullable=False)
     attack_mode = Column(Enum(AttackMode), nullable=False)
     
     # Configuration
     wordlist_name = Column(String(255))
+    wordlist2_name = Column(String(255))
+    mask = Column(String(255))
     max_length = Column(Integer)
     charset_option = Column(String(10))
+    model_name = Column(String(255))
+    markov_threshold = Column(Integer)
+    profile_enabled = Column(Boolean, default=False)
+    time_budget = Column(Float)  # Wall-clock seconds across all runs, None for no budget
+    policy = Column(Text)  # Password policy filter of dictionary jobs (JSON)
+    bucketed = Column(Boolean, default=False)  # Dictionary order by UTF-8 width (block layout)
     
     # Status
     status = Column(Enum(JobStatus), default=JobStatus.PENDING, nullable=False, index=True)
@@ -40,34 +83,69 @@ class CrackJob(db.Model):
     current_attempt = Column(Integer, default=0)
     total_attempts = Column(Integer, default=0)
     
+    # Candidates [0, searched_until) of the attack's keyspace have been tried
+    keyspace = Column(BigInteger)
+    searched_until = Column(BigInteger, default=0)
+    
+    # Wordlist entries the policy ruled out without hashing them
+    skipped_attempts = Column(BigInteger, default=0)
+    
+    # Multi-target jobs (hashfile uploads)
+    target_count = Column(Integer, default=0)
+    cracked_count = Column(Integer, default=0)
+    
     # Results
     success = Column(Boolean, default=False)
     cracked_password = Column(String(255))
+    matched_hash_type = Column(String(50))  # The type that matched, for ambiguous jobs
     time_elapsed = Column(Float, default=0.0)
     speed = Column(Float, default=0.0)
     
+    # cProfile phase breakdown (JSON), only loaded when asked for
+    profile_data = deferred(Column(Text))
+    
     # Metadata
     error_message = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     started_at = Column(DateTime)
     completed_at = Column(DateTime)
     
-    def to_dict(self):
+    def to_dict(self, fields=None):
+        # Projection used by list views: only the requested columns
+        if fields:
+            return {field: serialize_value(getattr(self, field)) for field in fields}
+        
         return {
             'id': self.id,
             'job_id': self.job_id,
+            'batch_id': self.batch_id,
             'target_hash': self.target_hash,
+            'username': self.username,
             'hash_type': self.hash_type,
             'attack_mode': self.attack_mode.value if self.attack_mode else None,
             'wordlist_name': self.wordlist_name,
+            'wordlist2_name': self.wordlist2_name,
+            'mask': self.mask,
             'max_length': self.max_length,
             'charset_option': self.charset_option,
+            'model_name': self.model_name,
+            'markov_threshold': self.markov_threshold,
+            'profile_enabled': self.profile_enabled,
+            'time_budget': self.time_budget,
+            'policy': json.loads(self.policy) if self.policy else None,
+            'bucketed': self.bucketed,
             'status': self.status.value if self.status else None,
             'progress': self.progress,
             'current_attempt': self.current_attempt,
             'total_attempts': self.total_attempts,
+            'keyspace': self.keyspace,
+            'searched_until': self.searched_until,
+            'skipped_attempts': self.skipped_attempts,
+            'target_count': self.target_count,
+            'cracked_count': self.cracked_count,
             'success': self.success,
             'cracked_password': self.cracked_password,
+            'matched_hash_type': self.matched_hash_type,
             'time_elapsed': self.time_elapsed,
             'speed': self.speed,
             'error_message': self.error_message,
@@ -76,6 +154,63 @@ class CrackJob(db.Model):
             'completed_at': self.completed_at.isoformat() if self.completed_at else None,
         }
 
+class CrackTarget(db.Model):
+    __tablename__ = 'crack_targets'
+    __table_args__ = (
+        Index('ix_crack_targets_hash_type_target_hash', 'hash_type', 'target_hash'),
+        Index('ix_crack_targets_job_id_cracked', 'job_id', 'cracked'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    job_id = Column(String(36), ForeignKey('crack_jobs.job_id'), nullable=False)
+    
+    # Input
+    username = Column(String(255))
+    target_hash = Column(String(512), nullable=False)
+    hash_type = Column(String(50), nullable=False)
+    
+    # Results
+    cracked = Column(Boolean, default=False, nullable=False)
+    cracked_password = Column(String(255))
+    cracked_at = Column(DateTime)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'job_id': self.job_id,
+            'username': self.username,
+            'target_hash': self.target_hash,
+            'hash_type': self.hash_type,
+            'cracked': self.cracked,
+            'cracked_password': self.cracked_password,
+            'cracked_at': self.cracked_at.isoformat() if self.cracked_at else None,
+        }
+
+def bulk_insert_targets(session, rows):
+    """Insert many targets with a single executemany"""
+    if rows:
+        session.execute(insert(CrackTarget), rows)
+
+def bulk_mark_cracked(session, results):
+    """Record many cracked targets with a single executemany
+    
+    results: list of (target id, password) pairs
+    """
+    if not results:
+        return
+    
+    table = CrackTarget.__table__
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam('target_id'))
+        .values(cracked=True, cracked_password=bindparam('password'), cracked_at=bindparam('now'))
+    )
+    now = datetime.utcnow()
+    session.execute(statement, [
+        {'target_id': target_id, 'password': password, 'now': now}
+        for target_id, password in results
+    ])
+
 class Wordlist(db.Model):
     __tablename__ = 'wordlists'
     
@@ -95,3 +230,43 @@ class Wordlist(db.Model):
             'description': self.description,
             'created_at': self.created_at.isoformat() if self.created_at else None,
         }
+
+def upgrade_schema(engine):
+    """Add the columns and indexes that db.create_all() leaves out of existing tables
+    
+    create_all() only creates missing tables, so a database from an older
+    release keeps its old crack_jobs columns. New columns are nullable or
+    have a scalar default, so ALTER TABLE ... ADD COLUMN is enough; the
+    default is written as a server default so existing rows get it too.
+    Returns the names of the columns that were added.
+    """
+    added = []
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        existing_tables = set(inspector.get_table_names())
+        
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                
+                column_type = column.type.compile(dialect=connection.dialect)
+                statement = f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'
+                if column.default is not None and column.default.is_scalar:
+                    default = literal(column.default.arg, column.type).compile(
+                        dialect=connection.dialect, compile_kwargs={'literal_binds': True}
+                    )
+                    statement += f' DEFAULT {default}'
+                connection.execute(text(statement))
+                added.append(f'{table.name}.{column.name}')
+            
+            existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(connection)
+    
+    return added
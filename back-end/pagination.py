@@ -0,0 +1,87 @@
+"""
+Cursor-based pagination for job listings
+
+Cursors encode the (created_at, id) of the last job on a page, so the next
+page is an indexed range scan on created_at instead of an OFFSET that has to
+skip every earlier row.
+"""
+
+import base64
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import load_only
+
+from models import CrackJob, JobStatus
+
+MAX_PAGE_SIZE = 500
+
+# Columns a client may request with ?fields=
+JOB_FIELDS = tuple(CrackJob.__table__.columns.keys())
+
+def encode_cursor(job):
+    """Opaque cursor pointing just after a job"""
+    raw = f'{job.created_at.isoformat()}|{job.id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor):
+    """Decode a cursor into (created_at, id)"""
+    try:
+        created_at, job_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(job_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+
+def parse_fields(value):
+    """Validate a comma-separated ?fields= projection"""
+    if not value:
+        return None
+    
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in JOB_FIELDS]
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(unknown)}')
+    return fields
+
+def paginate_jobs(args):
+    """One page of jobs, newest first, from request query arguments"""
+    status = args.get('status')
+    limit = min(max(args.get('limit', 50, type=int), 1), MAX_PAGE_SIZE)
+    cursor = args.get('cursor')
+    fields = parse_fields(args.get('fields'))
+    
+    query = CrackJob.query
+    
+    if status:
+        try:
+            status_enum = JobStatus[status.upper()]
+            query = query.filter_by(status=status_enum)
+        except KeyError:
+            pass
+    
+    if cursor:
+        created_at, job_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            CrackJob.created_at < created_at,
+            and_(CrackJob.created_at == created_at, CrackJob.id < job_id)
+        ))
+    
+    if fields:
+        # id and created_at are always needed to build the next cursor
+        columns = set(fields) | {'id', 'created_at'}
+        query = query.options(load_only(*[getattr(CrackJob, column) for column in columns]))
+    
+    jobs = (
+        query.order_by(CrackJob.created_at.desc(), CrackJob.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    
+    has_more = len(jobs) > limit
+    jobs = jobs[:limit]
+    
+    return {
+        'jobs': [job.to_dict(fields) for job in jobs],
+        'count': len(jobs),
+        'next_cursor': encode_cursor(jobs[-1]) if has_more else None
+    }
@@ -6,13 +6,8 @@ See UPGRADE_GUIDE.md for migration instructions
 
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-import hashlib
-import itertools
-import string
-import time
 from datetime import datetime
 import os
-import re
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for React frontend
@@ -21,47 +16,17 @@ CORS(app)  # Enable CORS for React frontend
 # AUTO HASH DETECTION FUNCTION
 # ============================================
 
-def detect_hash_type(hash_string):
-    """
-    Automatically detect hash type from the hash string
-    Returns: (hash_type, confidence, description)
-    """
-    hash_string = hash_string.strip()
-    length = len(hash_string)
-    
-    # Bcrypt detection (highest priority - has unique prefix)
-    if re.match(r'^\$2[aby]\$\d{2}\$.{53}$', hash_string):
-        return ('bcrypt', 'High', 'Bcrypt - Very secure, slow to crack')
-    
-    # SHA-512 Crypt (Unix)
-    if hash_string.startswith('$6$'):
-        return ('sha512crypt', 'High', 'SHA-512 Crypt (Unix/Linux)')
-    
-    # SHA-256 Crypt (Unix)
-    if hash_string.startswith('$5$'):
-        return ('sha256crypt', 'High', 'SHA-256 Crypt (Unix/Linux)')
-    
-    # MD5 Crypt (Unix)
-    if hash_string.startswith('$1$'):
-        return ('md5crypt', 'High', 'MD5 Crypt (Unix/Linux)')
-    
-    # NTLM (Windows) - looks like MD5 but context matters
-    if length == 32 and re.match(r'^[a-fA-F0-9]{32}$', hash_string):
-        return ('md5', 'Medium', 'MD5 or NTLM - Most likely MD5')
-    
-    # Length-based detection (hex strings)
-    if re.match(r'^[a-fA-F0-9]+$', hash_string):
-        if length == 32:
-            return ('md5', 'High', 'MD5 - Fast, commonly used')
-        elif length == 40:
-            return ('sha1', 'High', 'SHA-1 - Git commits, legacy systems')
-        elif length == 64:
-            return ('sha256', 'High', 'SHA-256 - Bitcoin, modern apps')
-        elif length == 128:
-            return ('sha512', 'High', 'SHA-512 - High security applications')
-    
-    # If nothing matches
-    return ('unknown', 'Low', 'Unknown hash type - Cannot detect')
+# Table-driven detector shared with the v2 API; returns (hash_type, confidence, description)
+from hash_utils import detect_hash_type, hash_password
+from results_store import get_store, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from strength import StrengthAnalyzer
+
+# Attack loops are shared with the v2 APIs
+from config import Config
+from engine import attack_spec, search, get_backend, LIMIT
+from worker_cache import get_verifier
+
+COMMON_WORDLISTS = ['wordlist.txt', 'common_passwords.txt', 'rockyou.txt']
 
 def get_hash_info(hash_type):
     """Get detailed information about a hash type"""
@@ -137,24 +102,6 @@ def get_hash_info(hash_type):
 # UTILITY FUNCTIONS
 # ============================================
 
-def hash_password(password, hash_type='md5'):
-    """Hash a password using specified algorithm"""
-    try:
-        if hash_type == 'md5':
-            return hashlib.md5(password.encode()).hexdigest()
-        elif hash_type == 'sha1':
-            return hashlib.sha1(password.encode()).hexdigest()
-        elif hash_type == 'sha256':
-            return hashlib.sha256(password.encode()).hexdigest()
-        elif hash_type == 'sha512':
-            return hashlib.sha512(password.encode()).hexdigest()
-        elif hash_type == 'ntlm':
-            return hashlib.new('md4', password.encode('utf-16le')).hexdigest()
-        else:
-            return None
-    except:
-        return None
-
 def load_wordlist(filename):
     """Load passwords from text file"""
     if not os.path.exists(filename):
@@ -168,138 +115,28 @@ def load_wordlist(filename):
 
 def crack_password_dictionary(target_hash, wordlist, hash_type='md5'):
     """Dictionary attack"""
-    attempts = 0
-    start_time = time.time()
-    
-    for password in wordlist:
-        attempts += 1
-        hashed = hash_password(password, hash_type)
-        
-        if hashed == target_hash:
-            elapsed = time.time() - start_time
-            return {
-                'success': True,
-                'password': password,
-                'attempts': attempts,
-                'time': elapsed,
-                'speed': attempts / elapsed if elapsed > 0 else 0
-            }
-    
-    elapsed = time.time() - start_time
-    return {
-        'success': False,
-        'password': None,
-        'attempts': attempts,
-        'time': elapsed,
-        'speed': attempts / elapsed if elapsed > 0 else 0
-    }
+    return search(wordlist, get_verifier(target_hash, hash_type)).to_dict()
 
 def crack_password_bruteforce(target_hash, hash_type='md5', max_length=4, charset_option='1'):
     """Brute force attack"""
-    charsets = {
-        '1': string.ascii_lowercase + string.digits,
-        '2': string.ascii_lowercase,
-        '3': string.ascii_lowercase + string.ascii_uppercase + string.digits,
-        '4': string.ascii_letters + string.digits + string.punctuation
-    }
-    
-    charset = charsets.get(charset_option, string.ascii_lowercase + string.digits)
-    attempts = 0
-    start_time = time.time()
-    
-    for length in range(1, max_length + 1):
-        for combo in itertools.product(charset, repeat=length):
-            attempts += 1
-            password = ''.join(combo)
-            hashed = hash_password(password, hash_type)
-            
-            # Limit attempts to prevent timeout
-            if attempts > 100000:
-                elapsed = time.time() - start_time
-                return {
-                    'success': False,
-                    'password': None,
-                    'attempts': attempts,
-                    'time': elapsed,
-                    'speed': attempts / elapsed if elapsed > 0 else 0,
-                    'message': 'Exceeded maximum attempts (100k). Use shorter length or simpler charset.'
-                }
-            
-            if hashed == target_hash:
-                elapsed = time.time() - start_time
-                return {
-                    'success': True,
-                    'password': password,
-                    'attempts': attempts,
-                    'time': elapsed,
-                    'speed': attempts / elapsed if elapsed > 0 else 0
-                }
-    
-    elapsed = time.time() - start_time
-    return {
-        'success': False,
-        'password': None,
-        'attempts': attempts,
-        'time': elapsed,
-        'speed': attempts / elapsed if elapsed > 0 else 0
-    }
+    spec = attack_spec('bruteforce', target_hash, hash_type, charset=charset_option, max_length=max_length)
+    
+    # Limit attempts to prevent timeout
+    result = get_backend().search(spec, max_attempts=Config.MAX_SYNC_ATTEMPTS)
+    summary = result.to_dict()
+    if result.stopped == LIMIT:
+        summary['message'] = (f'Exceeded maximum attempts ({Config.MAX_SYNC_ATTEMPTS:,}). '
+                              'Use shorter length or simpler charset.')
+    return summary
 
 def analyze_password_strength(password):
     """Analyze password strength"""
-    length = len(password)
-    has_lower = any(c.islower() for c in password)
-    has_upper = any(c.isupper() for c in password)
-    has_digit = any(c.isdigit() for c in password)
-    has_symbol = any(c in string.punctuation for c in password)
-    
-    charset_size = 0
-    if has_lower: charset_size += 26
-    if has_upper: charset_size += 26
-    if has_digit: charset_size += 10
-    if has_symbol: charset_size += 32
-    
-    combinations = charset_size ** length
-    attempts_per_second = 1_000_000_000
-    seconds_to_crack = combinations / attempts_per_second
-    
-    if seconds_to_crack < 1:
-        time_str = "Instantly"
-        strength = "Very Weak"
-        score = 1
-    elif seconds_to_crack < 60:
-        time_str = f"{seconds_to_crack:.2f} seconds"
-        strength = "Weak"
-        score = 2
-    elif seconds_to_crack < 3600:
-        time_str = f"{seconds_to_crack/60:.2f} minutes"
-        strength = "Moderate"
-        score = 3
-    elif seconds_to_crack < 86400:
-        time_str = f"{seconds_to_crack/3600:.2f} hours"
-        strength = "Good"
-        score = 4
-    elif seconds_to_crack < 31536000:
-        time_str = f"{seconds_to_crack/86400:.2f} days"
-        strength = "Strong"
-        score = 5
-    else:
-        years = seconds_to_crack / 31536000
-        time_str = f"{years:.2e} years" if years > 1000000 else f"{years:.2f} years"
-        strength = "Very Strong"
-        score = 6
-    
-    return {
-        'length': length,
-        'charset_size': charset_size,
-        'combinations': combinations,
-        'time_to_crack': time_str,
-        'strength': strength,
-        'score': score,
-        'has_lower': has_lower,
-        'has_upper': has_upper,
-        'has_digit': has_digit,
-        'has_symbol': has_symbol
-    }
+    return strength_analyzer().analyze(password)
+
+def strength_analyzer():
+    """Strength analyzer over the common wordlists present in this directory"""
+    wordlists = [(wl, wl) for wl in COMMON_WORDLISTS if os.path.exists(wl)]
+    return StrengthAnalyzer(wordlists)
 
 # ============================================
 # API ENDPOINTS
@@ -425,6 +262,20 @@ def analyze_strength():
     analysis = analyze_password_strength(password)
     return jsonify(analysis)
 
+@app.route('/api/analyze-strength/batch', methods=['POST'])
+def analyze_strength_batch():
+    """Analyze the strength of many passwords at once"""
+    data = request.json or {}
+    passwords = data.get('passwords')
+    
+    if not isinstance(passwords, list) or not all(isinstance(p, str) and p for p in passwords):
+        return jsonify({'error': 'passwords must be a list of non-empty strings'}), 400
+    
+    if len(passwords) > Config.STRENGTH_BATCH_LIMIT:
+        return jsonify({'error': f'At most {Config.STRENGTH_BATCH_LIMIT} passwords per request'}), 400
+    
+    return jsonify(strength_analyzer().analyze_batch(passwords))
+
 @app.route('/api/crack-dictionary', methods=['POST'])
 def crack_dictionary():
     """Crack hash using dictionary attack"""
@@ -466,9 +317,7 @@ def crack_bruteforce():
 def list_wordlists():
     """List available wordlist files"""
     wordlists = []
-    common_wordlists = ['wordlist.txt', 'common_passwords.txt', 'rockyou.txt']
-    
-    for wl in common_wordlists:
+    for wl in COMMON_WORDLISTS:
         if os.path.exists(wl):
             wordlist = load_wordlist(wl)
             wordlists.append({
@@ -480,15 +329,12 @@ def list_wordlists():
 
 @app.route('/api/save-result', methods=['POST'])
 def save_result():
-    """Save cracking result to file"""
+    """Append a cracking result to the results log"""
     data = request.json
     
     try:
-        filename = "crack_results.json"
-        timestamp = datetime.now().isoformat()
-        
         result_entry = {
-            'timestamp': timestamp,
+            'timestamp': datetime.now().isoformat(),
             'mode': data.get('mode'),
             'hash_type': data.get('hashType'),
             'target_hash': data.get('hash'),
@@ -499,37 +345,32 @@ def save_result():
             'speed': data.get('speed')
         }
         
-        results = []
-        if os.path.exists(filename):
-            with open(filename, 'r') as f:
-                import json
-                results = json.load(f)
+        result_id = get_store().append(result_entry)
         
-        results.append(result_entry)
-        
-        with open(filename, 'w') as f:
-            import json
-            json.dump(results, f, indent=2)
-        
-        return jsonify({'message': 'Result saved successfully'})
+        return jsonify({'message': 'Result saved successfully', 'id': result_id})
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/results', methods=['GET'])
 def get_results():
-    """Get all saved results"""
+    """Saved results newest first (?limit=&cursor=&hash=&since=&until=)"""
     try:
-        filename = "crack_results.json"
-        
-        if not os.path.exists(filename):
-            return jsonify({'results': []})
-        
-        with open(filename, 'r') as f:
-            import json
-            results = json.load(f)
-        
-        return jsonify({'results': results})
+        limit = min(max(int(request.args.get('limit', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        cursor = request.args.get('cursor')
+        before = int(cursor) if cursor else None
+    except ValueError:
+        return jsonify({'error': 'limit and cursor must be integers'}), 400
+    
+    try:
+        page = get_store().page(
+            limit=limit,
+            before=before,
+            target_hash=request.args.get('hash'),
+            since=request.args.get('since'),
+            until=request.args.get('until')
+        )
+        return jsonify(page)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -0,0 +1,180 @@
+"""
+Probabilistic context-free grammar (PCFG) candidate generation
+
+Training splits every password into runs of letters (L), digits (D) and
+symbols (S), e.g. "password12!" -> L8 D2 S1. The grammar keeps how often each
+structure occurs and how often each terminal string fills each segment.
+
+Generation walks a priority queue of pre-terminals (a structure plus one
+terminal choice per segment) in descending probability. Children are only
+created at or after the parent's pivot segment, so every pre-terminal is
+produced exactly once without a "seen" set, and the queue is capped so memory
+stays bounded (the least likely entries are dropped when it overflows).
+"""
+
+import heapq
+import json
+import os
+import re
+
+from config import Config
+
+# Most frequent terminal strings kept per segment
+MAX_TERMINALS = 10_000
+
+def model_path(name):
+    """Location of a stored grammar"""
+    return os.path.join(Config.PCFG_MODEL_DIR, f'{name}.json')
+
+def char_class(char):
+    """Segment class of a character"""
+    if char.isalpha():
+        return 'L'
+    if char.isdigit():
+        return 'D'
+    return 'S'
+
+def parse_segments(password):
+    """Split a password into (segment label, terminal) runs"""
+    segments = []
+    for match in re.finditer(r'[^\W\d_]+|\d+|[\W_]+', password):
+        run = match.group()
+        segments.append((f'{char_class(run[0])}{len(run)}', run))
+    return segments
+
+def train_pcfg_model(passwords):
+    """Learn structure and terminal frequencies from an iterable of passwords"""
+    structures = {}
+    terminals = {}
+    trained = 0
+    
+    for password in passwords:
+        segments = parse_segments(password)
+        if not segments:
+            continue
+        
+        structure = ' '.join(label for label, _ in segments)
+        structures[structure] = structures.get(structure, 0) + 1
+        
+        for label, run in segments:
+            counts = terminals.setdefault(label, {})
+            counts[run] = counts.get(run, 0) + 1
+        
+        trained += 1
+    
+    # Keep the most frequent terminals only, to bound model size
+    for label, counts in terminals.items():
+        if len(counts) > MAX_TERMINALS:
+            top = heapq.nlargest(MAX_TERMINALS, counts.items(), key=lambda item: item[1])
+            terminals[label] = dict(top)
+    
+    return {'structures': structures, 'terminals': terminals, 'trained_on': trained}
+
+def train_from_wordlist(wordlist_path):
+    """Train a grammar by streaming a wordlist file"""
+    with open(wordlist_path, 'r', encoding='utf-8', errors='ignore') as f:
+        return train_pcfg_model(line.strip() for line in f if line.strip())
+
+def save_pcfg_model(name, model):
+    """Persist a grammar as JSON"""
+    if not re.match(r'^[\w.-]+$', name):
+        raise ValueError('Model name may only contain letters, digits, ".", "-" and "_"')
+    
+    path = model_path(name)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(dict(model, name=name), f)
+    return path
+
+def load_pcfg_model(name):
+    """Load a stored grammar, or None if it does not exist"""
+    if not re.match(r'^[\w.-]+$', name):
+        return None
+    
+    path = model_path(name)
+    if not os.path.exists(path):
+        return None
+    
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def list_pcfg_models():
+    """Names and sizes of stored grammars"""
+    if not os.path.isdir(Config.PCFG_MODEL_DIR):
+        return []
+    
+    models = []
+    for filename in sorted(os.listdir(Config.PCFG_MODEL_DIR)):
+        if filename.endswith('.json'):
+            model = load_pcfg_model(filename[:-5])
+            if model:
+                models.append({
+                    'name': model['name'],
+                    'trained_on': model['trained_on'],
+                    'structures': len(model['structures'])
+                })
+    return models
+
+class PcfgGenerator:
+    """Emits guesses from a grammar in descending probability"""
+    
+    def __init__(self, model, max_queue=None):
+        self.max_queue = max_queue or Config.PCFG_MAX_QUEUE
+        
+        # Terminals per segment label, most probable first
+        self.terminals = {}
+        for label, counts in model['terminals'].items():
+            total = sum(counts.values())
+            ordered = sorted(counts.items(), key=lambda item: -item[1])
+            self.terminals[label] = [(run, count / total) for run, count in ordered]
+        
+        total = sum(model['structures'].values())
+        self.structures = [
+            (structure.split(), count / total)
+            for structure, count in sorted(model['structures'].items(), key=lambda item: -item[1])
+        ]
+    
+    def keyspace(self):
+        """Number of distinct guesses the grammar can produce"""
+        total = 0
+        for labels, _ in self.structures:
+            size = 1
+            for label in labels:
+                size *= len(self.terminals[label])
+            total += size
+        return total
+    
+    def _probability(self, structure, indices):
+        labels, probability = self.structures[structure]
+        for label, index in zip(labels, indices):
+            probability *= self.terminals[label][index][1]
+        return probability
+    
+    def candidates(self, limit=None):
+        """Yield guesses in descending probability"""
+        queue = []
+        for structure, (labels, _) in enumerate(self.structures):
+            indices = (0,) * len(labels)
+            queue.append((-self._probability(structure, indices), structure, indices, 0))
+        heapq.heapify(queue)
+        
+        emitted = 0
+        while queue:
+            _, structure, indices, pivot = heapq.heappop(queue)
+            labels = self.structures[structure][0]
+            
+            yield ''.join(self.terminals[label][index][0] for label, index in zip(labels, indices))
+            emitted += 1
+            if limit is not None and emitted >= limit:
+                return
+            
+            # Children replace one terminal at or after the pivot with the next most likely
+            for i in range(pivot, len(labels)):
+                if indices[i] + 1 < len(self.terminals[labels[i]]):
+                    child = indices[:i] + (indices[i] + 1,) + indices[i + 1:]
+                    heapq.heappush(queue, (-self._probability(structure, child), structure, child, i))
+            
+            # Bound memory by keeping only the most probable pre-terminals
+            if len(queue) > self.max_queue * 2:
+                queue = heapq.nsmallest(self.max_queue, queue)
+                heapq.heapify(queue)
@@ -0,0 +1,103 @@
+"""
+Opt-in profiling of cracking jobs
+
+A job created with `profile: true` runs under cProfile. When it finishes,
+every function's own time is attributed to a phase of the hot loop:
+
+    generation   producing candidates (keyspace, Markov, PCFG, wordlists)
+    hashing      hashlib / passlib work and password encoding
+    comparison   verifier dispatch and digest comparison (hash_utils)
+    progress_io  progress counters, events, metrics, database and Redis
+    other        the task's own loop and everything else
+
+cProfile slows the loop down noticeably, so absolute speeds of profiled jobs
+are lower; the split between phases is what the report is for.
+"""
+
+import cProfile
+import os
+import pstats
+
+# Module files (basenames) and package path fragments per phase, first match wins
+PHASE_FILES = [
+    ('progress_io', ('progress_store.py', 'events.py', 'metrics.py', 'models.py')),
+    ('generation', ('keyspace.py', 'markov.py', 'pcfg.py', 'combinator.py',
+                    'worker_cache.py', 'heapq.py')),
+    ('comparison', ('hash_utils.py',)),
+]
+
+PHASE_PACKAGES = [
+    ('hashing', ('passlib', 'bcrypt')),
+    ('progress_io', ('sqlalchemy', 'redis', 'socketio', 'engineio', 'kombu', 'celery', 'flask')),
+]
+
+# Built-in (C) functions, matched on cProfile's '<method ...>' / '<built-in ...>' names
+PHASE_BUILTINS = [
+    ('hashing', ('_hashlib', 'openssl_', "'encode' of 'str'", '_md5', '_sha')),
+    ('comparison', ("'lower' of 'str'", "'fromhex' of 'bytes'")),
+    ('generation', ("'join' of 'str'", "'strip' of 'str'", 'itertools', 'islice')),
+    ('progress_io', ("'execute' of", "'commit' of", 'socket', 'select', '_sqlite3')),
+]
+
+PHASES = ('generation', 'hashing', 'comparison', 'progress_io', 'other')
+
+def classify(filename, funcname):
+    """Phase a profiled function's own time belongs to"""
+    if filename == '~':
+        for phase, markers in PHASE_BUILTINS:
+            if any(marker in funcname for marker in markers):
+                return phase
+        return 'other'
+    
+    path = filename.replace('\\', '/')
+    basename = os.path.basename(path)
+    for phase, packages in PHASE_PACKAGES:
+        if any(f'/{package}/' in path for package in packages):
+            return phase
+    for phase, files in PHASE_FILES:
+        if basename in files:
+            return phase
+    
+    # Generator expressions in the tasks build candidates
+    if basename == 'tasks.py' and funcname == '<genexpr>':
+        return 'generation'
+    return 'other'
+
+class JobProfiler:
+    """cProfile wrapper that reports time per hot-loop phase"""
+    
+    def __init__(self, top=15):
+        self.top = top
+        self.profile = cProfile.Profile()
+    
+    def __enter__(self):
+        self.profile.enable()
+        return self
+    
+    def __exit__(self, *exc):
+        self.profile.disable()
+        return False
+    
+    def report(self):
+        """Per-phase seconds and shares plus the most expensive functions"""
+        stats = pstats.Stats(self.profile)
+        phases = dict.fromkeys(PHASES, 0.0)
+        functions = []
+        
+        for (filename, lineno, funcname), (_, calls, own, cumulative, _) in stats.stats.items():
+            phases[classify(filename, funcname)] += own
+            functions.append((own, calls, cumulative, pstats.func_std_string((filename, lineno, funcname))))
+        
+        total = sum(phases.values())
+        functions.sort(reverse=True)
+        
+        return {
+            'profiler': 'cProfile',
+            'total_time': total,
+            'phases': phases,
+            'shares': {phase: (seconds / total * 100 if total else 0) for phase, seconds in phases.items()},
+            'top_functions': [
+                {'function': name, 'calls': calls, 'own_time': own, 'cumulative_time': cumulative}
+                for own, calls, cumulative, name in functions[:self.top]
+            ]
+        }
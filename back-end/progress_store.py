@@ -0,0 +1,163 @@
+"""
+Live job progress kept in Redis instead of the database
+
+Workers bump atomic counters in one Redis hash per job (HINCRBY on the job
+total and on a per-shard field), so progress reports cost a single pipelined
+round trip and shards of the same job never overwrite each other. SQL is only
+written on state transitions (started, cracked, finished, failed); readers
+overlay the live counters on the stored row.
+
+PROGRESS_BACKEND=memory swaps Redis for an in-process stand-in, for tests
+and single-process runs.
+"""
+
+import threading
+import time
+
+from config import Config
+
+def progress_key(job_id):
+    """Redis hash holding a job's live counters"""
+    return f'progress:{job_id}'
+
+class MemoryRedis:
+    """Thread-safe in-process stand-in for the Redis hash commands used here"""
+    
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+    
+    def hincrby(self, key, field, amount=1):
+        with self._lock:
+            values = self._data.setdefault(key, {})
+            values[field] = str(int(values.get(field, 0)) + amount)
+            return int(values[field])
+    
+    def hincrbyfloat(self, key, field, amount=1.0):
+        with self._lock:
+            values = self._data.setdefault(key, {})
+            values[field] = repr(float(values.get(field, 0)) + amount)
+            return float(values[field])
+    
+    def hsetnx(self, key, field, value):
+        with self._lock:
+            values = self._data.setdefault(key, {})
+            if field in values:
+                return 0
+            values[field] = str(value)
+            return 1
+    
+    def hset(self, key, field=None, value=None, mapping=None):
+        with self._lock:
+            values = self._data.setdefault(key, {})
+            if field is not None:
+                values[field] = str(value)
+            for name, item in (mapping or {}).items():
+                values[name] = str(item)
+    
+    def hgetall(self, key):
+        with self._lock:
+            return dict(self._data.get(key, {}))
+    
+    def expire(self, key, seconds):
+        # Entries are removed explicitly with delete()
+        return key in self._data
+    
+    def delete(self, *keys):
+        with self._lock:
+            return sum(1 for key in keys if self._data.pop(key, None) is not None)
+    
+    def pipeline(self, transaction=True):
+        return MemoryPipeline(self)
+
+class MemoryPipeline:
+    """Queues commands and runs them on execute(), like a redis-py pipeline"""
+    
+    def __init__(self, client):
+        self._client = client
+        self._commands = []
+    
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+        
+        def queue(*args, **kwargs):
+            self._commands.append((method, args, kwargs))
+            return self
+        return queue
+    
+    def execute(self):
+        results = [method(*args, **kwargs) for method, args, kwargs in self._commands]
+        self._commands = []
+        return results
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """Shared Redis (or in-memory) client for progress counters"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                if Config.PROGRESS_BACKEND == 'memory':
+                    _client = MemoryRedis()
+                else:
+                    import redis
+                    _client = redis.Redis.from_url(Config.PROGRESS_REDIS_URL, decode_responses=True)
+    return _client
+
+def incr_progress(job_id, attempts, shard=0, started=None):
+    """Add `attempts` to a job's live counters (`started` is the worker's start time)"""
+    now = time.time()
+    key = progress_key(job_id)
+    
+    pipe = get_client().pipeline(transaction=False)
+    pipe.hincrby(key, 'attempts', attempts)
+    pipe.hincrby(key, f'shard:{shard}', attempts)
+    pipe.hsetnx(key, 'started', started or now)
+    pipe.hset(key, 'updated', now)
+    pipe.expire(key, Config.PROGRESS_TTL)
+    return pipe.execute()[0]
+
+def get_progress(job_id):
+    """Live counters for a job, or None if it has not reported yet"""
+    values = get_client().hgetall(progress_key(job_id))
+    if not values:
+        return None
+    
+    attempts = int(values.get('attempts', 0))
+    elapsed = float(values['updated']) - float(values['started'])
+    return {
+        'current_attempt': attempts,
+        'time_elapsed': elapsed,
+        'speed': attempts / elapsed if elapsed > 0 else 0,
+        'shards': {
+            name.split(':', 1)[1]: int(value)
+            for name, value in values.items() if name.startswith('shard:')
+        }
+    }
+
+def clear_progress(job_id):
+    """Drop a job's live counters once its final state is in the database"""
+    get_client().delete(progress_key(job_id))
+
+def merge_progress(job_data):
+    """Overlay live counters on a serialized running job"""
+    if job_data.get('status') != 'running':
+        return job_data
+    
+    try:
+        live = get_progress(job_data['job_id'])
+    except Exception:
+        # Progress is best-effort; fall back to the stored values
+        return job_data
+    
+    if live:
+        total = job_data.get('total_attempts')
+        job_data.update(
+            current_attempt=live['current_attempt'],
+            time_elapsed=live['time_elapsed'],
+            speed=live['speed'],
+            progress=min(live['current_attempt'] / total * 100, 99.9) if total else job_data.get('progress')
+        )
+    return job_data
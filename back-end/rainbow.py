@@ -0,0 +1,221 @@
+"""
+Rainbow tables for short brute-force keyspaces
+
+A chain starts at a keyspace index, hashes the candidate and reduces the
+digest back into the keyspace, `chain_length` times. Only (end, start) pairs
+are stored, sorted by end. A lookup rebuilds the tail of a chain from the
+target digest for every possible column and only regenerates the chains whose
+end matches, trading table size against lookup time.
+
+Tables are bound to a (hash type, charset preset, max length) keyspace and
+stored in Config.RAINBOW_TABLE_DIR.
+
+Build from the command line:
+    python rainbow.py md5 1 5 --chain-length 1000 --chains 200000
+"""
+
+import argparse
+import glob
+import os
+import struct
+
+from config import Config
+from hash_utils import FAST_HASH_TYPES, hash_digest
+from keyspace import CHARSETS, candidate_at, keyspace_size
+
+MAGIC = b'PCRT'
+VERSION = 1
+
+# magic, version, hash type, charset option, max length, table index, chain length, chain count
+HEADER = struct.Struct('<4sH16s4sHHIQ')
+
+# end index, start index (big-endian so raw bytes sort by end)
+CHAIN = struct.Struct('>QQ')
+
+# Spreads the reduction functions of tables built for the same keyspace
+TABLE_SALT = 0x9E3779B97F4A7C15
+
+def table_path(hash_type, charset_option, max_length, table_index=0):
+    """Location of a rainbow table file"""
+    name = f'{hash_type}_cs{charset_option}_len{max_length}_{table_index}.rt'
+    return os.path.join(Config.RAINBOW_TABLE_DIR, name)
+
+def reduce_digest(digest, column, keyspace, table_index=0):
+    """Map a digest back into the keyspace (distinct per column and table)"""
+    value = int.from_bytes(digest[:8], 'little')
+    return (value + column + table_index * TABLE_SALT) % keyspace
+
+def walk_chain(index, hash_type, charset, max_length, keyspace, first_column, last_column, table_index=0):
+    """Advance a chain from first_column up to (not including) last_column"""
+    for column in range(first_column, last_column):
+        digest = hash_digest(candidate_at(index, charset, max_length), hash_type)
+        index = reduce_digest(digest, column, keyspace, table_index)
+    return index
+
+def build_rainbow_table(hash_type, charset_option, max_length, chain_length=None,
+                        chain_count=None, table_index=0):
+    """Generate and store a rainbow table for a brute-force keyspace"""
+    if hash_type not in FAST_HASH_TYPES:
+        raise ValueError(f'Rainbow tables only support unsalted hashes: {", ".join(FAST_HASH_TYPES)}')
+    
+    if charset_option not in CHARSETS:
+        raise ValueError(f'Unknown charset option: {charset_option}')
+    
+    if not 1 <= max_length <= Config.MAX_BRUTEFORCE_LENGTH:
+        raise ValueError(f'Max length must be between 1 and {Config.MAX_BRUTEFORCE_LENGTH}')
+    
+    if hash_digest('', hash_type) is None:
+        raise ValueError(f'{hash_type} is not available on this host')
+    
+    charset = CHARSETS[charset_option]
+    keyspace = keyspace_size(charset, max_length)
+    chain_length = chain_length or Config.RAINBOW_CHAIN_LENGTH
+    # Default covers the keyspace about once (m * t ~ N)
+    chain_count = min(chain_count or max(keyspace // chain_length, 1), keyspace)
+    
+    # Starting points spread evenly over the keyspace
+    step = keyspace / chain_count
+    chains = {}
+    for i in range(chain_count):
+        start = int(i * step)
+        end = walk_chain(start, hash_type, charset, max_length, keyspace, 0, chain_length, table_index)
+        # Merged chains share an end; keep one (perfect table)
+        chains.setdefault(end, start)
+    
+    path = table_path(hash_type, charset_option, max_length, table_index)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(
+            MAGIC, VERSION, hash_type.encode(), charset_option.encode(),
+            max_length, table_index, chain_length, len(chains)
+        ))
+        for end in sorted(chains):
+            f.write(CHAIN.pack(end, chains[end]))
+    
+    os.replace(tmp_path, path)
+    
+    return {
+        'hash_type': hash_type,
+        'charset': charset_option,
+        'max_length': max_length,
+        'table_index': table_index,
+        'chain_length': chain_length,
+        'chains': len(chains),
+        'keyspace': keyspace,
+        'path': path
+    }
+
+def read_table_info(path):
+    """Parse a table header, or None if the file is not a rainbow table"""
+    try:
+        with open(path, 'rb') as f:
+            fields = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return None
+    
+    magic, version, hash_type, charset_option, max_length, table_index, chain_length, chain_count = fields
+    if magic != MAGIC or version != VERSION:
+        return None
+    
+    return {
+        'hash_type': hash_type.rstrip(b'\0').decode(),
+        'charset': charset_option.rstrip(b'\0').decode(),
+        'max_length': max_length,
+        'table_index': table_index,
+        'chain_length': chain_length,
+        'chains': chain_count,
+        'path': path
+    }
+
+def list_rainbow_tables():
+    """All rainbow tables in the table directory"""
+    tables = []
+    for path in sorted(glob.glob(os.path.join(Config.RAINBOW_TABLE_DIR, '*.rt'))):
+        info = read_table_info(path)
+        if info:
+            tables.append(info)
+    return tables
+
+def _find_start(f, chain_count, end):
+    """Binary search the sorted chain ends on disk"""
+    low, high = 0, chain_count
+    while low < high:
+        mid = (low + high) // 2
+        f.seek(HEADER.size + mid * CHAIN.size)
+        mid_end, start = CHAIN.unpack(f.read(CHAIN.size))
+        if mid_end < end:
+            low = mid + 1
+        elif mid_end > end:
+            high = mid
+        else:
+            return start
+    return None
+
+def lookup_table(info, target):
+    """Search one table for a raw target digest"""
+    hash_type = info['hash_type']
+    charset = CHARSETS[info['charset']]
+    max_length = info['max_length']
+    table_index = info['table_index']
+    chain_length = info['chain_length']
+    keyspace = keyspace_size(charset, max_length)
+    
+    with open(info['path'], 'rb') as f:
+        # Assume the target sits at each column, nearest the end first
+        for column in range(chain_length - 1, -1, -1):
+            index = reduce_digest(target, column, keyspace, table_index)
+            end = walk_chain(index, hash_type, charset, max_length, keyspace,
+                             column + 1, chain_length, table_index)
+            
+            start = _find_start(f, info['chains'], end)
+            if start is None:
+                continue
+            
+            # Regenerate the chain up to that column (may be a false alarm)
+            index = walk_chain(start, hash_type, charset, max_length, keyspace, 0, column, table_index)
+            password = candidate_at(index, charset, max_length)
+            if hash_digest(password, hash_type) == target:
+                return password
+    
+    return None
+
+def rainbow_lookup(target_hash, hash_type, charset_option, max_length):
+    """Resolve a hash from any table covering the job's keyspace"""
+    if hash_type not in FAST_HASH_TYPES:
+        return None
+    
+    try:
+        target = bytes.fromhex(target_hash.strip())
+    except ValueError:
+        return None
+    
+    for info in list_rainbow_tables():
+        # A table for a longer max length is a superset of the job keyspace
+        if info['hash_type'] != hash_type or info['charset'] != charset_option:
+            continue
+        if info['max_length'] < max_length:
+            continue
+        
+        password = lookup_table(info, target)
+        if password is not None and len(password) <= max_length:
+            return password
+    
+    return None
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build a rainbow table')
+    parser.add_argument('hash_type', choices=FAST_HASH_TYPES)
+    parser.add_argument('charset', choices=sorted(CHARSETS))
+    parser.add_argument('max_length', type=int)
+    parser.add_argument('--chain-length', type=int, default=None)
+    parser.add_argument('--chains', type=int, default=None)
+    parser.add_argument('--table-index', type=int, default=0)
+    args = parser.parse_args()
+    
+    result = build_rainbow_table(
+        args.hash_type, args.charset, args.max_length,
+        args.chain_length, args.chains, args.table_index
+    )
+    print(f"{result['chains']} chains x {result['chain_length']} -> {result['path']}")
@@ -0,0 +1,178 @@
+"""
+Append-only log of saved cracking results (SQLite)
+
+Replaces rewriting crack_results.json on every save. Each result is a single
+INSERT, readers page through the log newest first, and lookups by hash or time
+range use indexes. WAL mode lets readers run while another process appends.
+The first time the store is opened, any existing crack_results.json is
+imported into it, once:
+
+    python results_store.py import [crack_results.json]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+from config import Config
+
+MAX_PAGE_SIZE = 500
+DEFAULT_PAGE_SIZE = 100
+
+FIELDS = ('timestamp', 'mode', 'hash_type', 'target_hash', 'success',
+          'password', 'attempts', 'time', 'speed')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    mode TEXT,
+    hash_type TEXT,
+    target_hash TEXT,
+    success INTEGER,
+    password TEXT,
+    attempts INTEGER,
+    time REAL,
+    speed REAL
+);
+CREATE INDEX IF NOT EXISTS ix_results_target_hash ON results (target_hash, id);
+CREATE INDEX IF NOT EXISTS ix_results_timestamp ON results (timestamp, id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_local = threading.local()
+
+def _row_to_dict(row):
+    result = dict(zip(('id',) + FIELDS, row))
+    if result['success'] is not None:
+        result['success'] = bool(result['success'])
+    return result
+
+class ResultsStore:
+    """One SQLite connection per thread on a shared results database"""
+    
+    def __init__(self, path):
+        self.path = path
+        self._ready = False
+        self._lock = threading.Lock()
+    
+    def _connect(self):
+        connections = getattr(_local, 'connections', None)
+        if connections is None:
+            connections = _local.connections = {}
+        
+        conn = connections.get(self.path)
+        if conn is None:
+            # Autocommit; writes open their own short transactions
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            connections[self.path] = conn
+        return conn
+    
+    @property
+    def conn(self):
+        conn = self._connect()
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    conn.executescript(SCHEMA)
+                    self._ready = True
+        return conn
+    
+    def append(self, entry):
+        """Add one result; returns its id"""
+        values = [entry.get(field) for field in FIELDS]
+        cursor = self.conn.execute(
+            f'INSERT INTO results ({", ".join(FIELDS)}) VALUES ({", ".join("?" * len(FIELDS))})',
+            values
+        )
+        return cursor.lastrowid
+    
+    def page(self, limit=DEFAULT_PAGE_SIZE, before=None, target_hash=None, since=None, until=None):
+        """Results newest first; pass the returned next_cursor as `before` for the next page"""
+        clauses, params = [], []
+        if target_hash:
+            clauses.append('target_hash = ?')
+            params.append(target_hash)
+        if since:
+            clauses.append('timestamp >= ?')
+            params.append(since)
+        if until:
+            clauses.append('timestamp < ?')
+            params.append(until)
+        if before is not None:
+            clauses.append('id < ?')
+            params.append(before)
+        
+        where = f'WHERE {" AND ".join(clauses)}' if clauses else ''
+        rows = self.conn.execute(
+            f'SELECT id, {", ".join(FIELDS)} FROM results {where} ORDER BY id DESC LIMIT ?',
+            params + [limit + 1]
+        ).fetchall()
+        
+        results = [_row_to_dict(row) for row in rows[:limit]]
+        return {
+            'results': results,
+            'count': len(results),
+            'next_cursor': results[-1]['id'] if len(rows) > limit else None
+        }
+    
+    def import_json(self, json_path):
+        """Copy a legacy crack_results.json into the log once; returns rows imported"""
+        if not os.path.exists(json_path):
+            return 0
+        
+        key = f'imported:{os.path.abspath(json_path)}'
+        conn = self.conn
+        
+        # IMMEDIATE takes the write lock, so concurrent starts import only once
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if conn.execute('SELECT 1 FROM meta WHERE key = ?', (key,)).fetchone():
+                conn.execute('ROLLBACK')
+                return 0
+            
+            with open(json_path, 'r') as f:
+                entries = json.load(f)
+            
+            conn.executemany(
+                f'INSERT INTO results ({", ".join(FIELDS)}) VALUES ({", ".join("?" * len(FIELDS))})',
+                ([entry.get(field) for field in FIELDS] for entry in entries)
+            )
+            conn.execute('INSERT INTO meta (key, value) VALUES (?, ?)', (key, str(len(entries))))
+            conn.execute('COMMIT')
+            return len(entries)
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    """Process-wide store, importing the legacy JSON file on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = ResultsStore(Config.RESULTS_DB_PATH)
+                imported = store.import_json(Config.RESULTS_JSON_PATH)
+                if imported:
+                    print(f'Imported {imported} results from {Config.RESULTS_JSON_PATH}')
+                _store = store
+    return _store
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'import':
+        print('Usage: python results_store.py import [crack_results.json]')
+        sys.exit(1)
+    
+    json_path = sys.argv[2] if len(sys.argv) > 2 else Config.RESULTS_JSON_PATH
+    count = ResultsStore(Config.RESULTS_DB_PATH).import_json(json_path)
+    print(f'Imported {count} results into {Config.RESULTS_DB_PATH}')
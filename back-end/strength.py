@@ -0,0 +1,335 @@
+"""
+Password strength from the cost of actually cracking it
+
+A password's guess rank is the number of candidates an attack tries before
+reaching it. The rank is the lower of two estimates:
+
+    wordlist   its position in a registered wordlist, found through a
+               precomputed membership index (sorted 64-bit BLAKE2b keys)
+    markov     its index in the Markov-ordered brute force (markov.py) over
+               the smallest charset preset that covers it; without a trained
+               model this is the plain brute-force order
+
+Time to crack is the rank divided by hashes/sec, measured on this host with
+the same verifiers the cracking jobs use. Rates, Markov orderings and open
+indexes are computed once per process, so scoring a batch of thousands of
+passwords costs a few index probes and one Markov walk per password.
+
+Build a wordlist's membership index ahead of time:
+    python strength.py wordlist.txt
+"""
+
+import hashlib
+import heapq
+import mmap
+import os
+import string
+import struct
+import sys
+import threading
+import time
+from functools import lru_cache
+
+from config import Config
+from hash_utils import (
+    AMBIGUOUS_HASH_TYPE, CRYPT_HANDLERS, FAST_HASH_TYPES, hash_password, job_hash_types, make_verifier
+)
+from keyspace import CHARSETS, keyspace_size
+from lookup_tables import iter_wordlist_offsets, write_sorted_run, read_sorted_run, wordlist_fingerprint
+from markov import MAX_POSITIONS, MarkovGenerator, load_markov_model, model_path
+
+MAGIC = b'PCMI'
+VERSION = 1
+
+# magic, version, record count, wordlist size, wordlist mtime (ns)
+HEADER = struct.Struct('<4sHQQQ')
+
+# 64-bit key and rank, big-endian so raw bytes sort by (key, rank)
+RECORD = struct.Struct('>8sQ')
+
+SORT_CHUNK_RECORDS = 1_000_000
+
+# Thresholds (seconds) for the strength labels, weakest first
+STRENGTH_LEVELS = [
+    (1, 'Very Weak'),
+    (60, 'Weak'),
+    (3600, 'Moderate'),
+    (86400, 'Good'),
+    (31536000, 'Strong'),
+]
+
+def member_key(word):
+    return hashlib.blake2b(word.encode('utf-8', errors='ignore'), digest_size=8).digest()
+
+def index_path(wordlist_path):
+    """Location of the membership index of a wordlist"""
+    path_id = hashlib.sha1(os.path.abspath(wordlist_path).encode()).hexdigest()[:8]
+    return os.path.join(Config.LOOKUP_TABLE_DIR, f'{os.path.basename(wordlist_path)}.{path_id}.members')
+
+def build_membership_index(wordlist_path):
+    """Build (or rebuild) the sorted key -> rank index of a wordlist"""
+    if not os.path.exists(wordlist_path):
+        raise FileNotFoundError(wordlist_path)
+    
+    size, mtime = wordlist_fingerprint(wordlist_path)
+    
+    runs = []
+    records = []
+    for rank, (_, word) in enumerate(iter_wordlist_offsets(wordlist_path)):
+        records.append(RECORD.pack(member_key(word), rank))
+        if len(records) >= SORT_CHUNK_RECORDS:
+            runs.append(write_sorted_run(records))
+            records = []
+    if records or not runs:
+        runs.append(write_sorted_run(records))
+    
+    path = index_path(wordlist_path)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    count = 0
+    
+    try:
+        with open(tmp_path, 'wb') as out:
+            out.write(HEADER.pack(MAGIC, VERSION, 0, size, mtime))
+            
+            previous = None
+            for record in heapq.merge(*[read_sorted_run(run, RECORD.size) for run in runs]):
+                key = record[:8]
+                # Duplicates keep their lowest rank
+                if key == previous:
+                    continue
+                previous = key
+                out.write(record)
+                count += 1
+            
+            out.seek(0)
+            out.write(HEADER.pack(MAGIC, VERSION, count, size, mtime))
+        
+        os.replace(tmp_path, path)
+    finally:
+        for run in runs:
+            run.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    
+    return {'wordlist': wordlist_path, 'records': count, 'path': path}
+
+class MembershipIndex:
+    """Memory-mapped index answering word -> rank with a binary search"""
+    
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.header = HEADER.unpack(self.map[:HEADER.size])
+        self.count = self.header[2]
+    
+    def rank(self, word):
+        """Position of a word in the wordlist, or None if it is not listed"""
+        key = member_key(word)
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            start = HEADER.size + mid * RECORD.size
+            record_key, rank = RECORD.unpack(self.map[start:start + RECORD.size])
+            if record_key < key:
+                low = mid + 1
+            elif record_key > key:
+                high = mid
+            else:
+                return rank
+        return None
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def open_membership_index(wordlist_path):
+    """Current index of a wordlist, or None if it is missing or older than the file"""
+    path = index_path(wordlist_path)
+    try:
+        fingerprint = wordlist_fingerprint(wordlist_path)
+        index_mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    
+    cache_key = (path, fingerprint, index_mtime)
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is not None and index[0] == cache_key:
+            return index[1]
+    
+    membership = MembershipIndex(path)
+    magic, version, _, size, mtime = membership.header
+    if magic != MAGIC or version != VERSION or (size, mtime) != fingerprint:
+        return None
+    
+    with _indexes_lock:
+        _indexes[path] = (cache_key, membership)
+    return membership
+
+@lru_cache(maxsize=None)
+def measure_rate(hash_type):
+    """Hashes/sec of the cracking verifier for a hash type on this host, or None"""
+    if hash_type in CRYPT_HANDLERS:
+        target = CRYPT_HANDLERS[hash_type].hash('benchmark')
+    else:
+        target = hash_password('benchmark', hash_type)
+    if not target:
+        return None
+    
+    verify = make_verifier(target, hash_type)
+    attempts = 0
+    start = time.perf_counter()
+    # At least one verification, even for slow hashes
+    while True:
+        verify(f'candidate{attempts}')
+        attempts += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= Config.STRENGTH_BENCH_SECONDS:
+            return attempts / elapsed
+
+def measure_target_rate(hash_string, hash_type):
+    """Candidates/sec against one target; ambiguous targets pay for every plausible type"""
+    if hash_type != AMBIGUOUS_HASH_TYPE:
+        return measure_rate(hash_type)
+    
+    rates = [measure_rate(candidate_type) for candidate_type in job_hash_types(hash_string, hash_type)]
+    rates = [rate for rate in rates if rate]
+    return 1 / sum(1 / rate for rate in rates) if rates else None
+
+def charset_for(password):
+    """Smallest brute-force charset preset containing every character"""
+    chars = set(password)
+    for option in sorted(CHARSETS, key=lambda option: len(CHARSETS[option])):
+        if chars <= set(CHARSETS[option]):
+            return CHARSETS[option]
+    widest = max(CHARSETS.values(), key=len)
+    return widest + ''.join(sorted(chars - set(widest)))
+
+@lru_cache(maxsize=32)
+def _generator(model_name, model_mtime, charset):
+    model = load_markov_model(model_name) if model_name else None
+    if model is None:
+        # No statistics: every ordering is the charset itself (plain brute force)
+        model = {'positions': [{} for _ in range(MAX_POSITIONS)]}
+    return MarkovGenerator(model, charset, MAX_POSITIONS)
+
+def markov_rank(password, model_name=None):
+    """Index of a password in the Markov-ordered brute force"""
+    try:
+        model_mtime = os.stat(model_path(model_name)).st_mtime_ns if model_name else None
+    except OSError:
+        model_name = model_mtime = None
+    charset = charset_for(password)
+    rank = _generator(model_name, model_mtime, charset).index_of(password)
+    
+    # Longer than the modelled positions: every candidate up to its length comes first
+    return keyspace_size(charset, len(password)) if rank is None else rank
+
+def format_duration(seconds):
+    if seconds < 1:
+        return 'Instantly'
+    if seconds < 60:
+        return f'{seconds:.2f} seconds'
+    if seconds < 3600:
+        return f'{seconds/60:.2f} minutes'
+    if seconds < 86400:
+        return f'{seconds/3600:.2f} hours'
+    if seconds < 31536000:
+        return f'{seconds/86400:.2f} days'
+    years = seconds / 31536000
+    return f'{years:.2e} years' if years > 1000000 else f'{years:.2f} years'
+
+def rate_strength(seconds):
+    """(label, score 1-6) for a time to crack"""
+    for score, (limit, label) in enumerate(STRENGTH_LEVELS, start=1):
+        if seconds < limit:
+            return label, score
+    return 'Very Strong', len(STRENGTH_LEVELS) + 1
+
+class StrengthAnalyzer:
+    """Scores passwords against a fixed set of wordlists, model and hash types"""
+    
+    def __init__(self, wordlists=(), model_name=None, hash_types=('md5',)):
+        unsupported = [t for t in hash_types if t not in FAST_HASH_TYPES and t not in CRYPT_HANDLERS]
+        if unsupported:
+            raise ValueError(f'Unsupported hash types: {", ".join(map(str, unsupported))}')
+        
+        # Unknown models fall back to the plain brute-force order
+        self.model_name = model_name if model_name and load_markov_model(model_name) else None
+        self.hash_types = list(hash_types)
+        self.rates = {hash_type: measure_rate(hash_type) for hash_type in self.hash_types}
+        
+        # (name, index) for every wordlist with a current membership index
+        self.indexes = []
+        self.unindexed = []
+        for name, wordlist_path in wordlists:
+            index = open_membership_index(wordlist_path)
+            if index is None:
+                self.unindexed.append(name)
+            else:
+                self.indexes.append((name, index))
+    
+    def analyze(self, password):
+        has_lower = any(c.islower() for c in password)
+        has_upper = any(c.isupper() for c in password)
+        has_digit = any(c.isdigit() for c in password)
+        has_symbol = any(c in string.punctuation for c in password)
+        
+        charset_size = 26 * has_lower + 26 * has_upper + 10 * has_digit + 32 * has_symbol
+        
+        wordlist = None
+        for name, index in self.indexes:
+            rank = index.rank(password)
+            if rank is not None and (wordlist is None or rank < wordlist['rank']):
+                wordlist = {'name': name, 'rank': rank}
+        
+        brute_force_rank = markov_rank(password, self.model_name)
+        
+        # Ranks count the candidates tried before; the password itself is one more guess
+        guesses, source = brute_force_rank + 1, 'markov' if self.model_name else 'bruteforce'
+        if wordlist and wordlist['rank'] < brute_force_rank:
+            guesses, source = wordlist['rank'] + 1, 'wordlist'
+        
+        crack_times = {}
+        for hash_type, rate in self.rates.items():
+            if rate:
+                seconds = guesses / rate
+                crack_times[hash_type] = {'seconds': seconds, 'time_to_crack': format_duration(seconds)}
+        
+        # Labels follow the first hash type the host can compute
+        seconds = next(iter(crack_times.values()), {'seconds': 0})['seconds']
+        strength, score = rate_strength(seconds)
+        
+        return {
+            'length': len(password),
+            'charset_size': charset_size,
+            'combinations': charset_size ** len(password),
+            'guesses': guesses,
+            'guess_source': source,
+            'wordlist': wordlist,
+            'markov_rank': brute_force_rank,
+            'crack_times': crack_times,
+            'time_to_crack': format_duration(seconds),
+            'strength': strength,
+            'score': score,
+            'has_lower': has_lower,
+            'has_upper': has_upper,
+            'has_digit': has_digit,
+            'has_symbol': has_symbol
+        }
+    
+    def analyze_batch(self, passwords):
+        return {
+            'results': [self.analyze(password) for password in passwords],
+            'rates': self.rates,
+            'unindexed_wordlists': self.unindexed
+        }
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print('Usage: python strength.py <wordlist> [wordlist ...]')
+        sys.exit(1)
+    
+    for wordlist_path in sys.argv[1:]:
+        result = build_membership_index(wordlist_path)
+        print(f"{wordlist_path}: {result['records']} words -> {result['path']}")
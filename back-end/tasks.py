@@ -1,145 +1,363 @@
 import time
-import string
-import itertools
-import os
+import json
+import functools
+from collections import namedtuple
 from datetime import datetime
 from celery_app import celery
-from hash_utils import verify_password, hash_password
+from hash_utils import make_verifier, job_hash_types, matching_hash_type
+from progress_store import incr_progress, clear_progress, merge_progress
+import metrics
+from events import emit_job_update
+from worker_cache import get_verifier
 from config import Config
+import engine
 
-def load_wordlist(filename):
-    """Load passwords from text file"""
-    if not os.path.exists(filename):
-        return []
+def _engine(job):
+    return job.attack_mode.value if job.attack_mode else 'unknown'
+
+def _observe_start(job):
+    """Count a started job and how long it waited in the queue"""
+    metrics.inc('cracker_jobs_started_total', engine=_engine(job))
+    if job.created_at and job.started_at:
+        metrics.observe('cracker_job_wait_seconds',
+                        (job.started_at - job.created_at).total_seconds(), engine=_engine(job))
+
+def _record_progress(job, attempts, start_time):
+    """Add attempts to the job's live progress and the throughput counters"""
+    incr_progress(job.job_id, attempts, started=start_time)
+    metrics.inc('cracker_hashes_total', attempts, hash_type=job.hash_type, engine=_engine(job))
+
+def _finish_progress(job, unreported):
+    """Count attempts since the last report, then drop the live counters"""
+    if unreported:
+        metrics.inc('cracker_hashes_total', unreported, hash_type=job.hash_type, engine=_engine(job))
+    clear_progress(job.job_id)
+    metrics.flush()
+
+def profiled(task_func):
+    """Run a cracking task under cProfile when its job was created with profiling on"""
+    @functools.wraps(task_func)
+    def wrapper(self, job_id, *args, **kwargs):
+        from models import db, CrackJob
+        from profiling import JobProfiler
+        
+        job = CrackJob.query.filter_by(job_id=job_id).first()
+        if not job or not job.profile_enabled:
+            return task_func(self, job_id, *args, **kwargs)
+        
+        with JobProfiler() as profiler:
+            result = task_func(self, job_id, *args, **kwargs)
+        
+        job = CrackJob.query.filter_by(job_id=job_id).first()
+        job.profile_data = json.dumps(profiler.report())
+        db.session.commit()
+        return result
+    return wrapper
+
+RunPlan = namedtuple('RunPlan', 'start end deadline check_every')
+
+def plan_run(job, keyspace, start=0, max_attempts=Config.MAX_ATTEMPTS_PER_JOB):
+    """Slice of the keyspace this run covers and, for time-budgeted jobs, its deadline"""
+    from models import db
+    
+    # Resumed jobs continue where the previous run stopped
+    start = min(max(start, job.searched_until or 0), keyspace)
+    job.keyspace = keyspace
+    
+    if job.time_budget:
+        from strength import measure_target_rate
+        
+        # Translate the remaining wall-clock budget into candidates at this host's rate
+        remaining = max(job.time_budget - (job.time_elapsed or 0), 0)
+        rate = measure_target_rate(job.target_hash, job.hash_type) or 1
+        end = min(keyspace, start + int(rate * remaining))
+        plan = RunPlan(start, end, time.time() + remaining,
+                       max(1, int(rate * Config.BUDGET_CHECK_INTERVAL)))
+        job.total_attempts = end - start
+    else:
+        plan = RunPlan(start, keyspace, None, None)
+        job.total_attempts = min(keyspace - start, max_attempts) if max_attempts else keyspace - start
+    
+    db.session.commit()
+    return plan
+
+class JobProgress:
+    """Engine progress sink: live counters, socket updates and Celery task state"""
+    
+    def __init__(self, task, job, total):
+        self.task = task
+        self.job = job
+        self.total = total
+        self.reported = 0
+        self.start_time = time.time()
+    
+    def __call__(self, attempts, elapsed):
+        _record_progress(self.job, attempts - self.reported, self.start_time)
+        self.reported = attempts
+        progress = min((attempts / self.total) * 100, 99.9) if self.total else 0
+        
+        emit_job_update(merge_progress(self.job.to_dict()))
+        
+        self.task.update_state(state='PROGRESS', meta=self.meta(attempts, progress))
+    
+    def meta(self, attempts, progress):
+        return {
+            'current': attempts,
+            'total': self.total,
+            'progress': progress
+        }
+
+class TargetProgress(JobProgress):
+    """Progress sink of multi-target jobs; cracked targets are flushed with each report"""
+    
+    def __init__(self, task, job, total):
+        super().__init__(task, job, total)
+        self.found = []
+    
+    def flush(self):
+        """Record cracked targets in one executemany"""
+        from models import db, bulk_mark_cracked
+        
+        if self.found:
+            bulk_mark_cracked(db.session, self.found)
+            self.job.cracked_count = (self.job.cracked_count or 0) + len(self.found)
+            self.found.clear()
+            db.session.commit()
+    
+    def __call__(self, attempts, elapsed):
+        self.flush()
+        super().__call__(attempts, elapsed)
+    
+    def meta(self, attempts, progress):
+        return dict(super().meta(attempts, progress), cracked=self.job.cracked_count)
+
+def _finish_run(job, result, progress, plan=None, max_attempts=None):
+    """Store a finished search on the job and build the task result"""
+    from models import db, JobStatus
+    
+    # Resumed runs add to the attempts and time already spent
+    job.status = JobStatus.COMPLETED
+    job.success = result.password is not None
+    job.cracked_password = result.password
+    if result.password is not None:
+        job.matched_hash_type = matching_hash_type(result.password, job.target_hash, job.hash_type)
+    job.current_attempt = (job.current_attempt or 0) + result.attempts
+    job.searched_until = (plan.start if plan else 0) + result.attempts
+    job.time_elapsed = (job.time_elapsed or 0) + result.elapsed
+    job.speed = result.speed
+    job.progress = 100.0
+    job.completed_at = datetime.utcnow()
+    
+    summary = result.to_dict()
+    
+    if result.stopped == engine.LIMIT:
+        job.error_message = f'Exceeded maximum attempts ({max_attempts})'
+        summary['message'] = job.error_message
+    elif (result.stopped != engine.FOUND and plan and plan.deadline is not None
+          and job.keyspace and job.searched_until < job.keyspace):
+        # Not found in this run's budget; everything before searched_until was tried
+        job.error_message = (f'Time budget exhausted: searched {job.searched_until} of '
+                             f'{job.keyspace} candidates')
+        summary['message'] = job.error_message
+        summary['searched_until'] = job.searched_until
+    
+    db.session.commit()
+    _finish_progress(job, result.attempts - progress.reported)
+    
+    emit_job_update(job.to_dict())
+    
+    return summary
+
+def _fail_run(job, error, progress, plan=None):
+    """Mark a job failed mid-search; the reported prefix was searched"""
+    from models import db, JobStatus
+    
+    job.status = JobStatus.FAILED
+    job.error_message = str(error)
+    job.current_attempt = (job.current_attempt or 0) + progress.reported
+    job.searched_until = (plan.start if plan else 0) + progress.reported
+    job.completed_at = datetime.utcnow()
+    db.session.commit()
+    _finish_progress(job, 0)
+    
+    emit_job_update(job.to_dict())
+    
+    return {'error': str(error)}
+
+def _limits(plan, max_attempts):
+    # The time budget replaces the attempt cap
+    if plan and plan.deadline is not None:
+        return None, plan.deadline, plan.check_every
+    return max_attempts, None, None
+
+def run_candidates(task, job, candidates, total, target_hash, hash_type, progress_every=5000,
+                   plan=None, max_attempts=Config.MAX_ATTEMPTS_PER_JOB):
+    """Verify a candidate stream against the target, reporting progress and the final result"""
+    max_attempts, deadline, check_every = _limits(plan, max_attempts)
+    progress = JobProgress(task, job, total)
     
     try:
-        with open(filename, 'r', encoding='utf-8', errors='ignore') as f:
-            return [line.strip() for line in f if line.strip()]
-    except:
-        return []
+        result = engine.search(candidates, get_verifier(target_hash, hash_type), progress,
+                               max_attempts, deadline, check_every, progress_every)
+    except Exception as e:
+        return _fail_run(job, e, progress, plan)
+    
+    return _finish_run(job, result, progress, plan, max_attempts)
+
+def run_spec(task, job, spec, plan, source=None, progress_every=5000,
+             max_attempts=Config.MAX_ATTEMPTS_PER_JOB):
+    """Search a planned slice of an index-addressable attack on the engine backend"""
+    max_attempts, deadline, check_every = _limits(plan, max_attempts)
+    progress = JobProgress(task, job, plan.end - plan.start)
+    
+    try:
+        result = engine.worker_backend().search(spec, plan.start, plan.end, progress, max_attempts,
+                                                deadline, check_every, progress_every, source)
+    except Exception as e:
+        return _fail_run(job, e, progress, plan)
+    
+    return _finish_run(job, result, progress, plan, max_attempts)
 
 @celery.task(bind=True, name='tasks.crack_dictionary')
-def crack_dictionary_task(self, job_id, target_hash, hash_type, wordlist_path):
+@profiled
+def crack_dictionary_task(self, job_id, target_hash, hash_type, wordlist_path, policy=None,
+                          bucketed=False):
     """Dictionary attack task with progress updates"""
-    from app import socketio, db
-    from models import CrackJob, JobStatus
-    
-    # Update job status
-    job = CrackJob.query.filter_by(job_id=job_id).first()
+    job = _start_job(job_id)
     if not job:
         return {'error': 'Job not found'}
     
-    job.status = JobStatus.RUNNING
-    job.started_at = datetime.utcnow()
-    db.session.commit()
-    
-    # Load wordlist
-    wordlist = load_wordlist(wordlist_path)
-    if not wordlist:
-        job.status = JobStatus.FAILED
-        job.error_message = 'Wordlist not found or empty'
-        db.session.commit()
-        return {'error': 'Wordlist not found'}
+    # The wordlist is served from the worker cache when it ran recently
+    spec = engine.attack_spec('dictionary', target_hash, hash_type, wordlist=wordlist_path, policy=policy,
+                              bucketed=bucketed)
+    try:
+        source = engine.open_source(spec)
+    except ValueError as e:
+        return _fail_job(job, str(e))
     
-    total = len(wordlist)
-    job.total_attempts = total
-    db.session.commit()
+    # Words outside the policy are never hashed
+    job.skipped_attempts = source.skipped
+    plan = plan_run(job, source.keyspace, max_attempts=None)
+    result = run_spec(self, job, spec, plan, source, progress_every=1000, max_attempts=None)
+    if policy and 'error' not in result:
+        result['skipped'] = source.skipped
+    return result
+
+@celery.task(bind=True, name='tasks.crack_bruteforce')
+@profiled
+def crack_bruteforce_task(self, job_id, target_hash, hash_type, max_length, charset_option,
+                          markov_model=None, markov_threshold=None):
+    """Brute force attack task with progress updates"""
+    from models import db, JobStatus
     
-    start_time = time.time()
-    attempts = 0
+    job = _start_job(job_id)
+    if not job:
+        return {'error': 'Job not found'}
     
+    spec = engine.attack_spec('bruteforce', target_hash, hash_type, charset=charset_option,
+                              max_length=max_length, markov_model=markov_model,
+                              markov_threshold=markov_threshold)
     try:
-        for i, password in enumerate(wordlist):
-            attempts += 1
-            
-            # Check if password matches
-            if verify_password(password, target_hash, hash_type):
-                elapsed = time.time() - start_time
-                
-                # Update job with success
-                job.status = JobStatus.COMPLETED
-                job.success = True
-                job.cracked_password = password
-                job.current_attempt = attempts
-                job.time_elapsed = elapsed
-                job.speed = attempts / elapsed if elapsed > 0 else 0
-                job.progress = 100.0
-                job.completed_at = datetime.utcnow()
-                db.session.commit()
-                
-                # Emit success via WebSocket
-                socketio.emit('job_update', job.to_dict(), room=job_id)
-                
-                return {
-                    'success': True,
-                    'password': password,
-                    'attempts': attempts,
-                    'time': elapsed,
-                    'speed': attempts / elapsed if elapsed > 0 else 0
-                }
-            
-            # Update progress every 1000 attempts
-            if attempts % 1000 == 0:
-                elapsed = time.time() - start_time
-                progress = (i / total) * 100
-                
-                job.current_attempt = attempts
-                job.progress = progress
-                job.time_elapsed = elapsed
-                job.speed = attempts / elapsed if elapsed > 0 else 0
-                db.session.commit()
-                
-                # Emit progress via WebSocket
-                socketio.emit('job_update', job.to_dict(), room=job_id)
-                
-                # Update Celery task state
-                self.update_state(
-                    state='PROGRESS',
-                    meta={
-                        'current': attempts,
-                        'total': total,
-                        'progress': progress
-                    }
-                )
-        
-        # Password not found
+        source = engine.open_source(spec)
+    except ValueError as e:
+        return _fail_job(job, str(e))
+    
+    plan = plan_run(job, source.keyspace)
+    
+    # Try precomputed rainbow tables before enumerating the keyspace
+    from rainbow import rainbow_lookup
+    start_time = time.time()
+    password = None
+    for lookup_type in (job_hash_types(target_hash, hash_type) if not plan.start else ()):
+        password = rainbow_lookup(target_hash, lookup_type, charset_option, max_length)
+        if password is not None:
+            break
+    if password is not None:
         elapsed = time.time() - start_time
+        
         job.status = JobStatus.COMPLETED
-        job.success = False
-        job.current_attempt = attempts
+        job.success = True
+        job.cracked_password = password
+        job.matched_hash_type = lookup_type
         job.time_elapsed = elapsed
-        job.speed = attempts / elapsed if elapsed > 0 else 0
         job.progress = 100.0
         job.completed_at = datetime.utcnow()
         db.session.commit()
         
-        socketio.emit('job_update', job.to_dict(), room=job_id)
+        emit_job_update(job.to_dict())
         
         return {
-            'success': False,
-            'password': None,
-            'attempts': attempts,
+            'success': True,
+            'password': password,
+            'attempts': 0,
             'time': elapsed,
-            'speed': attempts / elapsed if elapsed > 0 else 0
+            'speed': 0,
+            'message': 'Resolved from rainbow table'
         }
-        
+    
+    return run_spec(self, job, spec, plan, source)
+
+@celery.task(name='tasks.build_lookup_table')
+def build_lookup_table_task(wordlist_path, hash_type):
+    """Precompute the digest lookup table for a wordlist"""
+    from lookup_tables import build_lookup_table
+    
+    try:
+        return build_lookup_table(wordlist_path, hash_type)
     except Exception as e:
-        job.status = JobStatus.FAILED
-        job.error_message = str(e)
-        job.completed_at = datetime.utcnow()
-        db.session.commit()
-        
-        socketio.emit('job_update', job.to_dict(), room=job_id)
-        
         return {'error': str(e)}
 
-@celery.task(bind=True, name='tasks.crack_bruteforce')
-def crack_bruteforce_task(self, job_id, target_hash, hash_type, max_length, charset_option):
-    """Brute force attack task with progress updates"""
-    from app import socketio, db
-    from models import CrackJob, JobStatus
+@celery.task(name='tasks.build_membership_index')
+def build_membership_index_task(wordlist_path):
+    """Precompute the strength analysis membership index for a wordlist"""
+    from strength import build_membership_index
+    
+    try:
+        return build_membership_index(wordlist_path)
+    except Exception as e:
+        return {'error': str(e)}
+
+@celery.task(name='tasks.build_length_index')
+def build_length_index_task(wordlist_path):
+    """Precompute the per-length buckets: policy length index and fixed-width block layout"""
+    from wordlist_buckets import build_buckets
+    
+    try:
+        return build_buckets(wordlist_path)
+    except Exception as e:
+        return {'error': str(e)}
+
+@celery.task(name='tasks.build_rainbow_table')
+def build_rainbow_table_task(hash_type, charset_option, max_length, chain_length=None,
+                             chain_count=None, table_index=0):
+    """Generate a rainbow table for a brute-force keyspace"""
+    from rainbow import build_rainbow_table
+    
+    try:
+        return build_rainbow_table(hash_type, charset_option, max_length,
+                                   chain_length, chain_count, table_index)
+    except Exception as e:
+        return {'error': str(e)}
+
+@celery.task(name='tasks.train_markov_model')
+def train_markov_model_task(name, wordlist_path):
+    """Train a Markov model from a wordlist file"""
+    from markov import train_from_wordlist, save_markov_model
+    
+    try:
+        model = train_from_wordlist(wordlist_path)
+        save_markov_model(name, model)
+        return {'name': name, 'trained_on': model['trained_on']}
+    except Exception as e:
+        return {'error': str(e)}
+
+@celery.task(bind=True, name='tasks.crack_pcfg')
+@profiled
+def crack_pcfg_task(self, job_id, target_hash, hash_type, model_name, max_guesses=None):
+    """PCFG attack task: guesses in descending grammar probability"""
+    from models import db, CrackJob, JobStatus
+    from pcfg import load_pcfg_model, PcfgGenerator
     
-    # Update job status
     job = CrackJob.query.filter_by(job_id=job_id).first()
     if not job:
         return {'error': 'Job not found'}
@@ -147,130 +365,195 @@ def crack_bruteforce_task(self, job_id, target_hash, hash_type, max_length, char
     job.status = JobStatus.RUNNING
     job.started_at = datetime.utcnow()
     db.session.commit()
+    _observe_start(job)
     
-    # Define charsets
-    charsets = {
-        '1': string.ascii_lowercase + string.digits,
-        '2': string.ascii_lowercase,
-        '3': string.ascii_lowercase + string.ascii_uppercase + string.digits,
-        '4': string.ascii_letters + string.digits + string.punctuation
-    }
+    model = load_pcfg_model(model_name)
+    if not model:
+        job.status = JobStatus.FAILED
+        job.error_message = f'PCFG model {model_name} not found'
+        job.completed_at = datetime.utcnow()
+        db.session.commit()
+        emit_job_update(job.to_dict())
+        return {'error': 'PCFG model not found'}
     
-    charset = charsets.get(charset_option, string.ascii_lowercase + string.digits)
+    generator = PcfgGenerator(model)
+    total = generator.keyspace()
+    if max_guesses:
+        total = min(total, max_guesses)
     
-    # Calculate total combinations
-    total = sum(len(charset) ** length for length in range(1, max_length + 1))
     job.total_attempts = min(total, Config.MAX_ATTEMPTS_PER_JOB)
     db.session.commit()
     
-    start_time = time.time()
-    attempts = 0
+    return run_candidates(self, job, generator.candidates(limit=total), total, target_hash, hash_type)
+
+@celery.task(name='tasks.train_pcfg_model')
+def train_pcfg_model_task(name, wordlist_path):
+    """Train a PCFG grammar from a wordlist file"""
+    from pcfg import train_from_wordlist, save_pcfg_model
     
     try:
-        for length in range(1, max_length + 1):
-            for combo in itertools.product(charset, repeat=length):
-                attempts += 1
-                password = ''.join(combo)
-                
-                # Check if password matches
-                if verify_password(password, target_hash, hash_type):
-                    elapsed = time.time() - start_time
-                    
-                    # Update job with success
-                    job.status = JobStatus.COMPLETED
-                    job.success = True
-                    job.cracked_password = password
-                    job.current_attempt = attempts
-                    job.time_elapsed = elapsed
-                    job.speed = attempts / elapsed if elapsed > 0 else 0
-                    job.progress = 100.0
-                    job.completed_at = datetime.utcnow()
-                    db.session.commit()
-                    
-                    socketio.emit('job_update', job.to_dict(), room=job_id)
-                    
-                    return {
-                        'success': True,
-                        'password': password,
-                        'attempts': attempts,
-                        'time': elapsed,
-                        'speed': attempts / elapsed if elapsed > 0 else 0
-                    }
-                
-                # Limit attempts
-                if attempts >= Config.MAX_ATTEMPTS_PER_JOB:
-                    elapsed = time.time() - start_time
-                    
-                    job.status = JobStatus.COMPLETED
-                    job.success = False
-                    job.current_attempt = attempts
-                    job.time_elapsed = elapsed
-                    job.speed = attempts / elapsed if elapsed > 0 else 0
-                    job.progress = 100.0
-                    job.error_message = f'Exceeded maximum attempts ({Config.MAX_ATTEMPTS_PER_JOB})'
-                    job.completed_at = datetime.utcnow()
-                    db.session.commit()
-                    
-                    socketio.emit('job_update', job.to_dict(), room=job_id)
-                    
-                    return {
-                        'success': False,
-                        'password': None,
-                        'attempts': attempts,
-                        'time': elapsed,
-                        'speed': attempts / elapsed if elapsed > 0 else 0,
-                        'message': f'Exceeded maximum attempts ({Config.MAX_ATTEMPTS_PER_JOB})'
-                    }
-                
-                # Update progress every 5000 attempts
-                if attempts % 5000 == 0:
-                    elapsed = time.time() - start_time
-                    progress = min((attempts / total) * 100, 99.9)
-                    
-                    job.current_attempt = attempts
-                    job.progress = progress
-                    job.time_elapsed = elapsed
-                    job.speed = attempts / elapsed if elapsed > 0 else 0
-                    db.session.commit()
-                    
-                    socketio.emit('job_update', job.to_dict(), room=job_id)
-                    
-                    self.update_state(
-                        state='PROGRESS',
-                        meta={
-                            'current': attempts,
-                            'total': total,
-                            'progress': progress
-                        }
-                    )
-        
-        # Password not found
-        elapsed = time.time() - start_time
-        job.status = JobStatus.COMPLETED
-        job.success = False
-        job.current_attempt = attempts
-        job.time_elapsed = elapsed
-        job.speed = attempts / elapsed if elapsed > 0 else 0
-        job.progress = 100.0
-        job.completed_at = datetime.utcnow()
-        db.session.commit()
-        
-        socketio.emit('job_update', job.to_dict(), room=job_id)
-        
-        return {
-            'success': False,
-            'password': None,
-            'attempts': attempts,
-            'time': elapsed,
-            'speed': attempts / elapsed if elapsed > 0 else 0
-        }
-        
+        model = train_from_wordlist(wordlist_path)
+        save_pcfg_model(name, model)
+        return {'name': name, 'trained_on': model['trained_on']}
     except Exception as e:
-        job.status = JobStatus.FAILED
-        job.error_message = str(e)
-        job.completed_at = datetime.utcnow()
-        db.session.commit()
-        
-        socketio.emit('job_update', job.to_dict(), room=job_id)
-        
         return {'error': str(e)}
+
+def _start_job(job_id):
+    """Load a job and mark it running"""
+    from models import db, CrackJob, JobStatus
+    
+    job = CrackJob.query.filter_by(job_id=job_id).first()
+    if job:
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        db.session.commit()
+        _observe_start(job)
+    return job
+
+def _fail_job(job, message):
+    """Mark a job failed before any candidates were tried"""
+    from models import db, JobStatus
+    
+    job.status = JobStatus.FAILED
+    job.error_message = message
+    job.completed_at = datetime.utcnow()
+    db.session.commit()
+    emit_job_update(job.to_dict())
+    return {'error': message}
+
+@celery.task(bind=True, name='tasks.crack_combinator')
+@profiled
+def crack_combinator_task(self, job_id, target_hash, hash_type, left_path, right_path,
+                          start=0, end=None):
+    """Combinator attack task: left word + right word"""
+    job = _start_job(job_id)
+    if not job:
+        return {'error': 'Job not found'}
+    
+    spec = engine.attack_spec('combinator', target_hash, hash_type, left=left_path, right=right_path)
+    try:
+        # Word counts are taken once here and reused by every slice
+        spec = engine.resolve_spec(spec)
+        source = engine.open_source(spec)
+    except ValueError as e:
+        return _fail_job(job, str(e))
+    
+    end = source.keyspace if end is None else min(end, source.keyspace)
+    plan = plan_run(job, end, start)
+    return run_spec(self, job, spec, plan, source)
+
+@celery.task(bind=True, name='tasks.crack_hybrid')
+@profiled
+def crack_hybrid_task(self, job_id, target_hash, hash_type, wordlist_path, mask,
+                      mask_first=False, start=0, end=None):
+    """Hybrid attack task: word + mask, or mask + word"""
+    job = _start_job(job_id)
+    if not job:
+        return {'error': 'Job not found'}
+    
+    spec = engine.attack_spec('hybrid', target_hash, hash_type, wordlist=wordlist_path, mask=mask,
+                              mask_first=mask_first)
+    try:
+        spec = engine.resolve_spec(spec)
+        source = engine.open_source(spec)
+    except ValueError as e:
+        return _fail_job(job, str(e))
+    
+    end = source.keyspace if end is None else min(end, source.keyspace)
+    plan = plan_run(job, end, start)
+    return run_spec(self, job, spec, plan, source)
+
+@celery.task(name='tasks.engine_search')
+def engine_search_task(spec, start, end, deadline=None, check_every=None):
+    """Search one slice of an attack spec for the Celery engine backend"""
+    return engine.search_slice(spec, start, end, deadline, check_every)
+
+@celery.task(bind=True, name='tasks.crack_targets')
+@profiled
+def crack_targets_task(self, job_id, hash_type, wordlist_path=None, max_length=None, charset_option=None):
+    """Multi-target attack: every candidate is hashed once and matched against all targets"""
+    from models import db, CrackTarget, JobStatus
+    from hash_utils import hash_digest, FAST_HASH_TYPES
+    
+    job = _start_job(job_id)
+    if not job:
+        return {'error': 'Job not found'}
+    
+    targets = (
+        db.session.query(CrackTarget.id, CrackTarget.target_hash)
+        .filter_by(job_id=job_id, cracked=False)
+        .all()
+    )
+    
+    # Same candidate sources as the single-target attacks; the spec has no single target
+    if wordlist_path:
+        spec = engine.attack_spec('dictionary', None, hash_type, wordlist=wordlist_path)
+    else:
+        spec = engine.attack_spec('bruteforce', None, hash_type, charset=charset_option, max_length=max_length)
+    try:
+        source = engine.open_source(spec)
+    except ValueError as e:
+        return _fail_job(job, str(e))
+    
+    job.total_attempts = min(source.keyspace, Config.MAX_ATTEMPTS_PER_JOB)
+    db.session.commit()
+    
+    # Unsalted hashes: one digest per candidate, matched with a dict lookup
+    fast = hash_type in FAST_HASH_TYPES
+    remaining = {}
+    for target_id, target_hash in targets:
+        if fast:
+            try:
+                remaining.setdefault(bytes.fromhex(target_hash), []).append(target_id)
+            except ValueError:
+                continue
+        else:
+            remaining[target_id] = make_verifier(target_hash, hash_type)
+    
+    progress = TargetProgress(self, job, source.keyspace)
+    found = progress.found
+    
+    # The engine stops on a "match", which here means every target is cracked
+    def verify(password):
+        if fast:
+            target_ids = remaining.pop(hash_digest(password, hash_type), None)
+            if target_ids:
+                found.extend((target_id, password) for target_id in target_ids)
+        else:
+            for target_id, check in list(remaining.items()):
+                if check(password):
+                    found.append((target_id, password))
+                    del remaining[target_id]
+        return not remaining
+    
+    try:
+        result = engine.search(source.candidates(0, source.keyspace), verify, progress,
+                               Config.MAX_ATTEMPTS_PER_JOB, progress_every=1000)
+        progress.flush()
+    except Exception as e:
+        db.session.rollback()
+        return _fail_run(job, e, progress)
+    
+    if result.stopped == engine.LIMIT:
+        job.error_message = f'Exceeded maximum attempts ({Config.MAX_ATTEMPTS_PER_JOB})'
+    
+    job.status = JobStatus.COMPLETED
+    job.success = (job.cracked_count or 0) > 0
+    job.current_attempt = result.attempts
+    job.time_elapsed = result.elapsed
+    job.speed = result.speed
+    job.progress = 100.0
+    job.completed_at = datetime.utcnow()
+    db.session.commit()
+    _finish_progress(job, result.attempts - progress.reported)
+    
+    emit_job_update(job.to_dict())
+    
+    return {
+        'success': job.success,
+        'cracked': job.cracked_count,
+        'targets': job.target_count,
+        'attempts': result.attempts,
+        'time': job.time_elapsed,
+        'speed': job.speed
+    }
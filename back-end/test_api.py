@@ -38,6 +38,27 @@ def test_detect_hash():
         print(f"Description: {result['description']}")
         print()
 
+def test_detect_hash_bulk():
+    """Test bulk hash detection"""
+    print("Testing bulk hash detection...")
+    
+    hashes = [
+        "5f4dcc3b5aa765d61d8327deb882cf99",  # MD5 / NTLM
+        "5baa61e4c9b93f3f0682250b6cf8331b7ee68fd8",  # SHA1
+        "not-a-hash",
+    ]
+    
+    response = requests.post(
+        f"{BASE_URL}/api/detect-hash/bulk",
+        json={"hashes": hashes}
+    )
+    result = response.json()
+    print(f"Classified: {result['count']}")
+    print(f"Summary: {result['summary']}")
+    for item in result['results']:
+        print(f"  - {item['hash'][:32]} -> {item['candidates']}")
+    print()
+
 def test_generate_hash():
     """Test hash generation"""
     print("Testing hash generation...")
@@ -172,6 +193,7 @@ def main():
         # Basic tests
         test_health()
         test_detect_hash()
+        test_detect_hash_bulk()
         test_generate_hash()
         test_verify()
         test_wordlists()
@@ -0,0 +1,42 @@
+"""ASGI API startup on its own database and request body validation"""
+
+import hashlib
+
+import pytest
+from sqlalchemy import inspect
+from starlette.testclient import TestClient
+
+import asgi_app
+from models import db
+from worker_runtime import app_context
+
+@pytest.fixture
+def asgi_client(queued):
+    # Entering the client runs the lifespan, including the schema setup
+    with TestClient(asgi_app.app) as client:
+        yield client
+
+def test_startup_creates_missing_tables(queued):
+    with app_context():
+        db.drop_all()
+    
+    with TestClient(asgi_app.app) as client:
+        assert client.get('/api/jobs/unknown').status_code == 404
+    
+    with app_context():
+        assert {'crack_jobs', 'crack_targets', 'wordlists'} <= set(inspect(db.engine).get_table_names())
+
+@pytest.mark.parametrize('body', ['[]', '["hash"]', '42', '"md5"'])
+def test_non_object_bodies_are_rejected(asgi_client, queued, body):
+    response = asgi_client.post('/api/jobs', content=body, headers={'Content-Type': 'application/json'})
+    assert response.status_code == 400
+    assert queued == []
+
+def test_submit_and_read_a_job(asgi_client, queued, wordlist):
+    data = {'hash': hashlib.md5(b'x').hexdigest(), 'hashType': 'md5', 'wordlist': wordlist(['a', 'b'])}
+    response = asgi_client.post('/api/jobs', json=data)
+    assert response.status_code == 201
+    
+    job_id = response.json()['job_id']
+    assert asgi_client.get(f'/api/jobs/{job_id}').json()['status'] == 'pending'
+    assert len(queued) == 1
@@ -0,0 +1,152 @@
+"""Index-addressable candidate sources and the search loop behind every backend"""
+
+import hashlib
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import engine
+import wordlist_buckets
+from config import Config
+from engine import attack_spec, open_source, resolve_spec, search, FOUND, EXHAUSTED, LIMIT
+from keyspace import get_charset, candidate_at, keyspace_candidates, keyspace_size, parse_mask, mask_candidate_at
+from markov import MarkovGenerator, train_markov_model
+from worker_cache import get_wordlist
+
+def md5(text):
+    return hashlib.md5(text.encode()).hexdigest()
+
+def test_keyspace_slices_match_full_enumeration():
+    charset = 'abc'
+    full = [''.join(chars) for length in range(1, 4) for chars in itertools.product(charset, repeat=length)]
+    assert keyspace_size(charset, 3) == len(full)
+    
+    for start, end in [(0, 5), (2, 3), (3, 13), (11, 39), (38, 39), (20, 20)]:
+        assert list(keyspace_candidates(charset, 3, start, end)) == full[start:end]
+    assert [candidate_at(i, charset, 3) for i in range(len(full))] == full
+    
+    with pytest.raises(IndexError):
+        candidate_at(len(full), charset, 3)
+
+def test_search_stops_on_match_limit_and_exhaustion():
+    words = [f'w{i}' for i in range(100)]
+    
+    found = search(words, lambda word: word == 'w41', progress_every=16)
+    assert (found.password, found.attempts, found.stopped) == ('w41', 42, FOUND)
+    
+    limited = search(words, lambda word: word == 'w41', max_attempts=30, progress_every=16)
+    assert (limited.password, limited.attempts, limited.stopped) == (None, 30, LIMIT)
+    
+    exhausted = search(words, lambda word: False, progress_every=16)
+    assert (exhausted.password, exhausted.attempts, exhausted.stopped) == (None, 100, EXHAUSTED)
+
+def test_search_reports_progress_every_slice():
+    reports = []
+    search(range(100), lambda n: False, lambda attempts, elapsed: reports.append(attempts), progress_every=25)
+    assert reports == [25, 50, 75, 100]
+
+@pytest.fixture
+def thread_backend(monkeypatch):
+    monkeypatch.setattr(Config, 'ENGINE_CHUNK', 7)
+    backend = engine.ExecutorBackend('thread', ThreadPoolExecutor)
+    yield backend
+    backend.executor.shutdown()
+
+@pytest.mark.parametrize('password, max_attempts', [('cab', None), ('ca', 20), ('zzz', None), ('zzz', 30)])
+def test_pooled_search_matches_inline(thread_backend, password, max_attempts):
+    spec = attack_spec('bruteforce', md5(password), 'md5', charset='2', max_length=3)
+    
+    inline = engine.InlineBackend().search(spec, max_attempts=max_attempts)
+    pooled = thread_backend.search(spec, max_attempts=max_attempts)
+    
+    assert (pooled.password, pooled.attempts, pooled.stopped) == (inline.password, inline.attempts, inline.stopped)
+
+def test_pooled_search_from_an_offset(thread_backend):
+    spec = attack_spec('bruteforce', md5('b9'), 'md5', max_length=2)
+    index = list(keyspace_candidates(get_charset(None), 2)).index('b9')
+    
+    result = thread_backend.search(spec, start=40)
+    assert (result.password, result.attempts) == ('b9', index - 40 + 1)
+
+def test_combinator_slices(wordlist):
+    left = wordlist(['red', 'blue', 'green'], 'left.txt')
+    right = wordlist(['cat', '', 'dog'], 'right.txt')
+    spec = resolve_spec(attack_spec('combinator', md5('bluedog'), 'md5', left=left, right=right))
+    assert (spec['left_count'], spec['right_count']) == (3, 2)
+    
+    source = open_source(spec)
+    full = [l + r for l in ['red', 'blue', 'green'] for r in ['cat', 'dog']]
+    assert source.keyspace == len(full)
+    for start, end in [(0, 6), (1, 4), (3, 5), (5, 6)]:
+        assert list(source.candidates(start, end)) == full[start:end]
+    
+    result = engine.InlineBackend().search(spec)
+    assert (result.password, result.attempts) == ('bluedog', 4)
+
+@pytest.mark.parametrize('mask_first', [False, True])
+def test_hybrid_slices(wordlist, mask_first):
+    path = wordlist(['pass', 'word'])
+    spec = resolve_spec(attack_spec('hybrid', md5('x'), 'md5', wordlist=path, mask='?d?d', mask_first=mask_first))
+    assert spec['word_count'] == 2
+    
+    charsets = parse_mask('?d?d')
+    masks = [mask_candidate_at(i, charsets) for i in range(100)]
+    full = [m + w if mask_first else w + m for w in ['pass', 'word'] for m in masks]
+    
+    source = open_source(spec)
+    assert source.keyspace == 200
+    for start, end in [(0, 10), (95, 105), (150, 200)]:
+        assert list(source.candidates(start, end)) == full[start:end]
+
+def test_missing_wordlist_is_rejected(tmp_path):
+    spec = attack_spec('hybrid', md5('x'), 'md5', wordlist=str(tmp_path / 'missing.txt'), mask='?d')
+    with pytest.raises(ValueError):
+        resolve_spec(spec)
+
+def test_markov_index_round_trip():
+    model = train_markov_model(['abc', 'cab', 'cca', 'bb'])
+    generator = MarkovGenerator(model, 'abc', 3)
+    candidates = list(generator.candidates())
+    
+    assert len(candidates) == generator.keyspace() == keyspace_size('abc', 3)
+    assert sorted(candidates) == sorted(keyspace_candidates('abc', 3))
+    for index, candidate in enumerate(candidates):
+        assert generator.candidate_at(index) == candidate
+        assert generator.index_of(candidate) == index
+    assert list(generator.candidates(10, 20)) == candidates[10:20]
+    
+    assert generator.index_of('') is None
+    assert generator.index_of('abca') is None
+    assert generator.index_of('abz') is None
+
+def test_markov_threshold_shrinks_keyspace():
+    generator = MarkovGenerator(train_markov_model(['aaa', 'aab']), 'abc', 3, threshold=2)
+    assert generator.keyspace() == 2 + 4 + 8
+    assert generator.index_of('c') is None
+
+def test_policy_selection_with_and_without_index(wordlist):
+    words = ['abc', 'Passw0rd', 'letmein', 'S3cret!', 'qwerty12', 'X9', 'trustno1', 'Dragon99']
+    path = wordlist(words)
+    policy = wordlist_buckets.parse_policy({'minLength': 6, 'require': ['digit']})
+    expected = [word for word in words if wordlist_buckets.policy_allows(policy, word)]
+    
+    def selected():
+        wordlist_buckets._select.cache_clear()
+        count, candidates, skipped = wordlist_buckets.select_words(path, policy)
+        assert (count, skipped) == (len(expected), len(words) - len(expected))
+        return list(candidates(0, count)), list(candidates(1, 3))
+    
+    fallback = selected()
+    wordlist_buckets.build_length_index(path)
+    indexed = selected()
+    
+    assert fallback == indexed == (expected, expected[1:3])
+    wordlist_buckets._select.cache_clear()
+
+def test_unreadable_wordlist_is_rejected(tmp_path):
+    assert get_wordlist(str(tmp_path)) == ()
+    
+    spec = attack_spec('dictionary', md5('x'), 'md5', wordlist=str(tmp_path))
+    with pytest.raises(ValueError, match='Wordlist not found or empty'):
+        open_source(spec)
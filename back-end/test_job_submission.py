@@ -0,0 +1,43 @@
+"""Request validation in job_service.submit_job before anything is queued"""
+
+import hashlib
+
+import pytest
+
+from pcfg import save_pcfg_model, train_pcfg_model
+
+TARGET = hashlib.md5(b'x').hexdigest()
+
+def submit(client, **data):
+    response = client.post('/api/jobs', json=dict({'hash': TARGET, 'hashType': 'md5'}, **data))
+    return response.status_code, response.get_json()
+
+@pytest.fixture
+def pcfg_model():
+    save_pcfg_model('submission', train_pcfg_model(['pass12', 'word99!']))
+    return 'submission'
+
+def test_pcfg_max_guesses_is_stored_as_an_integer(client, queued, pcfg_model):
+    status, _ = submit(client, attackMode='pcfg', pcfgModel=pcfg_model, maxGuesses='1000')
+    assert status == 201
+    assert queued[0][1][4] == 1000
+
+@pytest.mark.parametrize('max_guesses', [0, -5, 'many', [10]])
+def test_pcfg_max_guesses_must_be_positive(client, queued, pcfg_model, max_guesses):
+    status, body = submit(client, attackMode='pcfg', pcfgModel=pcfg_model, maxGuesses=max_guesses)
+    assert status == 400
+    assert 'maxGuesses' in body['error']
+    assert queued == []
+
+@pytest.mark.parametrize('threshold', [-2, 0, 37, 'top', [3]])
+def test_markov_threshold_must_fit_the_charset(client, queued, threshold):
+    # Charset 1 is lowercase + digits, 36 characters
+    status, body = submit(client, attackMode='bruteforce', maxLength=3, charset='1', markovThreshold=threshold)
+    assert status == 400
+    assert 'markovThreshold' in body['error']
+    assert queued == []
+
+def test_markov_threshold_is_stored_as_an_integer(client, queued):
+    status, _ = submit(client, attackMode='bruteforce', maxLength=3, charset='1', markovThreshold='36')
+    assert status == 201
+    assert queued[0][1][6] == 36
@@ -0,0 +1,105 @@
+"""Keyset pagination of GET /api/jobs and ETag revalidation of job reads"""
+
+import uuid
+from datetime import datetime, timedelta
+
+from models import db, CrackJob, JobStatus, AttackMode
+from pagination import encode_cursor, decode_cursor
+
+def add_jobs(count, same_time=False, status=JobStatus.PENDING, start=0):
+    base = datetime(2026, 1, 1) + timedelta(seconds=start)
+    jobs = []
+    for i in range(count):
+        job = CrackJob(
+            job_id=str(uuid.uuid4()),
+            target_hash=f'{i:032x}',
+            hash_type='md5',
+            attack_mode=AttackMode.DICTIONARY,
+            status=status,
+            created_at=base if same_time else base + timedelta(seconds=i)
+        )
+        db.session.add(job)
+        jobs.append(job)
+    db.session.commit()
+    return jobs
+
+def read_all_pages(client, query):
+    pages = []
+    cursor = None
+    while True:
+        url = f'/api/jobs?{query}' + (f'&cursor={cursor}' if cursor else '')
+        page = client.get(url).get_json()
+        pages.append([job['job_id'] for job in page['jobs']])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return pages
+
+def test_cursor_round_trip(flask_app):
+    job = add_jobs(1)[0]
+    assert decode_cursor(encode_cursor(job)) == (job.created_at, job.id)
+
+def test_pages_cover_every_job_once_newest_first(client):
+    jobs = add_jobs(12)
+    
+    pages = read_all_pages(client, 'limit=5')
+    
+    assert [len(page) for page in pages] == [5, 5, 2]
+    assert sum(pages, []) == [job.job_id for job in reversed(jobs)]
+
+def test_ties_on_created_at_are_broken_by_id(client):
+    jobs = add_jobs(7, same_time=True)
+    
+    pages = read_all_pages(client, 'limit=3')
+    
+    assert sum(pages, []) == [job.job_id for job in sorted(jobs, key=lambda job: job.id, reverse=True)]
+
+def test_new_jobs_do_not_shift_later_pages(client):
+    jobs = add_jobs(6)
+    first = client.get('/api/jobs?limit=3').get_json()
+    
+    # An OFFSET page would now repeat a job; the cursor keeps its place
+    add_jobs(2, start=100)
+    second = client.get(f"/api/jobs?limit=3&cursor={first['next_cursor']}").get_json()
+    
+    assert [job['job_id'] for job in second['jobs']] == [job.job_id for job in reversed(jobs[:3])]
+
+def test_status_filter_and_projection(client):
+    add_jobs(3)
+    done = add_jobs(2, status=JobStatus.COMPLETED)
+    
+    page = client.get('/api/jobs?status=completed&fields=job_id,status').get_json()
+    
+    assert [job['job_id'] for job in page['jobs']] == [job.job_id for job in reversed(done)]
+    assert all(set(job) == {'job_id', 'status'} for job in page['jobs'])
+
+def test_bad_cursor_and_fields_are_rejected(client):
+    assert client.get('/api/jobs?cursor=not-a-cursor').status_code == 400
+    assert client.get('/api/jobs?fields=job_id,password_hash').status_code == 400
+
+def test_job_list_etag_revalidates(client):
+    job = add_jobs(2)[0]
+    
+    response = client.get('/api/jobs')
+    etag = response.headers['ETag']
+    assert response.status_code == 200
+    
+    unchanged = client.get('/api/jobs', headers={'If-None-Match': etag})
+    assert unchanged.status_code == 304
+    assert unchanged.data == b''
+    
+    job.status = JobStatus.RUNNING
+    db.session.commit()
+    changed = client.get('/api/jobs', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+
+def test_job_etag_revalidates(client):
+    job = add_jobs(1)[0]
+    url = f'/api/jobs/{job.job_id}'
+    
+    etag = client.get(url).headers['ETag']
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+    
+    job.progress = 50.0
+    db.session.commit()
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 200
@@ -0,0 +1,116 @@
+"""Live progress counters on the in-memory backend and the engine's JobProgress sink"""
+
+import time
+
+import progress_store
+from progress_store import MemoryRedis, incr_progress, get_progress, clear_progress, merge_progress
+from tasks import JobProgress
+
+def test_memory_redis_hash_commands():
+    client = MemoryRedis()
+    
+    assert client.hincrby('k', 'a', 5) == 5
+    assert client.hincrby('k', 'a', 2) == 7
+    assert client.hincrbyfloat('k', 'f', 0.5) == 0.5
+    assert client.hsetnx('k', 'once', 1) == 1
+    assert client.hsetnx('k', 'once', 2) == 0
+    client.hset('k', mapping={'x': 1, 'y': 'z'})
+    
+    assert client.hgetall('k') == {'a': '7', 'f': '0.5', 'once': '1', 'x': '1', 'y': 'z'}
+    assert client.delete('k', 'missing') == 1
+    assert client.hgetall('k') == {}
+
+def test_memory_pipeline_runs_on_execute():
+    client = MemoryRedis()
+    pipe = client.pipeline(transaction=False)
+    pipe.hincrby('k', 'a', 1)
+    pipe.hincrby('k', 'a', 1)
+    
+    assert client.hgetall('k') == {}
+    assert pipe.execute() == [1, 2]
+    assert pipe.execute() == []
+
+def test_incr_progress_sums_shards():
+    incr_progress('job-shards', 100, shard=0, started=time.time() - 2)
+    incr_progress('job-shards', 50, shard=1)
+    total = incr_progress('job-shards', 25, shard=0)
+    
+    live = get_progress('job-shards')
+    assert total == 175
+    assert live['current_attempt'] == 175
+    assert live['shards'] == {'0': 125, '1': 50}
+    assert live['time_elapsed'] > 1
+    assert live['speed'] > 0
+    
+    clear_progress('job-shards')
+    assert get_progress('job-shards') is None
+
+def test_started_is_kept_from_first_report():
+    incr_progress('job-started', 1, started=100.0)
+    incr_progress('job-started', 1, started=200.0)
+    assert progress_store.get_client().hgetall('progress:job-started')['started'] == '100.0'
+    clear_progress('job-started')
+
+def test_merge_progress_overlays_running_jobs_only():
+    incr_progress('job-merge', 400, started=time.time() - 1)
+    
+    running = merge_progress({'job_id': 'job-merge', 'status': 'running', 'total_attempts': 1000,
+                              'current_attempt': 0, 'progress': 0.0})
+    assert running['current_attempt'] == 400
+    assert running['progress'] == 40.0
+    
+    done = {'job_id': 'job-merge', 'status': 'completed', 'current_attempt': 7}
+    assert merge_progress(dict(done)) == done
+    
+    clear_progress('job-merge')
+    unreported = {'job_id': 'job-merge', 'status': 'running', 'current_attempt': 3}
+    assert merge_progress(dict(unreported)) == unreported
+
+def test_merge_progress_falls_back_when_the_store_fails(monkeypatch):
+    def unavailable():
+        raise ConnectionError('down')
+    monkeypatch.setattr(progress_store, 'get_client', unavailable)
+    
+    job = {'job_id': 'job-down', 'status': 'running', 'current_attempt': 9}
+    assert merge_progress(dict(job)) == job
+
+class FakeTask:
+    def __init__(self):
+        self.states = []
+    
+    def update_state(self, state, meta):
+        self.states.append((state, meta))
+
+class FakeJob:
+    """The parts of a CrackJob row the sink reads"""
+    
+    job_id = 'job-sink'
+    hash_type = 'md5'
+    attack_mode = None
+    total_attempts = 1000
+    
+    def to_dict(self):
+        return {'job_id': self.job_id, 'status': 'running', 'total_attempts': self.total_attempts,
+                'current_attempt': 0, 'progress': 0.0}
+
+def test_job_progress_reports_deltas(emitted):
+    task = FakeTask()
+    sink = JobProgress(task, FakeJob(), 1000)
+    
+    sink(300, 0.1)
+    sink(800, 0.2)
+    
+    # The counters get each report's increment, not the running total again
+    assert get_progress('job-sink')['current_attempt'] == 800
+    assert sink.reported == 800
+    assert task.states[-1] == ('PROGRESS', {'current': 800, 'total': 1000, 'progress': 80.0})
+    
+    # Socket updates carry the live counters; the second is inside the rate limit
+    assert [data['current_attempt'] for _, data, _ in emitted] == [300]
+    clear_progress('job-sink')
+
+def test_job_progress_caps_below_complete():
+    task = FakeTask()
+    JobProgress(task, FakeJob(), 10)(10, 0.1)
+    assert task.states[-1][1]['progress'] == 99.9
+    clear_progress('job-sink')
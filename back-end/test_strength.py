@@ -0,0 +1,53 @@
+"""Guess-rank strength scoring, including passwords beyond the Markov model's positions"""
+
+import pytest
+
+from config import Config
+from keyspace import keyspace_size
+from markov import MAX_POSITIONS
+from strength import StrengthAnalyzer, charset_for, markov_rank
+
+LONG = 'correcthorsebatterystaple'
+
+def test_markov_rank_within_modelled_lengths():
+    # Plain brute-force order without a model: 26 one-letter candidates come before 'aa'
+    assert markov_rank('a') == 0
+    assert markov_rank('aa') == 26
+
+def test_long_password_falls_back_to_exhaustive_count():
+    assert len(LONG) > MAX_POSITIONS
+    assert markov_rank(LONG) == keyspace_size(charset_for(LONG), len(LONG))
+    
+    result = StrengthAnalyzer().analyze(LONG)
+    assert result['guesses'] == result['markov_rank'] + 1
+    assert result['strength'] == 'Very Strong'
+
+def test_longer_passwords_rank_higher():
+    ranks = [markov_rank('a' * length) for length in (MAX_POSITIONS - 1, MAX_POSITIONS, MAX_POSITIONS + 1)]
+    assert ranks == sorted(ranks)
+
+def test_analyze_strength_endpoint_scores_long_passwords(client):
+    response = client.post('/api/analyze-strength', json={'password': LONG})
+    assert response.status_code == 200
+    assert response.get_json()['length'] == len(LONG)
+
+@pytest.fixture(params=['app', 'passwordcracker'])
+def batch_client(request, flask_app):
+    if request.param == 'app':
+        return flask_app.test_client()
+    from passwordcracker import app
+    return app.test_client()
+
+def test_batch_scores_long_and_short_passwords(batch_client):
+    response = batch_client.post('/api/analyze-strength/batch', json={'passwords': ['abc', LONG]})
+    assert response.status_code == 200
+    assert [result['length'] for result in response.get_json()['results']] == [3, len(LONG)]
+
+def test_batch_rejects_bad_bodies(batch_client, monkeypatch):
+    monkeypatch.setattr(Config, 'STRENGTH_BATCH_LIMIT', 2)
+    url = '/api/analyze-strength/batch'
+    
+    assert batch_client.post(url, json={'passwords': ['abc', '']}).status_code == 400
+    assert batch_client.post(url, json={'passwords': ['a', 'b', 'c']}).status_code == 400
+    assert batch_client.post(url, json={'passwords': 'abc'}).status_code == 400
+    assert batch_client.post(url, data='null', content_type='application/json').status_code == 400
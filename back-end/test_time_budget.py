@@ -0,0 +1,83 @@
+"""Time-budgeted runs that stop at searched_until and resume from it when extended"""
+
+import hashlib
+
+import pytest
+
+import strength
+import tasks
+from config import Config
+from models import CrackJob, JobStatus
+
+WORDS = [f'word{i}' for i in range(20)]
+
+@pytest.fixture
+def rate(monkeypatch):
+    """Three candidates per second, so a budget of N seconds plans 3 * N candidates"""
+    monkeypatch.setattr(strength, 'measure_target_rate', lambda target_hash, hash_type: 3)
+
+def submit(client, **data):
+    response = client.post('/api/jobs', json=dict({'hashType': 'md5', 'attackMode': 'dictionary'}, **data))
+    return response.status_code, response.get_json()
+
+def run_queued(queued):
+    """Run the last dispatched task in-process and forget it"""
+    name, args = queued.pop()
+    assert name == tasks.crack_dictionary_task.name
+    return tasks.crack_dictionary_task.run(*args)
+
+def test_budgeted_job_resumes_where_it_stopped(client, queued, rate, wordlist):
+    path = wordlist(WORDS)
+    status, body = submit(client, hash=hashlib.md5(b'word8').hexdigest(), wordlist=path, timeBudget=2)
+    assert status == 201
+    job = CrackJob.query.filter_by(job_id=body['job_id']).first()
+    
+    # First run: 2 seconds at 3/s covers words 0..5 and stops short of the match
+    summary = run_queued(queued)
+    assert summary['success'] is False
+    assert summary['searched_until'] == job.searched_until == 6
+    assert job.keyspace == len(WORDS)
+    assert job.current_attempt == 6
+    assert job.error_message == f'Time budget exhausted: searched 6 of {len(WORDS)} candidates'
+    
+    response = client.post(f'/api/jobs/{job.job_id}/extend', json={'seconds': 2})
+    assert response.status_code == 202
+    assert job.status == JobStatus.PENDING
+    assert job.error_message is None
+    
+    # Second run starts at word 6, so word8 is its third attempt
+    summary = run_queued(queued)
+    assert summary['password'] == 'word8'
+    assert summary['attempts'] == 3
+    assert job.searched_until == job.current_attempt == 9
+    assert job.success is True
+    
+    assert client.post(f'/api/jobs/{job.job_id}/extend', json={'seconds': 5}).status_code == 409
+
+def test_extend_requires_a_budget(client, queued, wordlist):
+    path = wordlist(WORDS)
+    _, body = submit(client, hash=hashlib.md5(b'missing').hexdigest(), wordlist=path)
+    run_queued(queued)
+    
+    response = client.post(f"/api/jobs/{body['job_id']}/extend", json={'seconds': 5})
+    assert response.status_code == 400
+    assert client.post('/api/jobs/no-such-job/extend', json={'seconds': 5}).status_code == 404
+
+def test_extend_rejects_bad_seconds(client, queued, rate, wordlist):
+    _, body = submit(client, hash=hashlib.md5(b'missing').hexdigest(), wordlist=wordlist(WORDS), timeBudget=1)
+    run_queued(queued)
+    
+    for seconds in (None, 'soon', -1, 0):
+        response = client.post(f"/api/jobs/{body['job_id']}/extend", json={'seconds': seconds})
+        assert response.status_code == 400
+
+def test_bruteforce_length_is_bounded(client, queued):
+    target = hashlib.md5(b'x').hexdigest()
+    for max_length in (0, Config.MAX_BRUTEFORCE_LENGTH + 1, 'long'):
+        status, _ = submit(client, hash=target, attackMode='bruteforce', maxLength=max_length, timeBudget=60)
+        assert status == 400
+    assert queued == []
+    
+    status, _ = submit(client, hash=target, attackMode='bruteforce', maxLength=2, timeBudget=60)
+    assert status == 201
+    assert queued[0][1][3] == 2
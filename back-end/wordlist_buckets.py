@@ -0,0 +1,476 @@
+"""
+Per-length buckets of a wordlist: policy filters and fixed-width blocks
+
+A password policy (length range, required character classes) rules out most
+of a wordlist before anything is hashed. The bucket index of a wordlist stores,
+for every word length, the byte offsets of the words of that length and one
+character-class mask byte per word. A filtered pass reads only the buckets of
+allowed lengths and their masks, then reads just the surviving lines from the
+wordlist by offset, never the other lines. Offsets ascend with wordlist order,
+so merged buckets keep that order and jobs stay resumable.
+
+Without a current index the filter falls back to a scan of the cached
+wordlist, which still skips the hashing.
+
+The block layout stores the words themselves, grouped by UTF-8 width, each
+group one contiguous block of fixed-width records. Dictionary jobs that opt
+into bucketed order hand these blocks straight to a batched hash kernel
+(hash_utils.make_block_scanner): no per-word str objects or encoding, and a
+digest constructor chosen for short inputs. Without a built layout the same
+order is made in memory from the cached wordlist.
+
+Build both files ahead of time:
+    python wordlist_buckets.py wordlist.txt
+"""
+
+import hashlib
+import heapq
+import mmap
+import os
+import re
+import shutil
+import string
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from functools import lru_cache
+
+from config import Config
+from combinator import iter_words
+from lookup_tables import wordlist_fingerprint
+from worker_cache import get_wordlist, get_wordlist_derived
+
+MAGIC = b'PCLB'
+VERSION = 2
+
+# magic, version, bucket count, word count, wordlist size, wordlist mtime (ns)
+HEADER = struct.Struct('<4sHIQQQ')
+
+# Directory entry per bucket: word length, word count. Each bucket's data
+# follows in directory order: little-endian uint64 byte offsets, then one mask byte per word
+BUCKET = struct.Struct('<HQ')
+
+# A line's text: text-mode reads (the cached wordlist) end lines at \r, \n or \r\n
+LINE = re.compile(rb'[^\r\n]+')
+
+MAX_LENGTH = 0xFFFF
+
+CLASS_BITS = {'lower': 1, 'upper': 2, 'digit': 4, 'symbol': 8}
+
+def char_classes(word):
+    """Bit mask of the character classes a word contains"""
+    mask = 0
+    for char in word:
+        if char in string.ascii_lowercase:
+            mask |= 1
+        elif char in string.ascii_uppercase:
+            mask |= 2
+        elif char in string.digits:
+            mask |= 4
+        else:
+            mask |= 8
+    return mask
+
+def parse_policy(data):
+    """Normalized policy from a request ({minLength, maxLength, require}); ValueError if invalid"""
+    if data is None:
+        return None
+    if not isinstance(data, dict):
+        raise ValueError('policy must be an object')
+    
+    try:
+        min_length = int(data.get('minLength') or 0)
+        max_length = int(data.get('maxLength') or MAX_LENGTH)
+    except (TypeError, ValueError):
+        raise ValueError('minLength and maxLength must be integers')
+    if min_length < 0 or max_length < max(min_length, 1):
+        raise ValueError('policy length range is empty')
+    
+    require = data.get('require') or []
+    if not isinstance(require, list) or any(name not in CLASS_BITS for name in require):
+        raise ValueError(f'require must be a list of: {", ".join(CLASS_BITS)}')
+    
+    return {
+        'min_length': min_length,
+        'max_length': min(max_length, MAX_LENGTH),
+        'require': sorted(set(require))
+    }
+
+def required_mask(policy):
+    mask = 0
+    for name in policy['require']:
+        mask |= CLASS_BITS[name]
+    return mask
+
+def policy_allows(policy, word):
+    """Whether a single word satisfies a policy"""
+    required = required_mask(policy)
+    return (policy['min_length'] <= len(word) <= policy['max_length']
+            and char_classes(word) & required == required)
+
+def index_path(wordlist_path):
+    """Location of the bucket index of a wordlist"""
+    path_id = hashlib.sha1(os.path.abspath(wordlist_path).encode()).hexdigest()[:8]
+    return os.path.join(Config.LOOKUP_TABLE_DIR, f'{os.path.basename(wordlist_path)}.{path_id}.lengths')
+
+def iter_word_offsets(wordlist_path):
+    """(byte offset, word) of every word, with the same line rules as the cached wordlist"""
+    with open(wordlist_path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for match in LINE.finditer(data):
+                word = match.group().decode('utf-8', errors='ignore').strip()
+                if word:
+                    yield match.start(), word
+
+def read_words_at(wordlist_path, offsets):
+    """Words starting at the given byte offsets, read through mmap"""
+    if not len(offsets):
+        return
+    with open(wordlist_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        match = LINE.match
+        for offset in offsets:
+            yield match(data, offset).group().decode('utf-8', errors='ignore').strip()
+
+def build_length_index(wordlist_path):
+    """Build (or rebuild) the per-length bucket index of a wordlist"""
+    if not os.path.exists(wordlist_path):
+        raise FileNotFoundError(wordlist_path)
+    
+    size, mtime = wordlist_fingerprint(wordlist_path)
+    
+    offsets = {}
+    masks = {}
+    count = 0
+    for offset, word in iter_word_offsets(wordlist_path):
+        length = min(len(word), MAX_LENGTH)
+        if length not in offsets:
+            offsets[length] = array('Q')
+            masks[length] = bytearray()
+        offsets[length].append(offset)
+        masks[length].append(char_classes(word))
+        count += 1
+    
+    path = index_path(wordlist_path)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    lengths = sorted(offsets)
+    
+    try:
+        with open(tmp_path, 'wb') as out:
+            out.write(HEADER.pack(MAGIC, VERSION, len(lengths), count, size, mtime))
+            for length in lengths:
+                out.write(BUCKET.pack(length, len(offsets[length])))
+            for length in lengths:
+                bucket = offsets[length]
+                if sys.byteorder == 'big':
+                    bucket.byteswap()
+                out.write(bucket.tobytes())
+                out.write(masks[length])
+        
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    
+    return {
+        'wordlist': wordlist_path,
+        'words': count,
+        'lengths': {length: len(offsets[length]) for length in lengths},
+        'path': path
+    }
+
+class LengthIndex:
+    """Memory-mapped bucket index: length -> (offsets, masks)"""
+    
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.header = HEADER.unpack(self.map[:HEADER.size])
+        self.count = self.header[3]
+        
+        # length -> (position of its offsets in the index, word count)
+        self.buckets = {}
+        offset = HEADER.size + self.header[2] * BUCKET.size
+        for i in range(self.header[2]):
+            length, count = BUCKET.unpack_from(self.map, HEADER.size + i * BUCKET.size)
+            self.buckets[length] = (offset, count)
+            offset += count * (8 + 1)
+    
+    def close(self):
+        self.map.close()
+    
+    def lengths(self):
+        """Words per length"""
+        return {length: count for length, (_, count) in self.buckets.items()}
+    
+    def offsets(self, length):
+        """Byte offsets in the wordlist of the words of one length"""
+        offset, count = self.buckets[length]
+        offsets = array('Q')
+        offsets.frombytes(self.map[offset:offset + 8 * count])
+        if sys.byteorder == 'big':
+            offsets.byteswap()
+        return offsets
+    
+    def masks(self, length):
+        offset, count = self.buckets[length]
+        return self.map[offset + 8 * count:offset + 9 * count]
+    
+    def select(self, policy):
+        """Byte offsets of the words satisfying a policy, in wordlist order"""
+        required = required_mask(policy)
+        selected = []
+        for length in self.buckets:
+            if not policy['min_length'] <= length <= policy['max_length']:
+                continue
+            offsets = self.offsets(length)
+            if required:
+                offsets = [offset for offset, mask in zip(offsets, self.masks(length))
+                           if mask & required == required]
+            selected.append(offsets)
+        return array('Q', heapq.merge(*selected))
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def open_length_index(wordlist_path):
+    """Current bucket index of a wordlist, or None if it is missing or older than the file"""
+    path = index_path(wordlist_path)
+    try:
+        fingerprint = wordlist_fingerprint(wordlist_path)
+        index_mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    
+    cache_key = (path, fingerprint, index_mtime)
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is not None and index[0] == cache_key:
+            return index[1]
+    
+    length_index = LengthIndex(path)
+    magic, version, _, _, size, mtime = length_index.header
+    if magic != MAGIC or version != VERSION or (size, mtime) != fingerprint:
+        length_index.close()
+        return None
+    
+    with _indexes_lock:
+        _indexes[path] = (cache_key, length_index)
+    return length_index
+
+@lru_cache(maxsize=8)
+def _select(wordlist_path, fingerprint, policy_key):
+    # (positions, words in the wordlist, whether positions are byte offsets or ranks)
+    policy = {'min_length': policy_key[0], 'max_length': policy_key[1], 'require': list(policy_key[2])}
+    
+    index = open_length_index(wordlist_path)
+    if index is not None:
+        return index.select(policy), index.count, True
+    
+    # No index: one pass over the cached words, still without hashing them
+    words = get_wordlist(wordlist_path)
+    ranks = array('Q', (rank for rank, word in enumerate(words) if policy_allows(policy, word)))
+    return ranks, len(words), False
+
+def select_words(wordlist_path, policy):
+    """(count, candidates(start, end), skipped) of the words a policy allows, in wordlist order
+    
+    With a current index only the allowed lines are read, by byte offset;
+    otherwise candidates come from the cached wordlist. Selections are cached per process.
+    """
+    policy_key = (policy['min_length'], policy['max_length'], tuple(policy['require']))
+    positions, total, indexed = _select(wordlist_path, wordlist_fingerprint(wordlist_path), policy_key)
+    
+    if indexed:
+        def candidates(start, end):
+            return read_words_at(wordlist_path, positions[start:end])
+    else:
+        words = get_wordlist(wordlist_path)
+        
+        def candidates(start, end):
+            return map(words.__getitem__, positions[start:end])
+    
+    return len(positions), candidates, total - len(positions)
+
+BLOCK_MAGIC = b'PCWB'
+BLOCK_VERSION = 1
+
+def _layout_order(words):
+    """UTF-8 words grouped by byte width: {width: [words in wordlist order]}"""
+    buckets = {}
+    for word in words:
+        data = word.encode('utf-8')
+        if len(data) <= MAX_LENGTH:
+            buckets.setdefault(len(data), []).append(data)
+    return buckets
+
+class BlockLayout:
+    """Words as fixed-width byte blocks, one per UTF-8 width, in ascending width
+    
+    Candidate i of the layout is bucket-major: all words of the smallest width
+    in wordlist order, then the next width, and so on.
+    """
+    
+    def __init__(self, buffer, buckets):
+        self.source = buffer
+        self.buffer = memoryview(buffer)
+        self.buckets = buckets  # [(width, count, offset)]
+        self.count = sum(count for _, count, _ in buckets)
+    
+    def close(self):
+        """Unmap an on-disk layout; left to garbage collection while a search still holds blocks"""
+        if isinstance(self.source, mmap.mmap):
+            try:
+                self.buffer.release()
+                self.source.close()
+            except BufferError:
+                pass
+    
+    def segments(self, start=0, end=None):
+        """(width, block) pieces covering candidates [start, end)"""
+        end = self.count if end is None else min(end, self.count)
+        first = 0
+        for width, count, offset in self.buckets:
+            lo, hi = max(start - first, 0), min(end - first, count)
+            if lo < hi:
+                yield width, self.buffer[offset + lo * width:offset + hi * width]
+            first += count
+    
+    def candidates(self, start=0, end=None):
+        """Candidates [start, end) as strings, for verifiers without a block kernel"""
+        for width, block in self.segments(start, end):
+            for (word,) in struct.iter_unpack(f'{width}s', block):
+                yield word.decode('utf-8')
+
+def build_block_layout(wordlist_path):
+    """Write a wordlist as per-width fixed-width byte blocks"""
+    if not os.path.exists(wordlist_path):
+        raise FileNotFoundError(wordlist_path)
+    
+    size, mtime = wordlist_fingerprint(wordlist_path)
+    
+    # Spill each width to its own temporary file so large lists are not held in memory
+    spills = {}
+    counts = {}
+    path = block_layout_path(wordlist_path)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    
+    try:
+        for word in iter_words(wordlist_path):
+            data = word.encode('utf-8')
+            width = len(data)
+            if width > MAX_LENGTH:
+                continue
+            if width not in spills:
+                spills[width] = tempfile.TemporaryFile()
+                counts[width] = 0
+            spills[width].write(data)
+            counts[width] += 1
+        
+        widths = sorted(spills)
+        with open(tmp_path, 'wb') as out:
+            out.write(HEADER.pack(BLOCK_MAGIC, BLOCK_VERSION, len(widths), sum(counts.values()), size, mtime))
+            for width in widths:
+                out.write(BUCKET.pack(width, counts[width]))
+            for width in widths:
+                spills[width].seek(0)
+                shutil.copyfileobj(spills[width], out)
+        
+        os.replace(tmp_path, path)
+    finally:
+        for spill in spills.values():
+            spill.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    
+    return {'wordlist': wordlist_path, 'words': sum(counts.values()), 'widths': counts, 'path': path}
+
+def block_layout_path(wordlist_path):
+    """Location of the fixed-width block layout of a wordlist"""
+    return index_path(wordlist_path)[:-len('.lengths')] + '.blocks'
+
+def _load_block_layout(path):
+    with open(path, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    header = HEADER.unpack(data[:HEADER.size])
+    
+    buckets = []
+    offset = HEADER.size + header[2] * BUCKET.size
+    for i in range(header[2]):
+        width, count = BUCKET.unpack_from(data, HEADER.size + i * BUCKET.size)
+        buckets.append((width, count, offset))
+        offset += width * count
+    return header, BlockLayout(data, buckets)
+
+_layouts = {}
+
+def open_block_layout(wordlist_path):
+    """Current on-disk block layout of a wordlist, or None if it is missing or older than the file"""
+    path = block_layout_path(wordlist_path)
+    try:
+        fingerprint = wordlist_fingerprint(wordlist_path)
+        layout_mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    
+    cache_key = (path, fingerprint, layout_mtime)
+    with _indexes_lock:
+        layout = _layouts.get(path)
+        if layout is not None and layout[0] == cache_key:
+            return layout[1]
+    
+    header, layout = _load_block_layout(path)
+    magic, version, _, _, size, mtime = header
+    if magic != BLOCK_MAGIC or version != BLOCK_VERSION or (size, mtime) != fingerprint:
+        layout.close()
+        return None
+    
+    with _indexes_lock:
+        replaced = _layouts.get(path)
+        _layouts[path] = (cache_key, layout)
+    if replaced is not None:
+        # Rebuilt file: unmap the old layout now unless a search still holds its blocks
+        replaced[1].close()
+    return layout
+
+def _layout_in_memory(wordlist_path):
+    buckets = []
+    blocks = []
+    offset = 0
+    for width, words in sorted(_layout_order(get_wordlist(wordlist_path)).items()):
+        buckets.append((width, len(words), offset))
+        blocks.append(b''.join(words))
+        offset += width * len(words)
+    return BlockLayout(b''.join(blocks), buckets), offset
+
+def get_block_layout(wordlist_path):
+    """Block layout of a wordlist: the built file, else one made in memory (same order)
+    
+    In-memory layouts share the worker's WORDLIST_CACHE_BYTES budget with the parsed wordlists.
+    """
+    layout = open_block_layout(wordlist_path)
+    if layout is None:
+        layout = get_wordlist_derived(wordlist_path, 'block_layout', _layout_in_memory)
+    return layout
+
+def build_buckets(wordlist_path):
+    """Build both bucket files of a wordlist: policy length index and block layout"""
+    return {
+        'lengths': build_length_index(wordlist_path),
+        'blocks': build_block_layout(wordlist_path)
+    }
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print('Usage: python wordlist_buckets.py <wordlist> [wordlist ...]')
+        sys.exit(1)
+    
+    for wordlist_path in sys.argv[1:]:
+        result = build_buckets(wordlist_path)
+        print(f"{wordlist_path}: {result['lengths']['words']} words in {len(result['lengths']['lengths'])} lengths "
+              f"-> {result['lengths']['path']}, {result['blocks']['path']}")
@@ -0,0 +1,128 @@
+"""
+Worker-local hot cache for wordlists and compiled verifiers
+
+Back-to-back jobs on the same worker usually reuse the same wordlist and
+often the same targets. Parsed wordlists, and values built from them such as
+in-memory block layouts, are kept in one LRU bounded by an estimate of their
+memory use and keyed by path, size and mtime, so an edited file is reloaded
+automatically. Verifiers from hash_utils.make_verifier are
+cached by (hash, type). Both keep hit/miss counters for metrics.
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from config import Config
+from hash_utils import make_verifier
+
+class ByteLRU:
+    """Least-recently-used cache bounded by the total size of its values"""
+    
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key, value, size):
+        with self._lock:
+            if size > self.max_bytes:
+                # Larger than the whole cache: use it once, do not keep it
+                return
+            if key in self._entries:
+                self.bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+    
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+_wordlists = ByteLRU(Config.WORDLIST_CACHE_BYTES)
+
+def file_fingerprint(path):
+    """Cache key that changes whenever the file is replaced or edited"""
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+def _estimate_size(words):
+    # Tuple slot plus the str object for every word
+    return sys.getsizeof(words) + sum(sys.getsizeof(word) for word in words)
+
+def get_wordlist(wordlist_path):
+    """Parsed wordlist as a tuple, loaded from disk only on a cache miss"""
+    try:
+        key = file_fingerprint(wordlist_path)
+    except OSError:
+        return ()
+    
+    words = _wordlists.get(key)
+    if words is None:
+        # Directories and unreadable files count as empty, like missing ones
+        try:
+            with open(wordlist_path, 'r', encoding='utf-8', errors='ignore') as f:
+                words = tuple(line.strip() for line in f if line.strip())
+        except OSError:
+            return ()
+        _wordlists.put(key, words, _estimate_size(words))
+    return words
+
+def get_wordlist_derived(wordlist_path, kind, load):
+    """Value built from a wordlist, kept in the wordlist LRU under the same byte budget
+    
+    load(wordlist_path) -> (value, size in bytes); `kind` tells derived values apart.
+    """
+    try:
+        key = (kind,) + file_fingerprint(wordlist_path)
+    except OSError:
+        return None
+    
+    value = _wordlists.get(key)
+    if value is None:
+        value, size = load(wordlist_path)
+        _wordlists.put(key, value, size)
+    return value
+
+@lru_cache(maxsize=Config.VERIFIER_CACHE_SIZE)
+def get_verifier(hash_string, hash_type):
+    """Compiled verifier for a target, shared by every job on this worker"""
+    return make_verifier(hash_string, hash_type)
+
+def cache_stats():
+    """Hit/miss counters and sizes of both caches"""
+    info = get_verifier.cache_info()
+    return {
+        'wordlists': _wordlists.stats(),
+        'verifiers': {
+            'entries': info.currsize,
+            'max_entries': info.maxsize,
+            'hits': info.hits,
+            'misses': info.misses
+        }
+    }
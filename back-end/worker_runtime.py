@@ -0,0 +1,38 @@
+"""
+Slim runtime for Celery workers
+
+Importing `app` in a worker runs the API server's module-level setup
+(db.create_all(), wordlist line counting, the eventlet SocketIO server).
+Workers only need a database session, so this module builds a bare Flask app
+with nothing but the SQLAlchemy extension, created on first use. Job events
+go out through `events`, which does not need an app either.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from config import Config
+
+_app = None
+_app_lock = threading.Lock()
+
+def get_app():
+    """Minimal Flask app that owns the worker's database engine"""
+    global _app
+    if _app is None:
+        with _app_lock:
+            if _app is None:
+                from flask import Flask
+                from models import db
+                
+                app = Flask(__name__)
+                app.config.from_object(Config)
+                db.init_app(app)
+                _app = app
+    return _app
+
+@contextmanager
+def app_context():
+    """Run a block with the worker app (and its db.session) active"""
+    with get_app().app_context():
+        yield